@@ -1,11 +1,21 @@
 """
 Script for exporting all courseware from Mongo to a directory and listing the courses which failed to export
 """
+import os
+import time
+from optparse import make_option
+
 from django.core.management.base import BaseCommand, CommandError
+from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.xml_exporter import export_to_xml
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore
 
+from contentstore.management.commands.utils import get_course_version, read_manifest, run_in_workers, write_manifest
+
+# The file in the output path listing the version exported, the time taken, and any error, for each course
+MANIFEST_FILENAME = 'export_manifest.json'
+
 
 class Command(BaseCommand):
     """
@@ -13,6 +23,19 @@ class Command(BaseCommand):
     """
     help = 'Export all courses from mongo to the specified data directory and list the courses which failed to export'
 
+    option_list = BaseCommand.option_list + (
+        make_option('--workers',
+                    type='int',
+                    default=1,
+                    help='Export this many courses at a time, each in its own process'),
+        make_option('--skip-unchanged',
+                    action='store_true',
+                    dest='skip_unchanged',
+                    default=False,
+                    help='Skip the courses whose content and assets have not changed since they were '
+                         'last exported to the output path'),
+    )
+
     def handle(self, *args, **options):
         """
         Execute the command
@@ -21,7 +44,9 @@ class Command(BaseCommand):
             raise CommandError("export requires one argument: <output path>")
 
         output_path = args[0]
-        courses, failed_export_courses = export_courses_to_output_path(output_path)
+        courses, failed_export_courses = export_courses_to_output_path(
+            output_path, workers=options.get('workers', 1), skip_unchanged=options.get('skip_unchanged', False)
+        )
 
         print("=" * 80)
         print(u"=" * 30 + u"> Export summary")
@@ -29,31 +54,73 @@ class Command(BaseCommand):
         print(u"Total number of courses which failed to export: {0}".format(len(failed_export_courses)))
         print(u"List of export failed courses ids:")
         print(u"\n".join(failed_export_courses))
+        print(u"Manifest: {0}".format(os.path.join(output_path, MANIFEST_FILENAME)))
         print("=" * 80)
 
 
-def export_courses_to_output_path(output_path):
+def export_courses_to_output_path(output_path, workers=1, skip_unchanged=False):
     """
     Export all courses to target directory and return the list of courses which failed to export
+
+    The courses are exported by `workers` processes, and how each export went
+    is recorded in the manifest in the target directory. If `skip_unchanged`,
+    the courses whose version is the one the manifest records as exported
+    are skipped.
     """
-    content_store = contentstore()
-    module_store = modulestore()
-    root_dir = output_path
-    courses = module_store.get_courses()
+    manifest_path = os.path.join(output_path, MANIFEST_FILENAME)
+    manifest = read_manifest(manifest_path)
+    courses = modulestore().get_courses()
 
-    course_ids = [x.id for x in courses]
-    failed_export_courses = []
+    args_list = []
+    for course in courses:
+        course_id = unicode(course.id)
+        last_version = None
+        if skip_unchanged and course_id in manifest and manifest[course_id]['error'] is None:
+            last_version = manifest[course_id]['version']
+        args_list.append((course_id, output_path, last_version))
 
-    for course_id in course_ids:
+    for entry in run_in_workers(export_course, args_list, workers):
+        manifest[entry['course_id']] = entry
         print(u"-" * 80)
-        print(u"Exporting course id = {0} to {1}".format(course_id, output_path))
-        try:
-            course_dir = course_id.to_deprecated_string().replace('/', '...')
-            export_to_xml(module_store, content_store, course_id, root_dir, course_dir)
-        except Exception as err:  # pylint: disable=broad-except
-            failed_export_courses.append(unicode(course_id))
-            print(u"=" * 30 + u"> Oops, failed to export {0}".format(course_id))
+        if entry['skipped']:
+            print(u"Skipped unchanged course id = {0}".format(entry['course_id']))
+        elif entry['error'] is None:
+            print(u"Exported course id = {0} to {1} in {2}s".format(entry['course_id'], output_path, entry['seconds']))
+        else:
+            print(u"=" * 30 + u"> Oops, failed to export {0}".format(entry['course_id']))
             print(u"Error:")
-            print(err)
+            print(entry['error'])
 
+    write_manifest(manifest_path, manifest)
+
+    failed_export_courses = [
+        unicode(course.id) for course in courses if manifest[unicode(course.id)]['error'] is not None
+    ]
     return courses, failed_export_courses
+
+
+def export_course(course_id, output_path, last_version=None):
+    """
+    Export the course `course_id` to its directory in `output_path`, unless
+    its version (see `get_course_version`) is `last_version` and it's already
+    there, and return its manifest entry.
+    """
+    start = time.time()
+    course_key = CourseKey.from_string(course_id)
+    course_dir = course_key.to_deprecated_string().replace('/', '...')
+    entry = {'course_id': course_id, 'course_dir': course_dir, 'version': None, 'skipped': False, 'error': None}
+    try:
+        module_store = modulestore()
+        content_store = contentstore()
+        entry['version'] = get_course_version(module_store, content_store, course_key)
+        if (
+            entry['version'] is not None and entry['version'] == last_version and
+            os.path.isdir(os.path.join(output_path, course_dir))
+        ):
+            entry['skipped'] = True
+        else:
+            export_to_xml(module_store, content_store, course_key, output_path, course_dir)
+    except Exception as err:  # pylint: disable=broad-except
+        entry['error'] = u'{0}: {1}'.format(type(err).__name__, err)
+    entry['seconds'] = round(time.time() - start, 3)
+    return entry
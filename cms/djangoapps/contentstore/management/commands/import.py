@@ -1,6 +1,8 @@
 """
 Script for importing courseware from XML format
 """
+import os
+import time
 
 from django.core.management.base import BaseCommand, CommandError, make_option
 from django_comment_common.utils import (seed_permissions_roles,
@@ -10,6 +12,8 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore
 
+from contentstore.management.commands.utils import run_in_workers, write_manifest
+
 
 class Command(BaseCommand):
     """
@@ -21,6 +25,13 @@ class Command(BaseCommand):
         make_option('--nostatic',
                     action='store_true',
                     help='Skip import of static content'),
+        make_option('--workers',
+                    type='int',
+                    default=1,
+                    help='Import this many course dirs at a time, each in its own process'),
+        make_option('--manifest',
+                    help='Write the courses imported from each course dir, the time taken, and any error, '
+                         'to this file as JSON'),
     )
 
     def handle(self, *args, **options):
@@ -38,6 +49,13 @@ class Command(BaseCommand):
             data=data_dir,
             courses=course_dirs,
             dis=do_import_static))
+
+        workers = options.get('workers') or 1
+        manifest_path = options.get('manifest')
+        if workers > 1 or manifest_path:
+            self.import_course_dirs(data_dir, course_dirs, do_import_static, workers, manifest_path)
+            return
+
         mstore = modulestore()
 
         course_items = import_from_xml(
@@ -48,7 +66,65 @@ class Command(BaseCommand):
         )
 
         for course in course_items:
-            course_id = course.id
-            if not are_permissions_roles_seeded(course_id):
-                self.stdout.write('Seeding forum roles for course {0}\n'.format(course_id))
-                seed_permissions_roles(course_id)
+            seed_forum_roles(course.id, self.stdout)
+
+    def import_course_dirs(self, data_dir, course_dirs, do_import_static, workers, manifest_path):
+        """
+        Import each course dir separately, in `workers` processes, and write
+        how each import went to the manifest, if there's a `manifest_path`.
+        """
+        if course_dirs is None:
+            # the course dirs the XMLModuleStore would load
+            course_dirs = sorted(
+                course_dir for course_dir in os.listdir(data_dir)
+                if os.path.exists(os.path.join(data_dir, course_dir, 'course.xml'))
+            )
+
+        manifest = {}
+        args_list = [(data_dir, course_dir, do_import_static) for course_dir in course_dirs]
+        for entry in run_in_workers(import_course_dir, args_list, workers):
+            manifest[entry['course_dir']] = entry
+            if entry['error'] is None:
+                self.stdout.write(u"Imported {0} as {1} in {2}s\n".format(
+                    entry['course_dir'], u', '.join(entry['course_ids']), entry['seconds']
+                ))
+            else:
+                self.stdout.write(u"Failed to import {0}: {1}\n".format(entry['course_dir'], entry['error']))
+
+        if manifest_path:
+            write_manifest(manifest_path, manifest)
+
+
+def import_course_dir(data_dir, course_dir, do_import_static):
+    """
+    Import the course in `course_dir` of `data_dir`, and return its manifest entry.
+    """
+    start = time.time()
+    entry = {'course_dir': course_dir, 'course_ids': [], 'error': None}
+    try:
+        course_items = import_from_xml(
+            modulestore(), ModuleStoreEnum.UserID.mgmt_command, data_dir, [course_dir], load_error_modules=False,
+            static_content_store=contentstore(), verbose=True,
+            do_import_static=do_import_static,
+            create_course_if_not_present=True,
+        )
+        for course in course_items:
+            seed_forum_roles(course.id)
+            entry['course_ids'].append(unicode(course.id))
+        if not entry['course_ids']:
+            # the XMLModuleStore logs the courses it fails to load, rather than raising
+            entry['error'] = u'No course could be imported from {0}'.format(course_dir)
+    except Exception as err:  # pylint: disable=broad-except
+        entry['error'] = u'{0}: {1}'.format(type(err).__name__, err)
+    entry['seconds'] = round(time.time() - start, 3)
+    return entry
+
+
+def seed_forum_roles(course_id, stdout=None):
+    """
+    Seed the forum roles of the course `course_id`, if they haven't been.
+    """
+    if not are_permissions_roles_seeded(course_id):
+        if stdout is not None:
+            stdout.write('Seeding forum roles for course {0}\n'.format(course_id))
+        seed_permissions_roles(course_id)
@@ -1,15 +1,19 @@
 """
 Test for export all courses.
 """
+import json
+import os
 import shutil
 from tempfile import mkdtemp
 
-from contentstore.management.commands.export_all_courses import export_courses_to_output_path
+from contentstore.management.commands.export_all_courses import export_courses_to_output_path, MANIFEST_FILENAME
 
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 
 class ExportAllCourses(ModuleStoreTestCase):
@@ -43,6 +47,86 @@ class ExportAllCourses(ModuleStoreTestCase):
         self.assertEqual(len(failed_export_courses), 1)
         self.assertEqual(failed_export_courses[0], unicode(second_course_id))
 
+    def read_manifest(self):
+        """ Return the manifest of the exports to the temp dir. """
+        with open(os.path.join(self.temp_dir, MANIFEST_FILENAME)) as manifest_file:
+            return json.load(manifest_file)
+
+    def test_export_manifest(self):
+        """
+        Test that the export of each course is recorded in the manifest
+        """
+        export_courses_to_output_path(self.temp_dir)
+        manifest = self.read_manifest()
+        self.assertEqual(
+            sorted(manifest),
+            sorted([unicode(self.first_course.id), unicode(self.second_course.id)])
+        )
+        entry = manifest[unicode(self.first_course.id)]
+        self.assertIsNone(entry['error'])
+        self.assertFalse(entry['skipped'])
+        self.assertIsNotNone(entry['version'])
+        self.assertTrue(os.path.isdir(os.path.join(self.temp_dir, entry['course_dir'])))
+
+    def test_skip_unchanged(self):
+        """
+        Test that rerunning the export skips the courses which haven't changed since
+        """
+        export_courses_to_output_path(self.temp_dir)
+        ItemFactory.create(parent_location=self.first_course.location, category='chapter')
+
+        courses, failed_export_courses = export_courses_to_output_path(self.temp_dir, skip_unchanged=True)
+        self.assertEqual(len(courses), 2)
+        self.assertEqual(len(failed_export_courses), 0)
+        manifest = self.read_manifest()
+        self.assertFalse(manifest[unicode(self.first_course.id)]['skipped'])
+        self.assertTrue(manifest[unicode(self.second_course.id)]['skipped'])
+
+    def test_skip_unchanged_assets(self):
+        """
+        Test that rerunning the export doesn't skip the courses whose assets have changed since
+        """
+        export_courses_to_output_path(self.temp_dir)
+        asset_key = self.second_course.id.make_asset_key('asset', 'changed.txt')
+        contentstore().save(StaticContent(asset_key, 'changed.txt', 'text/plain', 'changed'))
+
+        export_courses_to_output_path(self.temp_dir, skip_unchanged=True)
+        manifest = self.read_manifest()
+        self.assertTrue(manifest[unicode(self.first_course.id)]['skipped'])
+        self.assertFalse(manifest[unicode(self.second_course.id)]['skipped'])
+
+    def test_skip_unchanged_discarded_drafts(self):
+        """
+        Test that rerunning the export doesn't skip the courses whose changes have been discarded since
+        """
+        user_id = ModuleStoreEnum.UserID.test
+        chapter = ItemFactory.create(parent_location=self.first_course.location, category='chapter')
+        sequential = ItemFactory.create(parent_location=chapter.location, category='sequential')
+        vertical = ItemFactory.create(parent_location=sequential.location, category='vertical')
+        self.store.publish(vertical.location, user_id)
+        vertical = self.store.get_item(vertical.location)
+        vertical.display_name = 'Changed'
+        self.store.update_item(vertical, user_id)
+        export_courses_to_output_path(self.temp_dir)
+
+        # discarding the changes deletes the draft, and doesn't update the course's edit info
+        self.store.revert_to_published(vertical.location, user_id)
+
+        export_courses_to_output_path(self.temp_dir, skip_unchanged=True)
+        manifest = self.read_manifest()
+        self.assertFalse(manifest[unicode(self.first_course.id)]['skipped'])
+        self.assertTrue(manifest[unicode(self.second_course.id)]['skipped'])
+
+    def test_export_in_workers(self):
+        """
+        Test exporting the courses in several processes
+        """
+        courses, failed_export_courses = export_courses_to_output_path(self.temp_dir, workers=2)
+        self.assertEqual(len(courses), 2)
+        self.assertEqual(len(failed_export_courses), 0)
+        for entry in self.read_manifest().itervalues():
+            self.assertTrue(os.path.isdir(os.path.join(self.temp_dir, entry['course_dir'])))
+
     def tearDown(self):
         """ Common cleanup. """
         shutil.rmtree(self.temp_dir)
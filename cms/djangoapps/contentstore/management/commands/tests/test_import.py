@@ -2,6 +2,7 @@
 Unittests for importing a course via management command
 """
 
+import json
 import os
 from path import path
 import shutil
@@ -92,3 +93,33 @@ class TestImport(ModuleStoreTestCase):
         # Now load up the course with a similar course_id and verify it loads
         call_command('import', self.content_dir, self.course_dir)
         self.assertIsNotNone(store.get_course(self.TRUNCATED_KEY))
+
+    def test_import_manifest(self):
+        """
+        Check that importing course dirs one by one records each import in the manifest
+        """
+        manifest_path = os.path.join(self.content_dir, 'manifest.json')
+        call_command('import', self.content_dir, self.good_dir, self.course_dir, manifest=manifest_path)
+        store = modulestore()
+        self.assertIsNotNone(store.get_course(self.BASE_COURSE_KEY))
+        self.assertIsNotNone(store.get_course(self.TRUNCATED_KEY))
+        self.assertTrue(are_permissions_roles_seeded(self.BASE_COURSE_KEY))
+
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(sorted(manifest), sorted([self.good_dir, self.course_dir]))
+        self.assertEqual(manifest[self.good_dir]['course_ids'], [self.BASE_COURSE_KEY.to_deprecated_string()])
+        self.assertIsNone(manifest[self.good_dir]['error'])
+
+    def test_import_manifest_no_course(self):
+        """
+        Check that a course dir no course could be imported from is recorded as failed in the manifest
+        """
+        empty_dir = tempfile.mkdtemp(dir=self.content_dir)
+        manifest_path = os.path.join(self.content_dir, 'manifest.json')
+        call_command('import', self.content_dir, empty_dir, manifest=manifest_path)
+
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(manifest[empty_dir]['course_ids'], [])
+        self.assertIsNotNone(manifest[empty_dir]['error'])
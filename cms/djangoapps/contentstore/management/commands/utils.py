@@ -1,7 +1,18 @@
 """
 Common methods for cms commands to use
 """
+import json
+import multiprocessing
+import os
+
+import pymongo
 from django.contrib.auth.models import User
+from django.db import connection
+
+from xmodule.contentstore.django import _CONTENTSTORE
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import clear_existing_modulestores
+from xmodule.modulestore.mongo.base import MongoRevisionKey
 
 
 def user_from_str(identifier):
@@ -17,3 +28,141 @@ def user_from_str(identifier):
         return User.objects.get(email=identifier)
 
     return User.objects.get(id=user_id)
+
+
+def get_course_version(store, content_store, course_key):
+    """
+    Return a string identifying the version of the course's published and
+    draft content and of its assets, which changes whenever any of them
+    changes, or None if the course's modulestore doesn't keep track of that.
+    """
+    versions = [
+        _get_branch_version(store, course_key, branch)
+        for branch in (ModuleStoreEnum.Branch.published_only, ModuleStoreEnum.Branch.draft_preferred)
+    ]
+    if None in versions:
+        return None
+
+    # assets aren't versioned, but are replaced rather than changed in place, so
+    # either their number or the time the latest was uploaded changes with them
+    assets, num_assets = content_store.get_all_content_for_course(
+        course_key, maxresults=1, sort=[('uploadDate', pymongo.DESCENDING)]
+    )
+    versions.append(unicode(num_assets))
+    if assets:
+        versions.append(assets[0]['uploadDate'].isoformat())
+    return u' '.join(versions)
+
+
+def _get_branch_version(store, course_key, branch):
+    """
+    Return a string identifying the version of the course on `branch`, or None
+    if the course's modulestore doesn't keep track of that.
+    """
+    with store.branch_setting(branch, course_key):
+        course = store.get_course(course_key)
+    if course is None:
+        return None
+
+    # split versions whole course structures; old mongo only records when the course was last edited,
+    # which it does for draft and published changes alike, and xml doesn't record anything
+    course_entry = getattr(course.runtime, 'course_entry', None)
+    if course_entry is not None:
+        return unicode(course_entry.structure['_id'])
+    subtree_edited_on = getattr(course, 'subtree_edited_on', None)
+    if subtree_edited_on is None:
+        return None
+    version = subtree_edited_on.isoformat()
+    if branch == ModuleStoreEnum.Branch.draft_preferred:
+        version += u' ' + _get_old_mongo_drafts_version(course)
+    return version
+
+
+def _get_old_mongo_drafts_version(course):
+    """
+    Return a string identifying the drafts of `course`, an old mongo course.
+
+    Discarding changes or unpublishing deletes drafts without updating the course's
+    subtree_edited_on, but either the number of drafts or the time the latest was
+    edited changes with them.
+    """
+    query = {
+        '_id.tag': 'i4x',
+        '_id.org': course.location.org,
+        '_id.course': course.location.course,
+        '_id.revision': MongoRevisionKey.draft,
+    }
+    drafts = course.runtime.modulestore.collection.find(query, {'edit_info.edited_on': 1})
+    num_drafts = drafts.count()
+    versions = [unicode(num_drafts)]
+    for draft in drafts.sort('edit_info.edited_on', pymongo.DESCENDING).limit(1):
+        edited_on = draft.get('edit_info', {}).get('edited_on')
+        if edited_on is not None:
+            versions.append(edited_on.isoformat())
+    return u' '.join(versions)
+
+
+def run_in_workers(function, args_list, workers):
+    """
+    Call `function` with each tuple of arguments in `args_list`, and yield the
+    results. If `workers` is more than 1, the calls are made in a pool of that
+    many processes, each with its own modulestore, contentstore and database
+    connections, and the results are yielded in the order the calls finish.
+
+    `function` must be defined at the top level of a module, and its arguments
+    and results must be picklable.
+    """
+    if workers <= 1:
+        for args in args_list:
+            yield function(*args)
+        return
+
+    # the database connection is closed rather than shared with the workers, and reopened when next needed
+    connection.close()
+    pool = multiprocessing.Pool(workers, initializer=_reset_stores)
+    try:
+        for result in pool.imap_unordered(_call, [(function, args) for args in args_list]):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _call(function_and_args):
+    """
+    Call a function with arguments, for `run_in_workers`.
+    """
+    function, args = function_and_args
+    return function(*args)
+
+
+def _reset_stores():
+    """
+    Drop the modulestore and contentstore a worker process inherited from its
+    parent, so that it makes its own, with their own connections.
+    """
+    clear_existing_modulestores()
+    _CONTENTSTORE.clear()
+
+
+def read_manifest(manifest_path):
+    """
+    Return the manifest written to `manifest_path` by `write_manifest`, or an
+    empty one if there isn't one.
+    """
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def write_manifest(manifest_path, manifest):
+    """
+    Write `manifest`, a dict of the results of a command for each course, to
+    `manifest_path` as JSON. The file is replaced at once, so that a manifest
+    is never left half written.
+    """
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, sort_keys=True, indent=4)
+    os.rename(temp_path, manifest_path)
@@ -19,6 +19,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
 from django.core.exceptions import PermissionDenied
+from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey, AssetKey
 
 from util.date_utils import get_default_time_display
@@ -49,6 +50,8 @@ def assets_handler(request, course_key_string=None, asset_key_string=None):
             page_size: the number of items per page (defaults to 50)
             sort: the asset field to sort by (defaults to "date_added")
             direction: the sort direction (defaults to "descending")
+            after: the id of the last asset of the previous page, which lets the next page be found
+                without skipping over the assets of all the previous pages
     POST
         json: create (or update?) an asset. The only updating that can be done is changing the lock state.
     PUT
@@ -97,6 +100,12 @@ def _assets_json(request, course_key):
     Supports start (0-based index into the list of assets) and max query parameters.
     """
     requested_page = int(request.REQUEST.get('page', 0))
+    try:
+        after = AssetKey.from_string(request.REQUEST['after'])
+    except (KeyError, InvalidKeyError):
+        after = None
+    if after is not None and after.course_key != course_key:
+        after = None
     requested_page_size = int(request.REQUEST.get('page_size', 50))
     requested_sort = request.REQUEST.get('sort', 'date_added')
     sort_direction = DESCENDING
@@ -112,7 +121,9 @@ def _assets_json(request, course_key):
 
     current_page = max(requested_page, 0)
     start = current_page * requested_page_size
-    assets, total_count = _get_assets_for_page(request, course_key, current_page, requested_page_size, sort)
+    assets, total_count = _get_assets_for_page(
+        request, course_key, current_page, requested_page_size, sort, after=after if current_page > 0 else None
+    )
     end = start + len(assets)
 
     # If the query is beyond the final page, then re-query the final page so that at least one asset is returned
@@ -144,14 +155,15 @@ def _assets_json(request, course_key):
     })
 
 
-def _get_assets_for_page(request, course_key, current_page, page_size, sort):
+def _get_assets_for_page(request, course_key, current_page, page_size, sort, after=None):
     """
-    Returns the list of assets for the specified page and page size.
+    Returns the list of assets for the specified page and page size. If after, the key of the
+    last asset of the previous page, is given then the page is found from it instead.
     """
     start = current_page * page_size
 
     return contentstore().get_all_content_for_course(
-        course_key, start=start, maxresults=page_size, sort=sort
+        course_key, start=start, maxresults=page_size, sort=sort, after=after
     )
 
 
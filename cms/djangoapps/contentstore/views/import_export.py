@@ -8,13 +8,10 @@ import re
 import shutil
 import tarfile
 from path import path
-from tempfile import mkdtemp
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import SuspiciousOperation, PermissionDenied
-from django.core.files.temp import NamedTemporaryFile
-from django.core.servers.basehttp import FileWrapper
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.translation import ugettext as _
 from django.views.decorators.http import require_http_methods, require_GET
@@ -26,7 +23,7 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.xml_importer import import_from_xml
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_tarball
 
 from student.auth import has_course_author_access
 
@@ -343,7 +340,8 @@ def export_handler(request, course_key_string):
     application/x-tgz via HTTP_ACCEPT, or a query parameter can be used (?_accept=application/x-tgz).
 
     If the tar.gz file has been requested but the export operation fails, an HTML page will be returned
-    which describes the error.
+    which describes the error. Otherwise, the tar.gz file is streamed as it is made, with the course's
+    static assets read from the contentstore as they are sent.
     """
     course_key = CourseKey.from_string(course_key_string)
     if not has_course_author_access(request.user, course_key):
@@ -357,15 +355,9 @@ def export_handler(request, course_key_string):
     export_url = reverse_course_url('export_handler', course_key) + '?_accept=application/x-tgz'
     if 'application/x-tgz' in requested_format:
         name = course_module.url_name
-        export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-        root_dir = path(mkdtemp())
 
         try:
-            export_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
-            logging.debug(u'tar file being generated at {0}'.format(export_file.name))
-            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-                tar_file.add(root_dir / name, arcname=name)
+            tarball = export_to_tarball(modulestore(), contentstore(), course_module.id, name)
         except SerializationError as exc:
             log.exception(u'There was an error exporting course %s', course_module.id)
             unit = None
@@ -403,13 +395,9 @@ def export_handler(request, course_key_string):
                 'course_home_url': reverse_course_url("course_handler", course_key),
                 'export_url': export_url
             })
-        finally:
-            shutil.rmtree(root_dir / name)
 
-        wrapper = FileWrapper(export_file)
-        response = HttpResponse(wrapper, content_type='application/x-tgz')
-        response['Content-Disposition'] = 'attachment; filename=%s' % os.path.basename(export_file.name.encode('utf-8'))
-        response['Content-Length'] = os.path.getsize(export_file.name)
+        response = HttpResponse(tarball, content_type='application/x-tgz')
+        response['Content-Disposition'] = 'attachment; filename=%s.tar.gz' % name.encode('utf-8')
         return response
 
     elif 'text/html' in requested_format:
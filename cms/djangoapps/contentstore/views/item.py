@@ -659,15 +659,18 @@ def _get_module_info(xblock, rewrite_static_links=True):
                 course_id=xblock.location.course_key
             )
 
-        # Pre-cache has changes for the entire course because we'll need it for the ancestor info
-        modulestore().has_changes(modulestore().get_course(xblock.location.course_key, depth=None))
+        # Compute has changes for the entire course at once because we'll need it for the ancestor info
+        changes_map = modulestore().get_changes_map(xblock.location.course_key)
 
         # Note that children aren't being returned until we have a use case.
-        return create_xblock_info(xblock, data=data, metadata=own_metadata(xblock), include_ancestor_info=True)
+        return create_xblock_info(
+            xblock, data=data, metadata=own_metadata(xblock), include_ancestor_info=True, changes_map=changes_map
+        )
 
 
 def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=False, include_child_info=False,
-                       course_outline=False, include_children_predicate=NEVER, parent_xblock=None, graders=None):
+                       course_outline=False, include_children_predicate=NEVER, parent_xblock=None, graders=None,
+                       changes_map=None):
     """
     Creates the information needed for client-side XBlockInfo.
 
@@ -682,6 +685,10 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
 
     In addition, an optional include_children_predicate argument can be provided to define whether or
     not a particular xblock should have its children included.
+
+    changes_map, if given, is the result of the modulestore's get_changes_map for the course, and is
+    used instead of calling has_changes for each xblock. It's computed here when rendering the course
+    outline, if it isn't given.
     """
 
     def safe_get_username(user_id):
@@ -702,8 +709,10 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
         return None
 
     is_xblock_unit = is_unit(xblock, parent_xblock)
+    if changes_map is None and course_outline and include_child_info and not is_xblock_unit:
+        changes_map = modulestore().get_changes_map(xblock.location.course_key)
     # this should not be calculated for Sections and Subsections on Unit page
-    has_changes = modulestore().has_changes(xblock) if (is_xblock_unit or course_outline) else None
+    has_changes = _has_changes(xblock, changes_map) if (is_xblock_unit or course_outline) else None
 
     if graders is None:
         graders = CourseGradingModel.fetch(xblock.location.course_key).graders
@@ -716,6 +725,7 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
             course_outline,
             graders,
             include_children_predicate=include_children_predicate,
+            changes_map=changes_map,
         )
     else:
         child_info = None
@@ -753,7 +763,7 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
     if metadata is not None:
         xblock_info["metadata"] = metadata
     if include_ancestor_info:
-        xblock_info['ancestor_info'] = _create_xblock_ancestor_info(xblock, course_outline)
+        xblock_info['ancestor_info'] = _create_xblock_ancestor_info(xblock, course_outline, changes_map)
     if child_info:
         xblock_info['child_info'] = child_info
     if visibility_state == VisibilityState.staff_only:
@@ -854,7 +864,19 @@ def _compute_visibility_state(xblock, child_info, is_unit_with_changes):
         return VisibilityState.ready
 
 
-def _create_xblock_ancestor_info(xblock, course_outline):
+def _has_changes(xblock, changes_map):
+    """
+    Returns whether the xblock has unpublished changes, from changes_map if it includes the xblock.
+    """
+    if changes_map is not None:
+        # changes_map is keyed by version and branch agnostic locations
+        location = xblock.location.version_agnostic().for_branch(None)
+        if location in changes_map:
+            return changes_map[location]
+    return modulestore().has_changes(xblock)
+
+
+def _create_xblock_ancestor_info(xblock, course_outline, changes_map=None):
     """
     Returns information about the ancestors of an xblock. Note that the direct parent will also return
     information about all of its children.
@@ -871,7 +893,8 @@ def _create_xblock_ancestor_info(xblock, course_outline):
                 ancestor,
                 include_child_info=include_child_info,
                 course_outline=course_outline,
-                include_children_predicate=direct_children_only
+                include_children_predicate=direct_children_only,
+                changes_map=changes_map,
             ))
             collect_ancestor_info(get_parent_xblock(ancestor))
     collect_ancestor_info(get_parent_xblock(xblock), include_child_info=True)
@@ -880,7 +903,7 @@ def _create_xblock_ancestor_info(xblock, course_outline):
     }
 
 
-def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER):
+def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER, changes_map=None):
     """
     Returns information about the children of an xblock, as well as about the primary category
     of xblock expected as children.
@@ -898,7 +921,8 @@ def _create_xblock_child_info(xblock, course_outline, graders, include_children_
                 child, include_child_info=True, course_outline=course_outline,
                 include_children_predicate=include_children_predicate,
                 parent_xblock=xblock,
-                graders=graders
+                graders=graders,
+                changes_map=changes_map,
             ) for child in xblock.get_children()
         ]
     return child_info
@@ -113,6 +113,18 @@ class PaginationTestCase(AssetsTestCase):
         self.assert_correct_asset_response(self.url + "?page_size=2&page=2", 2, 1, 3)
         self.assert_correct_asset_response(self.url + "?page_size=3&page=1", 0, 3, 3)
 
+        # Verify finding a page from the last asset of the previous page
+        resp = self.client.get(self.url + "?page_size=2&sort=display_name", HTTP_ACCEPT='application/json')
+        first_page = json.loads(resp.content)['assets']
+        resp = self.client.get(
+            self.url, {'page_size': 2, 'page': 1, 'sort': 'display_name', 'after': first_page[-1]['id']},
+            HTTP_ACCEPT='application/json'
+        )
+        json_response = json.loads(resp.content)
+        self.assertEquals(json_response['start'], 2)
+        self.assertEquals(json_response['totalCount'], 3)
+        self.assertEquals([asset['display_name'] for asset in json_response['assets']], ['asset-1.txt'])
+
     def assert_correct_asset_response(self, url, expected_start, expected_length, expected_total):
         """
         Get from the url and ensure it contains the expected number of responses
@@ -9,13 +9,19 @@ import shutil
 import tarfile
 import tempfile
 from path import path
+from StringIO import StringIO
 from uuid import uuid4
 
+from mock import Mock
+
 from django.test.utils import override_settings
 from django.conf import settings
 from contentstore.utils import reverse_course_url
 
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.tests.factories import ItemFactory
+from xmodule.modulestore.xml_exporter import export_to_tarball, export_to_xml
 
 from contentstore.tests.utils import CourseTestCase
 from student import auth
@@ -288,6 +294,51 @@ class ExportTestCase(CourseTestCase):
         self.assertEquals(resp.status_code, 200)
         self.assertTrue(resp.get('Content-Disposition').startswith('attachment'))
 
+    def test_export_targz_contents(self):
+        """
+        The streamed tar.gz file has the same files as an export to disk,
+        with the static assets where they were imported from.
+        """
+        asset_key = self.course.id.make_asset_key('asset', 'sample.txt')
+        asset_data = 'sample content ' * 10000
+        contentstore().save(
+            StaticContent(asset_key, 'sample.txt', 'text/plain', asset_data, import_path='docs/sample.txt')
+        )
+
+        resp = self.client.get(self.url, HTTP_ACCEPT='application/x-tgz')
+        self._verify_export_succeeded(resp)
+        tar_file = tarfile.open(fileobj=StringIO(resp.content), mode='r:gz')
+
+        name = self.course.location.name
+        root_dir = path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        export_to_xml(self.store, contentstore(), self.course.id, root_dir, name)
+        exported_names = set(
+            os.path.relpath(os.path.join(dirpath, filename), root_dir)
+            for dirpath, __, filenames in os.walk(root_dir) for filename in filenames
+        )
+        self.assertEqual(set(member.name for member in tar_file.getmembers() if member.isfile()), exported_names)
+
+        self.assertEqual(tar_file.extractfile(name + '/static/docs/sample.txt').read(), asset_data)
+        policy = json.load(tar_file.extractfile(name + '/policies/assets.json'))
+        self.assertEqual(policy['sample.txt']['contentType'], 'text/plain')
+
+    def test_export_tarball_progress(self):
+        """
+        The progress of an export is reported as the tar.gz file is read.
+        """
+        contentstore().save(StaticContent(
+            self.course.id.make_asset_key('asset', 'sample.txt'), 'sample.txt', 'text/plain', 'sample content'
+        ))
+        progress_callback = Mock()
+        tarball = export_to_tarball(self.store, contentstore(), self.course.id, 'course', progress_callback)
+        self.assertFalse(progress_callback.called)
+
+        ''.join(tarball)
+        done, total = progress_callback.call_args[0]
+        self.assertEqual(done, total)
+        self.assertGreater(total, len('sample content'))
+
     def test_export_failure_top_level(self):
         """
         Export failure.
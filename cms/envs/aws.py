@@ -239,6 +239,7 @@ DATABASES = AUTH_TOKENS['DATABASES']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
+SPLIT_STRUCTURE_CACHE_BYTES = ENV_TOKENS.get('SPLIT_STRUCTURE_CACHE_BYTES', SPLIT_STRUCTURE_CACHE_BYTES)
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
 DATADOG.update(ENV_TOKENS.get("DATADOG", {}))
@@ -89,6 +89,9 @@ update_module_store_settings(
     },
 )
 
+# Keep the structure cache off, so that tests see every mongo query
+SPLIT_STRUCTURE_CACHE_BYTES = 0
+
 CONTENTSTORE = {
     'ENGINE': 'xmodule.contentstore.mongo.MongoContentStore',
     'DOC_STORE_CONFIG': {
@@ -17,6 +17,15 @@ define(["backbone.paginator", "js/models/asset"], function(BackbonePaginator, As
             'page_size': function() { return this.perPage; },
             'sort': function() { return this.sortField; },
             'direction': function() { return this.sortDirection; },
+            // Lets the server find the next page from the last asset of the previous one
+            'after': function() {
+                var lastPage = this.lastPage;
+                if (lastPage && lastPage.page === this.currentPage - 1 &&
+                        lastPage.sortField === this.sortField && lastPage.sortDirection === this.sortDirection) {
+                    return lastPage.lastAssetId;
+                }
+                return '';
+            },
             'format': 'json'
         },
 
@@ -30,6 +39,12 @@ define(["backbone.paginator", "js/models/asset"], function(BackbonePaginator, As
             this.totalPages = Math.max(totalPages, 1); // Treat an empty collection as having 1 page...
             this.currentPage = currentPage;
             this.start = start;
+            this.lastPage = response.assets.length === 0 ? null : {
+                page: currentPage,
+                sortField: this.sortField,
+                sortDirection: this.sortDirection,
+                lastAssetId: response.assets[response.assets.length - 1].id
+            };
             return response.assets;
         }
     });
@@ -32,7 +32,6 @@ EMBARGO_SITE_REDIRECT_URL = 'https://www.edx.org/'
 """
 from functools import partial
 import logging
-import pygeoip
 from lazy import lazy
 
 from django.core.exceptions import MiddlewareNotUsed
@@ -41,6 +40,7 @@ from django.conf import settings
 from django.shortcuts import redirect
 from django.http import HttpResponseRedirect, HttpResponseForbidden
 from ipware.ip import get_ip
+from geoinfo.lookup import country_code_by_addr
 from util.request import course_id_from_url
 
 from student.models import unique_id_for_user
@@ -123,20 +123,22 @@ class EmbargoMiddleware(object):
             A unicode message if the user is embargoed, otherwise `None`
 
         """
+        ip_filter = IPFilter.current()
+
         # If blacklisted, immediately fail
-        if ip_addr in IPFilter.current().blacklist_ips:
+        if ip_addr in ip_filter.blacklist_ips:
             return self.REASONS['ip_blacklist'].format(
                 ip_addr=ip_addr,
                 from_course=self._from_course_msg(course_id, course_is_embargoed)
             )
 
         # If we're white-listed, then allow access
-        if ip_addr in IPFilter.current().whitelist_ips:
+        if ip_addr in ip_filter.whitelist_ips:
             return None
 
         # Retrieve the country code from the IP address
         # and check it against the list of embargoed countries
-        ip_country = self._country_code_from_ip(ip_addr)
+        ip_country = country_code_by_addr(ip_addr)
         if ip_country in self._embargoed_countries:
             return self.REASONS['ip_country'].format(
                 ip_addr=ip_addr,
@@ -181,23 +183,6 @@ class EmbargoMiddleware(object):
         else:
             return None
 
-    def _country_code_from_ip(self, ip_addr):
-        """
-        Return the country code associated with an IP address.
-        Handles both IPv4 and IPv6 addresses.
-
-        Args:
-            ip_addr (str): The IP address to look up.
-
-        Returns:
-            str: A 2-letter country code.
-
-        """
-        if ip_addr.find(':') >= 0:
-            return pygeoip.GeoIP(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
-        else:
-            return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
-
     @property
     def _embargo_redirect_response(self):
         """
@@ -11,6 +11,8 @@ file and check it in at the same time as your model changes. To do that,
 3. Add the migration file created in edx-platform/common/djangoapps/embargo/migrations/
 """
 
+from collections import defaultdict
+
 import ipaddr
 
 from django.db import models
@@ -94,6 +96,12 @@ class IPFilter(ConfigurationModel):
         def __init__(self, ips):
             self.networks = [ipaddr.IPNetwork(ip) for ip in ips]
 
+            # The network addresses, as integers, by IP version and prefix length, so
+            # that an address is checked with one set lookup for each prefix length used
+            self._network_sets = defaultdict(set)
+            for network in self.networks:
+                self._network_sets[(network.version, network.prefixlen)].add(int(network.network))
+
         def __iter__(self):
             for network in self.networks:
                 yield network
@@ -104,12 +112,31 @@ class IPFilter(ConfigurationModel):
             except ValueError:
                 return False
 
-            for network in self.networks:
-                if network.Contains(ip):
+            for (version, prefixlen), network_addrs in self._network_sets.iteritems():
+                if version != ip.version:
+                    continue
+                host_bits = ip.max_prefixlen - prefixlen
+                if (int(ip) >> host_bits) << host_bits in network_addrs:
                     return True
 
             return False
 
+        @classmethod
+        def from_text(cls, text):
+            """
+            Return the list of the comma-separated IP addresses and networks in `text`.
+
+            IPFilter.current() is loaded from the cache for every request, so the lists
+            are kept here, by their text, rather than being made again each time.
+            """
+            ip_list = _ip_filter_lists.get(text)
+            if ip_list is None:
+                ip_list = cls([addr.strip() for addr in text.split(',')])
+                if len(_ip_filter_lists) >= IP_FILTER_LIST_CACHE_SIZE:
+                    _ip_filter_lists.clear()
+                _ip_filter_lists[text] = ip_list
+            return ip_list
+
     @property
     def whitelist_ips(self):
         """
@@ -117,7 +144,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.whitelist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])  # pylint: disable=no-member
+        return self.IPFilterList.from_text(self.whitelist)
 
     @property
     def blacklist_ips(self):
@@ -126,4 +153,9 @@ class IPFilter(ConfigurationModel):
         """
         if self.blacklist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])  # pylint: disable=no-member
+        return self.IPFilterList.from_text(self.blacklist)
+
+
+# The number of IP address lists kept by IPFilter.IPFilterList.from_text
+IP_FILTER_LIST_CACHE_SIZE = 16
+_ip_filter_lists = {}
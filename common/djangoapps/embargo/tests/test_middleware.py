@@ -22,6 +22,7 @@ from xmodule.modulestore.tests.django_utils import (
 # Explicitly import the cache from ConfigurationModel so we can reset it after each test
 from config_models.models import cache
 from embargo.models import EmbargoedCourse, EmbargoedState, IPFilter
+from geoinfo import lookup
 
 
 # Since we don't need any XML course fixtures, use a modulestore configuration
@@ -63,6 +64,7 @@ class EmbargoMiddlewareTests(ModuleStoreTestCase):
         # Explicitly clear ConfigurationModel's cache so tests have a clear cache
         # and don't interfere with each other
         cache.clear()
+        lookup.clear_cache()
         self.patcher.stop()
 
     def mock_country_code_by_addr(self, ip_addr):
@@ -95,3 +95,16 @@ class EmbargoModelsTest(TestCase):
         self.assertTrue('1.1.0.1' in cblacklist)
         self.assertTrue('1.1.1.0' in cblacklist)
         self.assertFalse('1.2.0.0' in cblacklist)
+
+    def test_ip_mixed_networks(self):
+        blacklist = '10.0.0.0/8, 18.244.51.3, 2001:db8::/32, 2001:db9::1'
+        IPFilter(blacklist=blacklist).save()
+
+        cblacklist = IPFilter.current().blacklist_ips
+        for ip_addr in ['10.1.2.3', '18.244.51.3', '2001:db8::5', '2001:db9::1']:
+            self.assertTrue(ip_addr in cblacklist, ip_addr)
+        for ip_addr in ['11.0.0.0', '18.244.51.4', '2001:db9::2', '::a00:1', 'not an ip']:
+            self.assertFalse(ip_addr in cblacklist, ip_addr)
+
+        # The list is made once for the same text
+        self.assertIs(IPFilter.current().blacklist_ips, cblacklist)
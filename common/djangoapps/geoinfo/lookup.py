@@ -0,0 +1,66 @@
+"""
+Country lookups of IP addresses, shared by the middleware that needs them.
+
+The GeoIP databases are opened once per process, memory-mapped, and the
+countries of recently seen addresses are remembered, so that a lookup in the
+request path costs next to nothing.
+"""
+from collections import OrderedDict
+import threading
+
+import pygeoip
+from django.conf import settings
+
+# The number of IP addresses whose country is remembered
+COUNTRY_CACHE_SIZE = 10000
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+_country_codes = OrderedDict()
+_country_codes_lock = threading.Lock()
+
+
+def _reader(path):
+    """
+    Return the shared GeoIP reader of the database at `path`.
+    """
+    reader = _readers.get(path)
+    if reader is None:
+        with _readers_lock:
+            reader = _readers.get(path)
+            if reader is None:
+                reader = _readers[path] = pygeoip.GeoIP(path, pygeoip.MMAP_CACHE)
+    return reader
+
+
+def country_code_by_addr(ip_addr):
+    """
+    Return the 2-letter code of the country of the IPv4 or IPv6 address `ip_addr`,
+    or an empty string if the country isn't known.
+    """
+    with _country_codes_lock:
+        country_code = _country_codes.pop(ip_addr, None)
+        if country_code is not None:
+            _country_codes[ip_addr] = country_code
+            return country_code
+
+    if ip_addr.find(':') >= 0:
+        path = settings.GEOIPV6_PATH
+    else:
+        path = settings.GEOIP_PATH
+    country_code = _reader(path).country_code_by_addr(ip_addr) or ''
+
+    with _country_codes_lock:
+        _country_codes[ip_addr] = country_code
+        while len(_country_codes) > COUNTRY_CACHE_SIZE:
+            _country_codes.popitem(last=False)
+    return country_code
+
+
+def clear_cache():
+    """
+    Forget the countries of the IP addresses looked up so far.
+    """
+    with _country_codes_lock:
+        _country_codes.clear()
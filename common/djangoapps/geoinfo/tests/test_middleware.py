@@ -8,6 +8,7 @@ from django.contrib.sessions.middleware import SessionMiddleware
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.test.client import RequestFactory
+from geoinfo import lookup
 from geoinfo.middleware import CountryMiddleware
 
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MOCK_MODULESTORE
@@ -29,6 +30,7 @@ class CountryMiddlewareTests(TestCase):
         self.patcher.start()
 
     def tearDown(self):
+        lookup.clear_cache()
         self.patcher.stop()
 
     def mock_country_code_by_addr(self, ip_addr):
@@ -114,6 +116,31 @@ class CountryMiddlewareTests(TestCase):
         self.assertNotIn('country_code', request.session)
         self.assertNotIn('ip_address', request.session)
 
+    def test_country_code_remembered(self):
+        with patch.object(pygeoip, 'GeoIP', wraps=pygeoip.GeoIP) as mock_geoip:
+            with patch.dict(lookup._readers, clear=True):  # pylint: disable=protected-access
+                self.assertEqual(lookup.country_code_by_addr('117.79.83.1'), 'CN')
+                self.assertEqual(lookup.country_code_by_addr('4.0.0.0'), 'SD')
+                self.assertEqual(lookup.country_code_by_addr('2001:da8:20f:1502:edcf:550b:4a9c:207d'), 'CN')
+                # One reader for each of IPv4 and IPv6
+                self.assertEqual(mock_geoip.call_count, 2)
+
+        with patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_country_code:
+            self.assertEqual(lookup.country_code_by_addr('117.79.83.1'), 'CN')
+            self.assertFalse(mock_country_code.called)
+
+    def test_least_recently_used_forgotten(self):
+        with patch.object(lookup, 'COUNTRY_CACHE_SIZE', 2):
+            lookup.country_code_by_addr('117.79.83.1')
+            lookup.country_code_by_addr('4.0.0.0')
+            lookup.country_code_by_addr('117.79.83.1')
+            lookup.country_code_by_addr('117.79.83.100')
+
+            with patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='US') as mock_country_code:
+                self.assertEqual(lookup.country_code_by_addr('117.79.83.1'), 'CN')
+                self.assertEqual(lookup.country_code_by_addr('4.0.0.0'), 'US')
+                self.assertEqual(mock_country_code.call_count, 1)
+
     def test_ip_address_is_ipv6(self):
         request = self.request_factory.get(
             '/somewhere',
@@ -2,6 +2,7 @@ import threading
 
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
+_request_cache_threadlocal.request = None
 
 
 class RequestCache(object):
@@ -9,10 +10,23 @@ class RequestCache(object):
     def get_request_cache(cls):
         return _request_cache_threadlocal
 
+    @classmethod
+    def get_current_request(cls):
+        """
+        Return the request being handled by this thread, or None if it isn't handling one.
+        """
+        return getattr(_request_cache_threadlocal, 'request', None)
+
     def clear_request_cache(self):
         _request_cache_threadlocal.data = {}
+        _request_cache_threadlocal.request = None
 
     def process_request(self, request):
+        self.clear_request_cache()
+        _request_cache_threadlocal.request = request
+        return None
+
+    def process_exception(self, request, exception):
         self.clear_request_cache()
         return None
 
@@ -7,29 +7,59 @@ from abc import ABCMeta, abstractmethod
 
 from django.contrib.auth.models import User
 
+from request_cache.middleware import RequestCache
 from student.models import CourseAccessRole
 from xmodule_django.models import CourseKeyField
 
 
 class RoleCache(object):
     """
-    A cache of the CourseAccessRoles held by a particular user
+    A cache of the CourseAccessRoles held by a particular user, indexed by (role, course_id, org)
     """
     def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
+        self._roles = dict(
+            ((access_role.role, access_role.course_id, access_role.org), access_role)
+            for access_role in CourseAccessRole.objects.filter(user=user)
         )
 
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return (role, course_id, org) in self._roles
+
+
+def get_role_cache(user):
+    """
+    Return the RoleCache of `user`.
+
+    The RoleCache is kept on `user`, and, while handling a request, shared by every
+    object for the same user loaded during the request.
+    """
+    # pylint: disable=protected-access
+    if not hasattr(user, '_roles'):
+        if RequestCache.get_current_request() is None:
+            user._roles = RoleCache(user)
+        else:
+            role_caches = RequestCache.get_request_cache().data.setdefault('student.roles', {})
+            if user.id not in role_caches:
+                role_caches[user.id] = RoleCache(user)
+            user._roles = role_caches[user.id]
+    return user._roles
+
+
+def clear_role_cache(user):
+    """
+    Forget the cached roles of `user`, and any access checks for the current
+    request that were made with them.
+    """
+    # pylint: disable=protected-access
+    if hasattr(user, '_roles'):
+        del user._roles
+    if RequestCache.get_current_request() is not None:
+        request_data = RequestCache.get_request_cache().data
+        request_data.get('student.roles', {}).pop(user.id, None)
+        request_data.get('courseware.access', {}).pop(user.id, None)
 
 
 class AccessRole(object):
@@ -79,12 +109,14 @@ class GlobalStaff(AccessRole):
             if (user.is_authenticated() and user.is_active):
                 user.is_staff = True
                 user.save()
+                clear_role_cache(user)
 
     def remove_users(self, *users):
         for user in users:
             # don't check is_authenticated nor is_active on purpose
             user.is_staff = False
             user.save()
+            clear_role_cache(user)
 
     def users_with_role(self):
         raise Exception("This operation is un-indexed, and shouldn't be used")
@@ -114,13 +146,7 @@ class RoleBase(AccessRole):
         if not (user.is_authenticated() and user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(user, '_roles'):
-            # Cache a list of tuples identifying the particular roles that a user has
-            # Stored as tuples, rather than django models, to make it cheaper to construct objects for comparison
-            user._roles = RoleCache(user)
-
-        return user._roles.has_role(self._role_name, self.course_key, self.org)
+        return get_role_cache(user).has_role(self._role_name, self.course_key, self.org)
 
     def add_users(self, *users):
         """
@@ -133,8 +159,7 @@ class RoleBase(AccessRole):
             if user.is_authenticated and user.is_active and not self.has_user(user):
                 entry = CourseAccessRole(user=user, role=self._role_name, course_id=self.course_key, org=self.org)
                 entry.save()
-                if hasattr(user, '_roles'):
-                    del user._roles
+                clear_role_cache(user)
 
     def remove_users(self, *users):
         """
@@ -145,8 +170,7 @@ class RoleBase(AccessRole):
         )
         entries.delete()
         for user in users:
-            if hasattr(user, '_roles'):
-                del user._roles
+            clear_role_cache(user)
 
     def users_with_role(self):
         """
@@ -260,11 +284,7 @@ class UserBasedRole(object):
         if not (self.user.is_authenticated() and self.user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(self.user, '_roles'):
-            self.user._roles = RoleCache(self.user)
-
-        return self.user._roles.has_role(self.role, course_key, course_key.org)
+        return get_role_cache(self.user).has_role(self.role, course_key, course_key.org)
 
     def add_course(self, *course_keys):
         """
@@ -274,8 +294,7 @@ class UserBasedRole(object):
             for course_key in course_keys:
                 entry = CourseAccessRole(user=self.user, role=self.role, course_id=course_key, org=course_key.org)
                 entry.save()
-            if hasattr(self.user, '_roles'):
-                del self.user._roles
+            clear_role_cache(self.user)
         else:
             raise ValueError("user is not active. Cannot grant access to courses")
 
@@ -285,8 +304,7 @@ class UserBasedRole(object):
         """
         entries = CourseAccessRole.objects.filter(user=self.user, role=self.role, course_id__in=course_keys)
         entries.delete()
-        if hasattr(self.user, '_roles'):
-            del self.user._roles
+        clear_role_cache(self.user)
 
     def courses_with_role(self):
         """
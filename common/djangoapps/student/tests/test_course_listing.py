@@ -12,6 +12,7 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.modulestore.django import modulestore
 from xmodule.error_module import ErrorDescriptor
+from xmodule.course_module import CourseSummary
 from django.test.client import Client
 from student.models import CourseEnrollment
 from student.views import get_course_enrollment_pairs
@@ -74,6 +75,24 @@ class TestCourseListing(ModuleStoreTestCase):
         courses_list = list(get_course_enrollment_pairs(self.student, None, []))
         self.assertEqual(len(courses_list), 0)
 
+    def test_courses_loaded_together(self):
+        """
+        Test that the enrolled courses are loaded as summaries in a single modulestore call
+        """
+        course_keys = [SlashSeparatedCourseKey('Org1', 'Course{}'.format(num), 'Run1') for num in range(3)]
+        for course_key in course_keys:
+            self._create_course_with_access_groups(course_key)
+
+        store = modulestore()
+        with patch.object(store, 'get_course', wraps=store.get_course) as mock_get_course:
+            with patch.object(store, 'get_course_summaries', wraps=store.get_course_summaries) as mock_summaries:
+                courses_list = list(get_course_enrollment_pairs(self.student, None, []))
+        self.assertEqual(mock_summaries.call_count, 1)
+        self.assertFalse(mock_get_course.called)
+        self.assertItemsEqual([course.id for course, __ in courses_list], course_keys)
+        for course, __ in courses_list:
+            self.assertIsInstance(course, CourseSummary)
+
     def test_errored_course_regular_access(self):
         """
         Test the course list for regular staff when get_course returns an ErrorDescriptor
@@ -2,9 +2,12 @@
 Tests of student.roles
 """
 import ddt
+from django.contrib.auth.models import User
 from django.test import TestCase
+from mock import Mock
 
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
+from request_cache.middleware import RequestCache
 from student.tests.factories import AnonymousUserFactory
 
 from student.roles import (
@@ -191,3 +194,15 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_shared_for_request(self):
+        RequestCache().process_request(Mock())
+        self.addCleanup(RequestCache().clear_request_cache)
+        role = CourseStaffRole(self.IN_KEY)
+        self.assertFalse(role.has_user(self.user))
+        same_user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(0):
+            self.assertFalse(role.has_user(same_user))
+
+        role.add_users(self.user)
+        self.assertTrue(role.has_user(User.objects.get(id=self.user.id)))
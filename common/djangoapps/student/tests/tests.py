@@ -358,6 +358,28 @@ class DashboardTest(ModuleStoreTestCase):
 
         self.assertFalse(enrollment.refundable())
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_notpassing_certificate(self):
+        # The dashboard lists course summaries, which must give the grade needed for a certificate
+        course = CourseFactory.create(
+            certificates_display_behavior='early_with_info',
+            grading_policy={'GRADE_CUTOFFS': {'A': 0.9, 'Pass': 0.75}},
+        )
+        CourseEnrollment.enroll(self.user, course.id, mode='honor')
+        GeneratedCertificateFactory.create(
+            user=self.user,
+            course_id=course.id,
+            status=CertificateStatuses.notpassing,
+            grade='0.67',
+            mode='honor'
+        )
+
+        self.client.login(username="jack", password="test")
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, 'course-status-certnotavailable')
+        self.assertContains(response, '67%')
+        self.assertContains(response, '75%')
+
 
 class EnrollInCourseTest(TestCase):
     """Tests enrolling and unenrolling in courses."""
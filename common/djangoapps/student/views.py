@@ -103,7 +103,6 @@ from student.helpers import (
     auth_pipeline_urls, set_logged_in_cookie,
     check_verify_status_by_course
 )
-from xmodule.error_module import ErrorDescriptor
 from shoppingcart.models import DonationConfiguration, CourseRegistrationCode
 from openedx.core.djangoapps.user_api.api import profile as profile_api
 
@@ -261,27 +260,32 @@ def get_course_enrollment_pairs(user, course_org_filter, org_filter_out_set):
     """
     Get the relevant set of (Course, CourseEnrollment) pairs to be displayed on
     a student's dashboard.
+
+    The courses are CourseSummary objects, loaded for all of the enrollments at once.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
-        store = modulestore()
-        with store.bulk_operations(enrollment.course_id):
-            course = store.get_course(enrollment.course_id)
-            if course and not isinstance(course, ErrorDescriptor):
-
-                # if we are in a Microsite, then filter out anything that is not
-                # attributed (by ORG) to that Microsite
-                if course_org_filter and course_org_filter != course.location.org:
-                    continue
-                # Conversely, if we are not in a Microsite, then let's filter out any enrollments
-                # with courses attributed (by ORG) to Microsites
-                elif course.location.org in org_filter_out_set:
-                    continue
-
-                yield (course, enrollment)
-            else:
-                log.error("User {0} enrolled in {2} course {1}".format(
-                    user.username, enrollment.course_id, "broken" if course else "non-existent"
-                ))
+    enrollments = list(CourseEnrollment.enrollments_for_user(user))
+    courses = {
+        course.id: course
+        for course in modulestore().get_course_summaries([enrollment.course_id for enrollment in enrollments])
+    }
+    for enrollment in enrollments:
+        course = courses.get(enrollment.course_id)
+        if course is not None:
+
+            # if we are in a Microsite, then filter out anything that is not
+            # attributed (by ORG) to that Microsite
+            if course_org_filter and course_org_filter != course.location.org:
+                continue
+            # Conversely, if we are not in a Microsite, then let's filter out any enrollments
+            # with courses attributed (by ORG) to Microsites
+            elif course.location.org in org_filter_out_set:
+                continue
+
+            yield (course, enrollment)
+        else:
+            log.error("User {0} enrolled in broken or non-existent course {1}".format(
+                user.username, enrollment.course_id
+            ))
 
 
 def _cert_info(user, course, cert_status):
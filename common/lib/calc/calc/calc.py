@@ -7,6 +7,9 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import operator
 import numbers
+import threading
+from collections import OrderedDict
+
 import numpy
 import scipy.constants
 import functions
@@ -73,6 +76,15 @@ SUFFIXES = {
 }
 
 
+# The number of parsed expressions to remember
+PARSED_EXPRESSION_CACHE_SIZE = 1000
+_parsed_expressions = OrderedDict()
+_parsed_expressions_lock = threading.Lock()
+
+_grammar = None
+_grammar_lock = threading.Lock()
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -94,6 +106,17 @@ def lower_dict(input_dict):
 # The following few functions define evaluation actions, which are run on lists
 # of results from each parse component. They convert the strings and (previously
 # calculated) numbers into the number that component represents.
+#
+# When the expression is evaluated over arrays of values (see `evaluator`), the
+# results of components may be NumPy arrays instead of numbers.
+
+def is_value(token):
+    """
+    Whether `token` is a result (a number, or an array of them) rather than an
+    operator or a parenthesis.
+    """
+    return isinstance(token, (numbers.Number, numpy.ndarray))
+
 
 def super_float(text):
     """
@@ -122,7 +145,7 @@ def eval_atom(parse_result):
     In the case of parenthesis, ignore them.
     """
     # Find first number in the list
-    result = next(k for k in parse_result if isinstance(k, numbers.Number))
+    result = next(k for k in parse_result if is_value(k))
     return result
 
 
@@ -136,7 +159,7 @@ def eval_power(parse_result):
     # `reduce` will go from left to right; reverse the list.
     parse_result = reversed(
         [k for k in parse_result
-         if isinstance(k, numbers.Number)]  # Ignore the '^' marks.
+         if is_value(k)]  # Ignore the '^' marks.
     )
     # Having reversed it, raise `b` to the power of `a`.
     power = reduce(lambda a, b: b ** a, parse_result)
@@ -155,10 +178,10 @@ def eval_parallel(parse_result):
     """
     if len(parse_result) == 1:
         return parse_result[0]
-    if 0 in parse_result:
+    values = [e for e in parse_result if is_value(e)]
+    if any(numpy.any(e == 0) for e in values):
         return float('nan')
-    reciprocals = [1. / e for e in parse_result
-                   if isinstance(e, numbers.Number)]
+    reciprocals = [1. / e for e in values]
     return 1. / sum(reciprocals)
 
 
@@ -173,12 +196,12 @@ def eval_sum(parse_result):
     total = 0.0
     current_op = operator.add
     for token in parse_result:
-        if token == '+':
+        if not isinstance(token, basestring):
+            total = current_op(total, token)
+        elif token == '+':
             current_op = operator.add
         elif token == '-':
             current_op = operator.sub
-        else:
-            total = current_op(total, token)
     return total
 
 
@@ -191,12 +214,12 @@ def eval_product(parse_result):
     prod = 1.0
     current_op = operator.mul
     for token in parse_result:
-        if token == '*':
+        if not isinstance(token, basestring):
+            prod = current_op(prod, token)
+        elif token == '*':
             current_op = operator.mul
         elif token == '/':
             current_op = operator.truediv
-        else:
-            prod = current_op(prod, token)
     return prod
 
 
@@ -216,6 +239,97 @@ def add_defaults(variables, functions, case_sensitive):
     return (all_variables, all_functions)
 
 
+def _make_grammar():
+    """
+    Build the pyparsing grammar of an algebraic expression.
+
+    See `ParseAugmenter.parse_algebra` for the shape of the trees it makes.
+    """
+    # 0.33 or 7 or .34 or 16.
+    number_part = Word(nums)
+    inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
+    # pyparsing allows spaces between tokens--`Combine` prevents that.
+    inner_number = Combine(inner_number)
+
+    # SI suffixes and percent.
+    number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
+
+    # 0.33k or 17
+    plus_minus = Literal('+') | Literal('-')
+    number = Group(
+        Optional(plus_minus) +
+        inner_number +
+        Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
+        Optional(number_suffix)
+    )
+    number = number("number")
+
+    # Predefine recursive variables.
+    expr = Forward()
+
+    # Handle variables passed in. They must start with letters/underscores
+    # and may contain numbers afterward.
+    inner_varname = Word(alphas + "_", alphanums + "_")
+    varname = Group(inner_varname)("variable")
+
+    # Same thing for functions.
+    function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
+
+    atom = number | function | varname | "(" + expr + ")"
+    atom = Group(atom)("atom")
+
+    # Do the following in the correct order to preserve order of operation.
+    pow_term = atom + ZeroOrMore("^" + atom)
+    pow_term = Group(pow_term)("power")
+
+    par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
+    par_term = Group(par_term)("parallel")
+
+    prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
+    prod_term = Group(prod_term)("product")
+
+    sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
+    sum_term = Group(sum_term)("sum")
+
+    # Finish the recursion.
+    expr << sum_term  # pylint: disable=pointless-statement
+    return expr + stringEnd
+
+
+def _parse(math_expr):
+    """
+    Parse `math_expr` with the grammar, which is built the first time it's needed.
+
+    pyparsing grammars keep some state while parsing, so only one expression
+    is parsed at a time.
+    """
+    global _grammar  # pylint: disable=global-statement
+    with _grammar_lock:
+        if _grammar is None:
+            _grammar = _make_grammar()
+        return _grammar.parseString(math_expr)[0]
+
+
+def _names_used(tree):
+    """
+    Return the sets of the variable names and of the function names in `tree`.
+    """
+    variables_used = set()
+    functions_used = set()
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if not isinstance(node, ParseResults):
+            continue
+        node_name = node.getName()
+        if node_name == 'variable':
+            variables_used.add(node[0])
+        elif node_name == 'function':
+            functions_used.add(node[0])
+        nodes.extend(node)
+    return variables_used, functions_used
+
+
 def evaluator(variables, functions, math_expr, case_sensitive=False):
     """
     Evaluate an expression; that is, take a string of math and return a float.
@@ -223,6 +337,12 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     -Variables are passed as a dictionary from string to value. They must be
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
+
+    The values of variables may also be NumPy arrays, all of the same shape, to
+    evaluate the expression for each of their elements at once. The result is
+    then an array (or a number, if the expression uses none of them). Errors
+    aren't raised the same way over arrays: e.g. a division by zero gives an
+    infinity, and `fact` can't be used at all.
     """
     # No need to go further.
     if math_expr.strip() == "":
@@ -278,23 +398,6 @@ class ParseAugmenter(object):
         self.variables_used = set()
         self.functions_used = set()
 
-        def vpa(tokens):
-            """
-            When a variable is recognized, store it in `variables_used`.
-            """
-            varname = tokens[0][0]
-            self.variables_used.add(varname)
-
-        def fpa(tokens):
-            """
-            When a function is recognized, store it in `functions_used`.
-            """
-            varname = tokens[0][0]
-            self.functions_used.add(varname)
-
-        self.variable_parse_action = vpa
-        self.function_parse_action = fpa
-
     def parse_algebra(self):
         """
         Parse an algebraic expression into a tree.
@@ -306,58 +409,28 @@ class ParseAugmenter(object):
         Adding the groups and result names makes the `repr()` of the result
         really gross. For debugging, use something like
           print OBJ.tree.asXML()
+
+        The trees of the last `PARSED_EXPRESSION_CACHE_SIZE` expressions are
+        remembered, and shared by the ParseAugmenters that parse them; they
+        must not be modified.
         """
-        # 0.33 or 7 or .34 or 16.
-        number_part = Word(nums)
-        inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
-        # pyparsing allows spaces between tokens--`Combine` prevents that.
-        inner_number = Combine(inner_number)
-
-        # SI suffixes and percent.
-        number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
-
-        # 0.33k or 17
-        plus_minus = Literal('+') | Literal('-')
-        number = Group(
-            Optional(plus_minus) +
-            inner_number +
-            Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
-            Optional(number_suffix)
-        )
-        number = number("number")
-
-        # Predefine recursive variables.
-        expr = Forward()
-
-        # Handle variables passed in. They must start with letters/underscores
-        # and may contain numbers afterward.
-        inner_varname = Word(alphas + "_", alphanums + "_")
-        varname = Group(inner_varname)("variable")
-        varname.setParseAction(self.variable_parse_action)
-
-        # Same thing for functions.
-        function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
-        function.setParseAction(self.function_parse_action)
-
-        atom = number | function | varname | "(" + expr + ")"
-        atom = Group(atom)("atom")
-
-        # Do the following in the correct order to preserve order of operation.
-        pow_term = atom + ZeroOrMore("^" + atom)
-        pow_term = Group(pow_term)("power")
-
-        par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
-        par_term = Group(par_term)("parallel")
-
-        prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
-        prod_term = Group(prod_term)("product")
-
-        sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
-        sum_term = Group(sum_term)("sum")
-
-        # Finish the recursion.
-        expr << sum_term  # pylint: disable=pointless-statement
-        self.tree = (expr + stringEnd).parseString(self.math_expr)[0]
+        key = (self.math_expr, self.case_sensitive)
+        with _parsed_expressions_lock:
+            parsed = _parsed_expressions.pop(key, None)
+            if parsed is not None:
+                _parsed_expressions[key] = parsed
+
+        if parsed is None:
+            tree = _parse(self.math_expr)
+            parsed = (tree,) + _names_used(tree)
+            with _parsed_expressions_lock:
+                _parsed_expressions[key] = parsed
+                while len(_parsed_expressions) > PARSED_EXPRESSION_CACHE_SIZE:
+                    _parsed_expressions.popitem(last=False)
+
+        self.tree, variables_used, functions_used = parsed
+        self.variables_used = set(variables_used)
+        self.functions_used = set(functions_used)
 
     def reduce_tree(self, handle_actions, terminal_converter=None):
         """
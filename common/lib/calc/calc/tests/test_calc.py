@@ -5,6 +5,8 @@ Unit tests for calc.py
 import unittest
 import numpy
 import calc
+from calc import calc as calc_module
+from mock import patch
 from pyparsing import ParseException
 
 # numpy's default behavior when it evaluates a function outside its domain
@@ -559,3 +561,57 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class ParseCacheTest(unittest.TestCase):
+    """
+    Tests of the cache of parsed expressions.
+    """
+    def setUp(self):
+        super(ParseCacheTest, self).setUp()
+        patcher = patch.object(calc_module, '_parsed_expressions', calc_module.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parsed_once(self):
+        with patch.object(calc_module, '_parse', wraps=calc_module._parse) as mock_parse:
+            self.assertAlmostEqual(calc.evaluator({'x': 2}, {}, 'sin(x)^2 + cos(x)^2'), 1)
+            self.assertAlmostEqual(calc.evaluator({'x': 3}, {}, 'sin(x)^2 + cos(x)^2'), 1)
+            self.assertEqual(mock_parse.call_count, 1)
+
+            # Each ParseAugmenter gets the names used in the expression
+            parser = calc.ParseAugmenter('sin(x)^2 + cos(x)^2')
+            parser.parse_algebra()
+            self.assertEqual(mock_parse.call_count, 1)
+            self.assertEqual(parser.variables_used, set(['x']))
+            self.assertEqual(parser.functions_used, set(['sin', 'cos']))
+
+    def test_names_in_nested_expressions(self):
+        parser = calc.ParseAugmenter('f(g(a_1) * (b + 2)) || c')
+        parser.parse_algebra()
+        self.assertEqual(parser.variables_used, set(['a_1', 'b', 'c']))
+        self.assertEqual(parser.functions_used, set(['f', 'g']))
+
+    def test_case_sensitivity_in_key(self):
+        calc.evaluator({'X': 1}, {}, 'X', case_sensitive=True)
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'X'):
+            calc.evaluator({'x': 1}, {}, 'X', case_sensitive=True)
+        self.assertEqual(calc.evaluator({'x': 1}, {}, 'X'), 1)
+
+    def test_parse_errors_not_cached(self):
+        with self.assertRaises(ParseException):
+            calc.evaluator({}, {}, '1 +')
+        self.assertEqual(len(calc_module._parsed_expressions), 0)
+
+    def test_least_recently_used_is_evicted(self):
+        with patch.object(calc_module, 'PARSED_EXPRESSION_CACHE_SIZE', 2):
+            calc.evaluator({}, {}, '1')
+            calc.evaluator({}, {}, '2')
+            calc.evaluator({}, {}, '1')
+            calc.evaluator({}, {}, '3')
+
+            with patch.object(calc_module, '_parse', wraps=calc_module._parse) as mock_parse:
+                calc.evaluator({}, {}, '1')
+                self.assertEqual(mock_parse.call_count, 0)
+                calc.evaluator({}, {}, '2')
+                self.assertEqual(mock_parse.call_count, 1)
@@ -13,11 +13,14 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from collections import namedtuple, OrderedDict
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+import threading
 
 from lxml import etree
 from pytz import UTC
@@ -58,6 +61,60 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# How many problem templates to keep in each process (see LoncapaProblem._get_template)
+PROBLEM_TEMPLATE_CACHE_SIZE = 1000
+_problem_templates = OrderedDict()
+_problem_templates_lock = threading.Lock()
+
+# The products of parsing a problem that are the same for every student:
+#   problem_text: the text, with startouttext and endouttext converted
+#   tree: the parsed text, with includes resolved. Never modified; problems work on a copy.
+#   included_files: (system path, modification time) of each included file
+#   script_code, script_dirs: the code of the problem's scripts, and the
+#       directories they may import from (whether or not they exist)
+ProblemTemplate = namedtuple('ProblemTemplate', 'problem_text tree included_files script_code script_dirs')
+
+# Compiled XPath expressions, by thread, as XPath objects aren't thread safe
+_xpaths = threading.local()
+
+
+def compiled_xpath(path):
+    """
+    Return `path` compiled to an `etree.XPath`, compiling each path only once per
+    thread rather than every time a problem is processed.
+    """
+    cache = getattr(_xpaths, 'cache', None)
+    if cache is None:
+        cache = _xpaths.cache = {}
+    xpath = cache.get(path)
+    if xpath is None:
+        xpath = cache[path] = etree.XPath(path)
+    return xpath
+
+
+def _file_modified_time(filestore, filename):
+    """
+    Return the system path and modification time of `filename` in `filestore`,
+    or None if it can't be found on the system.
+    """
+    try:
+        syspath = filestore.getsyspath(filename)
+        return syspath, os.path.getmtime(syspath)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _files_unchanged(files):
+    """
+    Return whether each of `files`, a list of (system path, modification time),
+    is still there and unmodified.
+    """
+    try:
+        return all(os.path.getmtime(syspath) == mtime for syspath, mtime in files)
+    except OSError:
+        return False
+
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -154,19 +211,14 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # parse problem XML file into an element tree, with any <include file="foo">
+        # tags handled. The tree is modified as the problem is processed, so copy it.
+        template = self._get_template(problem_text)
+        self.problem_text = template.problem_text
+        self.tree = deepcopy(template.tree)
 
         # construct script processor context (eg for customresponse problems)
-        self.context = self._extract_context(self.tree)
+        self.context = self._extract_context(template.script_code, template.script_dirs)
 
         # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
         # transformations.  This also creates the dict (self.responders) of Response
@@ -529,12 +581,58 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
-    def _process_includes(self):
+    def _get_template(self, problem_text):
+        """
+        Return the ProblemTemplate for `problem_text`, from the per-process cache if
+        it's there and none of its included files have changed since.
+        """
+        if isinstance(problem_text, unicode):
+            text_hash = (unicode, hashlib.md5(problem_text.encode('utf-8')).digest())
+        else:
+            text_hash = (str, hashlib.md5(problem_text).digest())
+        # Includes and script paths are relative to the course's files
+        key = (getattr(self.capa_system.filestore, 'root_path', None), text_hash)
+
+        with _problem_templates_lock:
+            template = _problem_templates.pop(key, None)
+            if template is not None:
+                _problem_templates[key] = template
+        if template is not None and _files_unchanged(template.included_files):
+            return template
+
+        template = self._make_template(problem_text)
+        if template.included_files is not None:
+            with _problem_templates_lock:
+                _problem_templates[key] = template
+                while len(_problem_templates) > PROBLEM_TEMPLATE_CACHE_SIZE:
+                    _problem_templates.popitem(last=False)
+        return template
+
+    def _make_template(self, problem_text):
+        """
+        Parse `problem_text` into a ProblemTemplate. Its `included_files` is None
+        if the template can't be cached, because an included file is missing or
+        isn't on the system.
+        """
+        # Convert startouttext and endouttext to proper <text></text>
+        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+
+        tree = etree.XML(problem_text)
+        included_files = self._process_includes(tree)
+        script_code, script_dirs = self._extract_script_code(tree)
+        return ProblemTemplate(problem_text, tree, included_files, script_code, script_dirs)
+
+    def _process_includes(self, tree):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
-        into our XML tree.  Fail gracefully if debugging.
+        into `tree`.  Fail gracefully if debugging.
+
+        Returns a list of the (system path, modification time) of each included file,
+        or None if any of them couldn't be included or isn't on the system.
         """
-        includes = self.tree.findall('.//include')
+        included_files = []
+        includes = tree.findall('.//include')
         for inc in includes:
             filename = inc.get('file')
             if filename is not None:
@@ -555,6 +653,7 @@ class LoncapaProblem(object):
                     if not self.capa_system.DEBUG:
                         raise
                     else:
+                        included_files = None
                         continue
                 try:
                     # read in and convert to XML
@@ -571,6 +670,7 @@ class LoncapaProblem(object):
                     if not self.capa_system.DEBUG:
                         raise
                     else:
+                        included_files = None
                         continue
 
                 # insert new XML into tree in place of include
@@ -579,6 +679,14 @@ class LoncapaProblem(object):
                 parent.remove(inc)
                 log.debug('Included %s into %s' % (filename, self.problem_id))
 
+                if included_files is not None:
+                    included_file = _file_modified_time(self.capa_system.filestore, filename)
+                    if included_file is None:
+                        included_files = None
+                    else:
+                        included_files.append(included_file)
+        return included_files
+
     def _extract_system_path(self, script):
         """
         Extracts and normalizes additional paths for code execution.
@@ -613,20 +721,15 @@ class LoncapaProblem(object):
 
         return path
 
-    def _extract_context(self, tree):
+    def _extract_script_code(self, tree):
         """
-        Extract content of <script>...</script> from the problem.xml file, and exec it in the
-        context of this problem.  Provides ability to randomize problems, and also set
-        variables for problem answer checking.
+        Extract content of <script>...</script> from the problem.xml file.
 
-        Problem XML goes to Python execution context. Runs everything in script tags.
+        Returns the code of all the Python scripts, and the directories that they
+        may import from.
         """
-        context = {}
-        context['seed'] = self.seed
-        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
         all_code = ''
-
-        python_path = []
+        script_dirs = []
 
         for script in tree.findall('.//script'):
 
@@ -638,14 +741,29 @@ class LoncapaProblem(object):
                     continue        # skip perl
             # TODO: evaluate only python
 
-            for d in self._extract_system_path(script):
-                if d not in python_path and os.path.exists(d):
-                    python_path.append(d)
+            script_dirs.extend(self._extract_system_path(script))
 
             XMLESC = {"&apos;": "'", "&quot;": '"'}
             code = unescape(script.text, XMLESC)
             all_code += code
 
+        return all_code, script_dirs
+
+    def _extract_context(self, all_code, script_dirs):
+        """
+        Exec `all_code`, the content of the problem's scripts, in the context of this
+        problem.  Provides ability to randomize problems, and also set variables for
+        problem answer checking.
+        """
+        context = {}
+        context['seed'] = self.seed
+        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+
+        python_path = []
+        for d in script_dirs:
+            if d not in python_path and os.path.exists(d):
+                python_path.append(d)
+
         extra_files = []
         if all_code:
             # An asset named python_lib.zip can be imported by Python code.
@@ -787,7 +905,7 @@ class LoncapaProblem(object):
         """
         response_id = 1
         self.responders = {}
-        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+        for response in compiled_xpath('//' + "|//".join(responsetypes.registry.registered_tags()))(tree):
             response_id_str = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
             response.set('id', response_id_str)
@@ -795,10 +913,9 @@ class LoncapaProblem(object):
 
             answer_id = 1
             input_tags = inputtypes.registry.registered_tags()
-            inputfields = tree.xpath(
-                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in (input_tags + solution_tags)]),
-                id=response_id_str
-            )
+            inputfields = compiled_xpath(
+                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in (input_tags + solution_tags)])
+            )(tree, id=response_id_str)
 
             # assign one answer_id for each input type or solution type
             for entry in inputfields:
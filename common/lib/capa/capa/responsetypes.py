@@ -42,7 +42,7 @@ from .registry import TagRegistry
 from datetime import datetime
 from pytz import UTC
 from .util import (
-    compare_with_tolerance, contextualize_text, convert_files_to_filenames,
+    compare_with_tolerance, compare_arrays_with_tolerance, contextualize_text, convert_files_to_filenames,
     is_list_of_files, find_with_default, default_tolerance
 )
 from lxml import etree
@@ -2412,6 +2412,38 @@ class FormulaResponse(LoncapaResponse):
                 )
         return out
 
+    def evaluate_samples(self, answer, var_dict_list):
+        """
+        Evaluates an answer for all the test cases in a list of dictionaries mapping
+        variables to values at once, over NumPy arrays of the values of each variable.
+        Returns an array of the results, as `tupleize_answers` would give them.
+
+        Returns None if the answer raises an error, or has a result that isn't
+        finite, when evaluated this way: the errors of evaluating over arrays
+        differ, so such answers must go through `tupleize_answers`.
+        """
+        if not var_dict_list:
+            return None
+
+        num_samples = len(var_dict_list)
+        variables = dict(
+            (var, numpy.array([var_dict[var] for var_dict in var_dict_list]))
+            for var in var_dict_list[0]
+        )
+        # pylint: disable=broad-except
+        try:
+            # Raise the errors that the same operations raise on Python numbers
+            with numpy.errstate(divide='raise', over='raise', invalid='raise', under='ignore'):
+                results = evaluator(variables, dict(), answer, case_sensitive=self.case_sensitive)
+                # Answers which use none of the variables have a single result
+                results = results + numpy.zeros(num_samples)
+        except Exception:
+            return None
+
+        if results.shape != (num_samples,) or not numpy.all(numpy.isfinite(results)):
+            return None
+        return results
+
     def randomize_variables(self, samples):
         """
         Returns a list of dictionaries mapping variables to random values in range,
@@ -2441,11 +2473,19 @@ class FormulaResponse(LoncapaResponse):
         "correct" or "incorrect".
         """
         var_dict_list = self.randomize_variables(samples)
-        student_result = self.tupleize_answers(given, var_dict_list)
-        instructor_result = self.tupleize_answers(expected, var_dict_list)
 
-        correct = all(compare_with_tolerance(student, instructor, self.tolerance)
-                      for student, instructor in zip(student_result, instructor_result))
+        student_result = self.evaluate_samples(given, var_dict_list)
+        instructor_result = None
+        if student_result is not None:
+            instructor_result = self.evaluate_samples(expected, var_dict_list)
+
+        if instructor_result is not None:
+            correct = numpy.all(compare_arrays_with_tolerance(student_result, instructor_result, self.tolerance))
+        else:
+            student_result = self.tupleize_answers(given, var_dict_list)
+            instructor_result = self.tupleize_answers(expected, var_dict_list)
+            correct = all(compare_with_tolerance(student, instructor, self.tolerance)
+                          for student, instructor in zip(student_result, instructor_result))
         if correct:
             return "correct"
         else:
@@ -2463,6 +2503,8 @@ class FormulaResponse(LoncapaResponse):
         Returns whether this answer is in a valid form.
         """
         var_dict_list = self.randomize_variables(self.samples)
+        if self.evaluate_samples(answer, var_dict_list) is not None:
+            return True
         try:
             self.tupleize_answers(answer, var_dict_list)
             return True
@@ -5,8 +5,14 @@ from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
 from dogapi import dog_stats_api
+import dogstats_wrapper
 
+from collections import OrderedDict
+import copy
 import hashlib
+import json
+import threading
+import time
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -46,6 +52,20 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# The function that runs code in the sandbox, in place of codejail's
+# `safe_exec`, if one has been set with `set_sandbox_executor`.
+SANDBOX_EXECUTOR = None
+
+
+def set_sandbox_executor(executor):
+    """
+    Run sandboxed code with `executor`, a function with the same signature as
+    codejail's `safe_exec`, such as a `worker_pool.WorkerPoolExecutor`. Use
+    codejail's `safe_exec` again if `executor` is None.
+    """
+    global SANDBOX_EXECUTOR  # pylint: disable=global-statement
+    SANDBOX_EXECUTOR = executor
+
 
 def update_hash(hasher, obj):
     """
@@ -70,6 +90,100 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+def cache_key_for(code, globals_dict, random_seed):
+    """
+    Return the key under which the result of running `code` with the globals
+    in `globals_dict` (which must be JSON-safe) and `random_seed` is cached.
+
+    The code's line endings and trailing whitespace are normalized, and the
+    globals are hashed as canonical (key-sorted) JSON, which is much cheaper
+    to compute than `update_hash`.
+    """
+    normalized_code = code.replace("\r\n", "\n").rstrip()
+    md5er = hashlib.md5()
+    md5er.update(repr(normalized_code))
+    md5er.update(json.dumps(globals_dict, sort_keys=True))
+    return "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+
+
+class SafeExecCache(object):
+    """
+    A cache of safe_exec results, for its `cache` argument: a bounded
+    in-process LRU of the most recent results, in front of an optional shared
+    `backing_cache` (e.g. memcached) with .get(key) and .set(key, value) methods.
+
+    Lookups are counted in the `capa.safe_exec.cache` metric, tagged with
+    the result (hit or miss) and the layer that answered; the latency of
+    lookups in `backing_cache` goes to `capa.safe_exec.cache.backing_get_time`.
+    """
+    def __init__(self, backing_cache=None, max_entries=1000):
+        self.backing_cache = backing_cache
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the result cached for `key`, or None.
+        """
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                # re-insert, to make it the most recently used
+                self._entries[key] = value
+        if value is not None:
+            self._record("hit", "local")
+            # callers may change the globals they were given
+            return copy.deepcopy(value)
+
+        if self.backing_cache is None:
+            self._record("miss", "local")
+            return None
+
+        start = time.time()
+        value = self.backing_cache.get(key)
+        dogstats_wrapper.histogram("capa.safe_exec.cache.backing_get_time", time.time() - start)
+        if value is None:
+            self._record("miss", "backing")
+            return None
+        self._record("hit", "backing")
+        self._set_local(key, value)
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        """
+        Cache `value` under `key`, locally and in the backing cache.
+        """
+        self._set_local(key, value)
+        if self.backing_cache is not None:
+            self.backing_cache.set(key, value)
+
+    def clear(self):
+        """
+        Empty the in-process cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _set_local(self, key, value):
+        """
+        Add a copy of `value` to the in-process cache, evicting the least recently used results if it's full.
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _record(result, layer):
+        """
+        Count a cache lookup.
+        """
+        dogstats_wrapper.increment("capa.safe_exec.cache", tags=["result:" + result, "layer:" + layer])
+
+
 @dog_stats_api.timed('capa.safe_exec.time')
 def safe_exec(
     code,
@@ -97,9 +211,9 @@ def safe_exec(
     `extra_files` is a list of (filename, contents) pairs.  These files are
     created in the sandbox.
 
-    `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
-    to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    `cache` is an object with .get(key) and .set(key, value) methods, such as a
+    `SafeExecCache`.  It will be used to cache the execution, taking into account the
+    code, the values of the globals, and the random seed.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -109,11 +223,7 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+        key = cache_key_for(code, json_safe(globals_dict), random_seed)
         cached = cache.get(key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
@@ -131,7 +241,7 @@ def safe_exec(
     if unsafely:
         exec_fn = codejail_not_safe_exec
     else:
-        exec_fn = codejail_safe_exec
+        exec_fn = SANDBOX_EXECUTOR or codejail_safe_exec
 
     # Run the code!  Results are side effects in globals_dict.
     try:
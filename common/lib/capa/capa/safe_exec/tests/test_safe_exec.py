@@ -9,7 +9,7 @@ import unittest
 
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, SafeExecCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -177,6 +177,67 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestSafeExecCache(unittest.TestCase):
+    """Test the LRU of safe_exec results in front of a shared cache."""
+
+    def test_local_hit(self):
+        backing = {}
+        cache = SafeExecCache(DictCache(backing))
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=cache)
+        self.assertEqual(g['a'], 3)
+        # The result went to the shared cache too
+        self.assertEqual(backing.values()[0], (None, {'a': 3}))
+
+        # The in-process copy is used before the shared cache
+        backing[backing.keys()[0]] = (None, {'a': 17})
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=cache)
+        self.assertEqual(g['a'], 3)
+
+    def test_backing_hit(self):
+        backing = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(backing))
+
+        # A process with an empty LRU uses the result another process cached
+        backing[backing.keys()[0]] = (None, {'a': 17})
+        cache = SafeExecCache(DictCache(backing))
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=cache)
+        self.assertEqual(g['a'], 17)
+
+        # and keeps it
+        backing.clear()
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=cache)
+        self.assertEqual(g['a'], 17)
+
+    def test_normalized_code(self):
+        backing = {}
+        cache = SafeExecCache(DictCache(backing))
+        safe_exec("a = 1\r\nb = 2\r\n", {}, cache=cache)
+        safe_exec("a = 1\nb = 2\n\n", {}, cache=cache)
+        self.assertEqual(len(backing), 1)
+
+    def test_results_are_copies(self):
+        cache = SafeExecCache()
+        cache.set('key', (None, {'a': [1, 2]}))
+        cache.get('key')[1]['a'].append(3)
+        self.assertEqual(cache.get('key'), (None, {'a': [1, 2]}))
+
+    def test_lru_eviction(self):
+        cache = SafeExecCache(max_entries=2)
+        cache.set('first', (None, {}))
+        cache.set('second', (None, {}))
+        # Use 'first', so that 'second' is the least recently used
+        self.assertIsNotNone(cache.get('first'))
+        cache.set('third', (None, {}))
+
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNotNone(cache.get('third'))
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -0,0 +1,115 @@
+"""Test worker_pool.py"""
+
+import sys
+import unittest
+
+from mock import patch
+
+from capa.safe_exec import safe_exec, set_sandbox_executor
+from capa.safe_exec.worker_pool import WorkerPoolExecutor
+from codejail.safe_exec import SafeExecException
+
+
+class TestWorkerPoolExecutor(unittest.TestCase):
+    """
+    Tests of WorkerPoolExecutor, with workers that run the local python, unsandboxed.
+    """
+    def setUp(self):
+        super(TestWorkerPoolExecutor, self).setUp()
+        self.executor = WorkerPoolExecutor(size=2, timeout=2, max_jobs=3, cmdline=[sys.executable])
+        self.addCleanup(self.executor.close)
+
+    def test_set_values(self):
+        g = {'a': 17}
+        self.executor("b = a + 1", g)
+        self.assertEqual(g, {'a': 17, 'b': 18})
+
+    def test_exception(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.executor("1/0", {})
+        self.assertIn("ZeroDivisionError", cm.exception.message)
+
+        # The worker is still usable
+        g = {}
+        self.executor("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    def test_jobs_are_isolated(self):
+        self.executor("import os\nos.environ['LEAKED'] = '1'\nimport json\njson.leaked = True", {})
+        for _ in range(4):
+            g = {}
+            self.executor("import os, json\nleaked = 'LEAKED' in os.environ or hasattr(json, 'leaked')", g)
+            self.assertFalse(g['leaked'])
+
+    def test_workers_are_recycled(self):
+        worker_pids = set()
+        for _ in range(7):
+            g = {}
+            self.executor("import os\nworker_pid = os.getppid()", g)
+            worker_pids.add(g['worker_pid'])
+        # Two workers to start with, each replaced after three jobs
+        self.assertEqual(len(worker_pids), 3)
+
+    def test_code_cant_reach_the_worker(self):
+        forge = (
+            "import os, struct\n"
+            "message = '{\"id\": \"forged\", \"globals\": {\"a\": 666}}'\n"
+            "os.write(1, struct.pack('>I', len(message)) + message)\n"
+            "next_job = os.read(0, 100)\n"
+        )
+        g = {}
+        self.executor(forge, g)
+        self.assertEqual(g['next_job'], '')
+
+        # The next job gets its own result
+        g = {}
+        self.executor("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    def test_jobs_have_own_directory(self):
+        g = {}
+        self.executor("import os, tempfile\ncwd = os.getcwd()\ntmp = tempfile.gettempdir()\nopen('f', 'w').close()", g)
+        self.assertEqual(g['cwd'], g['tmp'])
+        first_cwd = g['cwd']
+
+        g = {}
+        self.executor("import os\ncwd = os.getcwd()\nfiles = os.listdir('.')", g)
+        self.assertNotEqual(g['cwd'], first_cwd)
+        self.assertEqual(g['files'], [])
+
+    def test_unexpected_result(self):
+        with patch('capa.safe_exec.worker_pool._read_message', return_value={"id": "other", "globals": {}}):
+            with self.assertRaises(SafeExecException) as cm:
+                self.executor("a = 1", {})
+        self.assertIn("unexpected result", cm.exception.message)
+
+    def test_close_waits_for_workers(self):
+        self.executor("a = 1", {})
+        workers = list(self.executor._idle_workers)  # pylint: disable=protected-access
+        self.executor.close()
+        for worker in workers:
+            self.assertIsNotNone(worker.process.returncode)
+
+    def test_timeout(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.executor("import time\ntime.sleep(10)", {})
+        self.assertIn("timed out", cm.exception.message)
+
+        g = {}
+        self.executor("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    @patch('capa.safe_exec.worker_pool.codejail_safe_exec')
+    def test_extra_files_use_codejail(self, mock_safe_exec):
+        g = {}
+        self.executor("a = 1", g, extra_files=[("lib.py", "b = 2")], slug="slug")
+        mock_safe_exec.assert_called_with(
+            "a = 1", g, python_path=None, extra_files=[("lib.py", "b = 2")], slug="slug"
+        )
+
+    def test_safe_exec_uses_executor(self):
+        set_sandbox_executor(self.executor)
+        self.addCleanup(set_sandbox_executor, None)
+        g = {}
+        safe_exec("a = int(math.pi)/2", g, random_seed=17)
+        self.assertEqual(g['a'], 1.5)
@@ -0,0 +1,313 @@
+"""
+A pool of pre-started sandboxed Python workers to run capa's code in.
+
+Running code with codejail starts a new sandboxed interpreter for every
+execution, which then imports numpy, scipy, etc. all over again.  The workers
+of a `WorkerPoolExecutor` import those modules once, when they start, and then
+fork a child for each piece of code they're sent.  The child runs the code,
+with the sandbox's limits applied, in a new temporary directory and without
+access to the worker's stdin and stdout, and exits, so nothing a piece of code
+does is seen by the next one.  Workers are replaced after `max_jobs` executions.
+
+Use it with `capa.safe_exec.set_sandbox_executor()`.
+"""
+
+import json
+import logging
+import os
+import select
+import struct
+import subprocess
+import tempfile
+import threading
+import uuid
+
+from codejail import jail_code
+from codejail.safe_exec import safe_exec as codejail_safe_exec
+from codejail.safe_exec import json_safe, SafeExecException
+
+from .safe_exec import ASSUMED_IMPORTS
+
+log = logging.getLogger(__name__)
+
+# The modules the workers import before running any code.
+PREIMPORTED_MODULES = ["random"] + [modname for _, modname in ASSUMED_IMPORTS]
+
+# The program each worker runs: argv[1] is the JSON list of modules to
+# import, and argv[2] the JSON dict of limits (see `WorkerPoolExecutor`).
+# Jobs and results are JSON messages on stdin and stdout, each preceded by
+# its length as a 4 byte big-endian integer.  Each result has the id of its job.
+WORKER_SCRIPT = r"""
+import json, os, resource, shutil, signal, struct, sys, tempfile, traceback
+
+for module_name in json.loads(sys.argv[1]):
+    try:
+        __import__(module_name)
+    except Exception:
+        pass
+
+limits = json.loads(sys.argv[2])
+OK_TYPES = (type(None), int, long, float, str, unicode, list, tuple, dict)
+
+def jsonable(value):
+    if not isinstance(value, OK_TYPES):
+        return False
+    try:
+        json.dumps(value)
+    except Exception:
+        return False
+    return True
+
+def isolate(write_fd, job_dir):
+    # Only the pipe for the result stays open, so the code can't read the
+    # worker's next job, or write a result of its own
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    try:
+        max_fd = os.sysconf("SC_OPEN_MAX")
+    except (ValueError, OSError):
+        max_fd = 1024
+    os.closerange(3, write_fd)
+    os.closerange(write_fd + 1, max_fd)
+    os.chdir(job_dir)
+    os.environ["TMPDIR"] = tempfile.tempdir = job_dir
+
+def run_job(job):
+    if limits.get("CPU"):
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["CPU"], limits["CPU"]))
+    if limits.get("VMEM"):
+        resource.setrlimit(resource.RLIMIT_AS, (limits["VMEM"], limits["VMEM"]))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (limits["FSIZE"], limits["FSIZE"]))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    signal.alarm(limits["REALTIME"])
+    try:
+        globals_dict = job["globals"]
+        exec compile(job["code"], "jailed_code", "exec", 0, True) in globals_dict
+    except BaseException:
+        return {"error": traceback.format_exc()}
+    return {"globals": dict(
+        (key, value) for key, value in globals_dict.items() if key != "__builtins__" and jsonable(value)
+    )}
+
+while True:
+    header = sys.stdin.read(4)
+    if len(header) < 4:
+        break
+    job = json.loads(sys.stdin.read(struct.unpack(">I", header)[0]))
+    job_dir = tempfile.mkdtemp(prefix="codejail-")
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            isolate(write_fd, job_dir)
+            result = json.dumps(run_job(job))
+            while result:
+                result = result[os.write(write_fd, result):]
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    result_pipe = os.fdopen(read_fd, "rb")
+    result = result_pipe.read()
+    result_pipe.close()
+    os.waitpid(pid, 0)
+    shutil.rmtree(job_dir, ignore_errors=True)
+    try:
+        result = json.loads(result)
+        if not isinstance(result, dict):
+            raise ValueError
+    except ValueError:
+        result = {"error": "The sandboxed code was killed"}
+    result["id"] = job["id"]
+    result = json.dumps(result)
+    sys.stdout.write(struct.pack(">I", len(result)) + result)
+    sys.stdout.flush()
+"""
+
+
+def _write_message(stream, message):
+    """
+    Write `message` to `stream` as length-prefixed JSON.
+    """
+    data = json.dumps(message)
+    stream.write(struct.pack(">I", len(data)) + data)
+    stream.flush()
+
+
+def _read_message(stream):
+    """
+    Read a length-prefixed JSON message from `stream`, or return None if the stream has ended.
+    """
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    data = stream.read(struct.unpack(">I", header)[0])
+    return json.loads(data)
+
+
+class SandboxWorker(object):
+    """
+    A single worker process of a `WorkerPoolExecutor`.
+    """
+    def __init__(self, cmdline, limits):
+        self.jobs_run = 0
+        self.process = subprocess.Popen(
+            cmdline + ["-c", WORKER_SCRIPT, json.dumps(PREIMPORTED_MODULES), json.dumps(limits)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=open(os.devnull, "w"),
+            cwd=tempfile.gettempdir(),
+            close_fds=True,
+        )
+
+    def run(self, code, globals_dict, timeout):
+        """
+        Run `code` with `globals_dict` in the worker, and return the resulting
+        globals. Raises SafeExecException if the code raised an exception, or
+        didn't complete within `timeout` seconds.
+        """
+        self.jobs_run += 1
+        job_id = uuid.uuid4().hex
+        _write_message(self.process.stdin, {"id": job_id, "code": code, "globals": globals_dict})
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            self.close()
+            raise SafeExecException("Couldn't execute jailed code: timed out after {} seconds".format(timeout))
+
+        result = _read_message(self.process.stdout)
+        if result is None:
+            self.close()
+            raise SafeExecException("Couldn't execute jailed code: the sandbox worker exited")
+        if result.get("id") != job_id:
+            # the worker is out of step with us, so nothing it sends can be trusted
+            self.close()
+            raise SafeExecException("Couldn't execute jailed code: the sandbox worker sent an unexpected result")
+        if "error" in result:
+            raise SafeExecException("Couldn't execute jailed code: {}".format(result["error"]))
+        return result["globals"]
+
+    @property
+    def alive(self):
+        """
+        Whether the worker can run more code.
+        """
+        return self.process.returncode is None and not self.process.stdin.closed
+
+    def close(self):
+        """
+        Stop the worker, and wait for it to exit.
+        """
+        try:
+            self.process.stdin.close()
+            if self.process.poll() is None:
+                self.process.terminate()
+            self.process.wait()
+        except (IOError, OSError):
+            # it's already gone
+            pass
+        self.process.stdout.close()
+
+
+class WorkerPoolExecutor(object):
+    """
+    Runs code like codejail's `safe_exec`, but in a pool of `size` pre-started
+    sandbox workers, each of which is replaced after running `max_jobs` pieces
+    of code.
+
+    Each piece of code is killed if it runs for more than `timeout` seconds;
+    the limit on CPU seconds is codejail's. The workers run the sandboxed
+    python that codejail is configured with, unless given another `cmdline`
+    (e.g. `[sys.executable]`, to run code locally in tests).
+
+    Code that needs extra files or python path entries in the sandbox is
+    handed to codejail as usual, as is all code if codejail isn't configured.
+    """
+    def __init__(self, size=4, timeout=5, max_jobs=100, cmdline=None):
+        self.size = size
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self.cmdline = cmdline
+        self._lock = threading.Lock()
+        self._available = threading.Semaphore(size)
+        self._idle_workers = []
+        self._pid = None
+
+    def __call__(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        cmdline = self._worker_cmdline()
+        if python_path or extra_files or cmdline is None:
+            return codejail_safe_exec(
+                code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug
+            )
+
+        with self._available:
+            worker = self._checkout(cmdline)
+            try:
+                results = worker.run(code, json_safe(globals_dict), self.timeout)
+            except (IOError, OSError):
+                log.exception("Sandbox worker failed running %s", slug)
+                worker.close()
+                raise SafeExecException("Couldn't execute jailed code: the sandbox worker failed")
+            finally:
+                if worker.alive and worker.jobs_run < self.max_jobs:
+                    self._checkin(worker)
+                else:
+                    worker.close()
+        globals_dict.update(results)
+
+    def _worker_cmdline(self):
+        """
+        Return the command line that starts a sandboxed python, or None if
+        codejail isn't configured to run python.
+        """
+        if self.cmdline is not None:
+            return list(self.cmdline)
+        command = jail_code.COMMANDS.get("python")
+        if command is None:
+            return None
+        cmdline = []
+        if command.get("user"):
+            cmdline.extend(["sudo", "-u", command["user"]])
+        cmdline.extend(command["cmdline_start"])
+        return cmdline
+
+    def _limits(self):
+        """
+        Return the limits the workers apply to each piece of code.
+        """
+        return {
+            "CPU": jail_code.LIMITS.get("CPU"),
+            "VMEM": jail_code.LIMITS.get("VMEM"),
+            # like codejail, don't let the code write to files
+            "FSIZE": jail_code.LIMITS.get("FSIZE", 0),
+            "REALTIME": int(self.timeout) + 1,
+        }
+
+    def _checkout(self, cmdline):
+        """
+        Return an idle worker, starting the pool's workers on first use in this process.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Don't share the parent's workers with a forked process
+                self._pid = os.getpid()
+                self._idle_workers = [SandboxWorker(cmdline, self._limits()) for _ in range(self.size)]
+            if self._idle_workers:
+                return self._idle_workers.pop()
+        return SandboxWorker(cmdline, self._limits())
+
+    def _checkin(self, worker):
+        """
+        Return `worker` to the pool.
+        """
+        with self._lock:
+            self._idle_workers.append(worker)
+
+    def close(self):
+        """
+        Stop the idle workers.
+        """
+        with self._lock:
+            for worker in self._idle_workers:
+                worker.close()
+            self._idle_workers = []
@@ -0,0 +1,95 @@
+"""
+Tests of capa_problem.py
+"""
+import os
+import shutil
+import tempfile
+import textwrap
+import unittest
+
+import fs.osfs
+from lxml import etree
+from mock import patch
+
+from capa import capa_problem
+from . import new_loncapa_problem, test_capa_system
+
+
+class ProblemTemplateTest(unittest.TestCase):
+    """
+    Tests of the cache of the parts of problems that are the same for every student.
+    """
+    def setUp(self):
+        super(ProblemTemplateTest, self).setUp()
+        patcher = patch.object(capa_problem, '_problem_templates', capa_problem.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parsed_once(self):
+        xml_str = "<problem><startouttext/>Hello<endouttext/></problem>"
+        with patch.object(capa_problem.etree, 'XML', wraps=etree.XML) as mock_xml:
+            problem = new_loncapa_problem(xml_str)
+            other_problem = new_loncapa_problem(xml_str)
+        self.assertEqual(mock_xml.call_count, 1)
+
+        self.assertEqual(problem.problem_text, "<problem><text>Hello</text></problem>")
+        self.assertEqual(other_problem.problem_text, problem.problem_text)
+        # Each problem gets its own tree to modify
+        self.assertIsNot(other_problem.tree, problem.tree)
+        problem.tree.set('id', 'modified')
+        self.assertIsNone(new_loncapa_problem(xml_str).tree.get('id'))
+
+    def test_least_recently_used_is_evicted(self):
+        with patch.object(capa_problem, 'PROBLEM_TEMPLATE_CACHE_SIZE', 2):
+            new_loncapa_problem("<problem>1</problem>")
+            new_loncapa_problem("<problem>2</problem>")
+            new_loncapa_problem("<problem>1</problem>")
+            new_loncapa_problem("<problem>3</problem>")
+
+            with patch.object(capa_problem.etree, 'XML', wraps=etree.XML) as mock_xml:
+                new_loncapa_problem("<problem>1</problem>")
+                self.assertEqual(mock_xml.call_count, 0)
+                new_loncapa_problem("<problem>2</problem>")
+                self.assertEqual(mock_xml.call_count, 1)
+
+    def test_scripts_run_for_each_problem(self):
+        xml_str = textwrap.dedent("""
+            <problem>
+                <script type="loncapa/python">
+            answer = str(random.randint(0, 1e9))
+                </script>
+                <stringresponse answer="$answer">
+                    <textline size="20"/>
+                </stringresponse>
+            </problem>
+        """)
+        problem = new_loncapa_problem(xml_str, seed=1)
+        other_problem = new_loncapa_problem(xml_str, seed=2)
+
+        # The seed-dependent processing is done for each problem
+        self.assertNotEqual(problem.context['answer'], other_problem.context['answer'])
+        self.assertEqual(problem.get_question_answers(), {'1_2_1': problem.context['answer']})
+        self.assertEqual(other_problem.get_question_answers(), {'1_2_1': other_problem.context['answer']})
+
+    def test_changed_include_is_read_again(self):
+        course_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, course_dir)
+        include_path = os.path.join(course_dir, 'include.xml')
+        with open(include_path, 'w') as include_file:
+            include_file.write('<p>First</p>')
+
+        capa_system = test_capa_system()
+        capa_system.filestore = fs.osfs.OSFS(course_dir)
+        xml_str = '<problem><include file="include.xml"/></problem>'
+        self.assertIn('First', etree.tostring(new_loncapa_problem(xml_str, capa_system=capa_system).tree))
+
+        with open(include_path, 'w') as include_file:
+            include_file.write('<p>Second</p>')
+        mtime = os.path.getmtime(include_path) + 10
+        os.utime(include_path, (mtime, mtime))
+        self.assertIn('Second', etree.tostring(new_loncapa_problem(xml_str, capa_system=capa_system).tree))
+
+    def test_missing_include_not_cached(self):
+        xml_str = '<problem><include file="missing.xml"/></problem>'
+        new_loncapa_problem(xml_str)
+        self.assertEqual(len(capa_problem._problem_templates), 0)  # pylint: disable=protected-access
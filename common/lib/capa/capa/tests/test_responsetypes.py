@@ -498,6 +498,50 @@ class FormulaResponseTest(ResponseTest):
         self.assertTrue(problem.responders.values()[0].validate_answer('14*x'))
         self.assertFalse(problem.responders.values()[0].validate_answer('3*y+2*x'))
 
+    def test_grade_over_arrays(self):
+        """
+        Test that answers are evaluated for all the samples at once, and sample by
+        sample only when they can't be.
+        """
+        sample_dict = {'x': (1, 2), 'y': (-1, 1)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance="0.001%",
+                                     answer="x^2 + sin(y)")
+        responder = problem.responders.values()[0]
+
+        with mock.patch.object(responder, 'tupleize_answers', wraps=responder.tupleize_answers) as mock_tupleize:
+            self.assert_grade(problem, "x*x + sin(y)", "correct")
+            self.assert_grade(problem, "x*x + sin(2*y)", "incorrect")
+            self.assert_grade(problem, "X^2 + SIN(y)", "correct")
+            self.assertFalse(mock_tupleize.called)
+
+            # Complex results are compared as before
+            self.assert_grade(problem, "x^2 + sin(y) + i - i", "correct")
+            self.assert_grade(problem, "x^2 + sin(y) + i", "incorrect")
+            self.assertFalse(mock_tupleize.called)
+
+            # Answers with errors or results that aren't finite are evaluated sample by sample
+            self.assert_grade(problem, "x^2 + sin(y) + 0*1e999", "incorrect")
+            self.assertTrue(mock_tupleize.called)
+
+    def test_errors_over_arrays(self):
+        """
+        Test that answers which can't be evaluated over arrays raise the same errors.
+        """
+        sample_dict = {'x': (1, 2)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance="1%",
+                                     answer="x")
+        with self.assertRaisesRegexp(StudentInputError, "factorial function not permitted"):
+            problem.grade_answers({'1_2_1': 'fact(x)'})
+        with self.assertRaisesRegexp(StudentInputError, "Could not parse"):
+            problem.grade_answers({'1_2_1': '(-x)^0.5'})
+        with self.assertRaisesRegexp(StudentInputError, "y not permitted"):
+            problem.grade_answers({'1_2_1': 'x + y'})
+        self.assertFalse(problem.responders.values()[0].validate_answer('x/(x - x)'))
+
 
 class StringResponseTest(ResponseTest):
     from capa.tests.response_xml_factory import StringResponseXMLFactory
@@ -3,8 +3,9 @@ Tests capa util
 """
 import unittest
 import textwrap
+import numpy
 from . import test_capa_system
-from capa.util import compare_with_tolerance, sanitize_html
+from capa.util import compare_with_tolerance, compare_arrays_with_tolerance, sanitize_html
 
 
 class UtilTest(unittest.TestCase):
@@ -13,6 +14,18 @@ class UtilTest(unittest.TestCase):
         super(UtilTest, self).setUp()
         self.system = test_capa_system()
 
+    def test_compare_arrays_with_tolerance(self):
+        student = numpy.array([100.0, 100.001, 101.0, 109.9, 110.1, 111.0, 112.0, 1 + 1j])
+        instructor = numpy.array([100.0, 100.0, 100.0, 100.0, 100.0, 100.0, 100.0, 1 + 1.01j])
+        for tolerance, relative_tolerance in [('0.001%', False), ('10%', False), ('10%', True), ('10.0', False),
+                                              ('0.1', True), (10.0, False), (0.1, True)]:
+            result = compare_arrays_with_tolerance(student, instructor, tolerance, relative_tolerance)
+            expected = [
+                compare_with_tolerance(student_value, instructor_value, tolerance, relative_tolerance)
+                for student_value, instructor_value in zip(student, instructor)
+            ]
+            self.assertEqual(list(result), expected, (tolerance, relative_tolerance))
+
     def test_compare_with_tolerance(self):
         # Test default tolerance '0.001%' (it is relative)
         result = compare_with_tolerance(100.0, 100.0)
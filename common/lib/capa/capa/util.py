@@ -2,6 +2,7 @@
 Utility functions for capa.
 """
 import bleach
+import numpy
 
 from calc import evaluator
 from cmath import isinf
@@ -70,6 +71,29 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         return abs(student_complex - instructor_complex) <= tolerance
 
 
+def compare_arrays_with_tolerance(student_array, instructor_array, tolerance=default_tolerance,
+                                  relative_tolerance=False):
+    """
+    Compare two NumPy arrays of finite results element by element, the way
+    `compare_with_tolerance` compares two results, and return an array of
+    booleans.
+    """
+    if isinstance(tolerance, str):
+        if tolerance == default_tolerance:
+            relative_tolerance = True
+        if tolerance.endswith('%'):
+            tolerance = evaluator(dict(), dict(), tolerance[:-1]) * 0.01
+            if not relative_tolerance:
+                tolerance = tolerance * numpy.abs(instructor_array)
+        else:
+            tolerance = evaluator(dict(), dict(), tolerance)
+
+    if relative_tolerance:
+        tolerance = tolerance * numpy.maximum(numpy.abs(student_array), numpy.abs(instructor_array))
+
+    return numpy.abs(student_array - instructor_array) <= tolerance
+
+
 def contextualize_text(text, context):  # private
     """
     Takes a string with variables. E.g. $a+$b.
@@ -220,10 +220,12 @@ class ContentStore(object):
     def find(self, filename):
         raise NotImplementedError
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None):
+    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, after=None):
         '''
         Returns a list of static assets for a course, followed by the total number of assets.
         By default all assets are returned, but start and maxresults can be provided to limit the query.
+        Instead of start, after can be the asset key of the last asset of the previous page, in which
+        case the assets following that asset in the sort order are returned.
 
         The return format is a list of asset data dictionaries.
         The asset data dictionaries have the following keys:
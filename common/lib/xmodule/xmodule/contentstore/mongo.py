@@ -42,6 +42,8 @@ class MongoContentStore(ContentStore):
         self.fs = gridfs.GridFS(_db, bucket)
 
         self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
+        # the number of assets and thumbnails of each course, kept up to date by save and delete
+        self.fs_counts = _db[bucket + ".counts"]
 
     def close_connections(self):
         """
@@ -63,7 +65,10 @@ class MongoContentStore(ContentStore):
         # The way to version files in gridFS is to not use the file id as the _id but just as the filename.
         # Then you can upload as many versions as you like and access by date or version. Because we use
         # the location as the _id, we must delete before adding (there's no replace method in gridFS)
-        self.delete(content_id)  # delete is a noop if the entry doesn't exist; so, don't waste time checking
+        if self.fs.exists(content_id):
+            self.fs.delete(content_id)
+        else:
+            self._update_count(content_son, 1)
 
         thumbnail_location = content.thumbnail_location.to_deprecated_list_repr() if content.thumbnail_location else None
         with self.fs.new_file(_id=content_id, filename=unicode(content.location), content_type=content.content_type,
@@ -84,7 +89,10 @@ class MongoContentStore(ContentStore):
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
         # Deletes of non-existent files are considered successful
-        self.fs.delete(location_or_id)
+        item = self.fs_files.find_one({'_id': location_or_id}, fields=['content_son'])
+        if item is not None:
+            self.fs.delete(location_or_id)
+            self._update_count(item.get('content_son', item['_id']), -1)
 
     def find(self, location, throw_on_not_found=True, as_stream=False):
         content_id, __ = self.asset_db_key(location)
@@ -149,7 +157,6 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
-        policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
         for asset in assets:
@@ -162,19 +169,29 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
+
+        with open(assets_policy_file, 'w') as f:
+            json.dump(self.get_assets_policy(assets), f, sort_keys=True, indent=4)
+
+    @staticmethod
+    def get_assets_policy(assets):
+        """
+        Return the policy exported for `assets`, as returned by `get_all_content_for_course`:
+        the attributes of each asset, by the asset's name.
+        """
+        policy = {}
+        for asset in assets:
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
-
-        with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f, sort_keys=True, indent=4)
+        return policy
 
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None):
+    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, after=None):
         return self._get_all_content_for_course(
-            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort
+            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, after=after
         )
 
     def remove_redundant_content_for_courses(self):
@@ -195,11 +212,16 @@ class MongoContentStore(ContentStore):
                 self.fs.delete(asset[prefix])
 
             self.fs_files.remove(query)
+        # the counts of the courses these assets belonged to are out of date
+        self.fs_counts.remove()
         return assets_to_delete
 
-    def _get_all_content_for_course(self, course_key, get_thumbnails=False, start=0, maxresults=-1, sort=None):
+    def _get_all_content_for_course(
+        self, course_key, get_thumbnails=False, start=0, maxresults=-1, sort=None, after=None
+    ):
         '''
         Returns a list of all static assets for a course. The return format is a list of asset data dictionary elements.
+        See :meth:`.ContentStore.get_all_content_for_course` for the meaning of start, maxresults, sort and after.
 
         The asset data dictionaries have the following keys:
             asset_key (:class:`opaque_keys.edx.AssetKey`): The key of the asset
@@ -208,17 +230,29 @@ class MongoContentStore(ContentStore):
             contentType: The mimetype string of the asset
             md5: An md5 hash of the asset content
         '''
+        category = "asset" if not get_thumbnails else "thumbnail"
+        query = query_for_course(course_key, category)
+        # break ties by _id so that the order, and so each page, is always the same
+        sort = list(sort or [])
+        sort.append(('_id', sort[-1][1] if sort else pymongo.ASCENDING))
+
+        previous_item = None
+        if after is not None:
+            previous_item = self.fs_files.find_one({'_id': self.asset_db_key(after)[0]})
+        if previous_item is not None:
+            # keyset pagination: find the assets sorted after the previous one using the
+            # sort indexes, rather than skipping over all the assets of the previous pages
+            query['$or'] = keyset_query(sort, previous_item)
+            start = 0
+
         if maxresults > 0:
-            items = self.fs_files.find(
-                query_for_course(course_key, "asset" if not get_thumbnails else "thumbnail"),
-                skip=start, limit=maxresults, sort=sort
-            )
+            items = self.fs_files.find(query, skip=start, limit=maxresults, sort=sort)
+            assets = list(items)
+            count = self._get_count(course_key, category)
         else:
-            items = self.fs_files.find(
-                query_for_course(course_key, "asset" if not get_thumbnails else "thumbnail"), sort=sort
-            )
-        count = items.count()
-        assets = list(items)
+            items = self.fs_files.find(query, sort=sort)
+            assets = list(items)
+            count = len(assets) if previous_item is None else self._get_count(course_key, category)
 
         # We're constructing the asset key immediately after retrieval from the database so that
         # callers are insulated from knowing how our identifiers are stored.
@@ -227,6 +261,30 @@ class MongoContentStore(ContentStore):
             asset['asset_key'] = course_key.make_asset_key(asset_id['category'], asset_id['name'])
         return assets, count
 
+    def _get_count(self, course_key, category):
+        """
+        Returns the number of assets of the given category in the course, counting them only
+        if they haven't been counted since they were last changed by something other than
+        save and delete.
+        """
+        count_id = count_id_for_course(course_key, category)
+        item = self.fs_counts.find_one({'_id': count_id})
+        if item is not None:
+            return item['count']
+        count = self.fs_files.find(query_for_course(course_key, category)).count()
+        self.fs_counts.update({'_id': count_id}, {'_id': count_id, 'count': count}, upsert=True)
+        return count
+
+    def _update_count(self, asset_son, change):
+        """
+        Adds change to the number of assets in the category and course of the asset whose
+        son structured key is asset_son, if that number has been counted.
+        """
+        count_id = make_count_id(
+            asset_son['org'], asset_son['course'], asset_son.get('run'), asset_son['category']
+        )
+        self.fs_counts.update({'_id': count_id}, {'$inc': {'count': change}})
+
     def set_attr(self, asset_key, attr, value=True):
         """
         Add/set the given attr on the asset at the given location. Does not allow overwriting gridFS built in
@@ -325,6 +383,7 @@ class MongoContentStore(ContentStore):
                 # getattr b/c caching may mean some pickled instances don't have attr
                 locked=asset.get('locked', False)
             )
+        self._remove_counts(dest_course_key)
 
     def delete_all_course_assets(self, course_key):
         """
@@ -337,6 +396,14 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+        self._remove_counts(course_key)
+
+    def _remove_counts(self, course_key):
+        """
+        Forgets the numbers of assets in the course so that they're counted again when next needed.
+        """
+        for category in ('asset', 'thumbnail'):
+            self.fs_counts.remove({'_id': count_id_for_course(course_key, category)})
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -378,30 +445,47 @@ class MongoContentStore(ContentStore):
     def ensure_indexes(self):
 
         # Index needed thru 'category' by `_get_all_content_for_course` and others. That query also takes a sort
-        # which can be `uploadDate`, `display_name`,
+        # which can be `uploadDate` or `displayname`, followed by `_id` to page through the assets by keyset.
 
         self.fs_files.create_index(
             [('_id.org', pymongo.ASCENDING), ('_id.course', pymongo.ASCENDING), ('_id.name', pymongo.ASCENDING)],
             sparse=True
         )
         self.fs_files.create_index(
-            [('content_son.org', pymongo.ASCENDING), ('content_son.course', pymongo.ASCENDING), ('content_son.name', pymongo.ASCENDING)],
+            [
+                ('content_son.org', pymongo.ASCENDING), ('content_son.course', pymongo.ASCENDING),
+                ('content_son.name', pymongo.ASCENDING),
+            ],
             sparse=True
         )
         self.fs_files.create_index(
-            [('_id.org', pymongo.ASCENDING), ('_id.course', pymongo.ASCENDING), ('uploadDate', pymongo.ASCENDING)],
+            [
+                ('_id.org', pymongo.ASCENDING), ('_id.course', pymongo.ASCENDING), ('_id.category', pymongo.ASCENDING),
+                ('uploadDate', pymongo.ASCENDING), ('_id', pymongo.ASCENDING),
+            ],
             sparse=True
         )
         self.fs_files.create_index(
-            [('_id.org', pymongo.ASCENDING), ('_id.course', pymongo.ASCENDING), ('display_name', pymongo.ASCENDING)],
+            [
+                ('_id.org', pymongo.ASCENDING), ('_id.course', pymongo.ASCENDING), ('_id.category', pymongo.ASCENDING),
+                ('displayname', pymongo.ASCENDING), ('_id', pymongo.ASCENDING),
+            ],
             sparse=True
         )
         self.fs_files.create_index(
-            [('content_son.org', pymongo.ASCENDING), ('content_son.course', pymongo.ASCENDING), ('uploadDate', pymongo.ASCENDING)],
+            [
+                ('content_son.org', pymongo.ASCENDING), ('content_son.course', pymongo.ASCENDING),
+                ('content_son.category', pymongo.ASCENDING), ('uploadDate', pymongo.ASCENDING),
+                ('_id', pymongo.ASCENDING),
+            ],
             sparse=True
         )
         self.fs_files.create_index(
-            [('content_son.org', pymongo.ASCENDING), ('content_son.course', pymongo.ASCENDING), ('display_name', pymongo.ASCENDING)],
+            [
+                ('content_son.org', pymongo.ASCENDING), ('content_son.course', pymongo.ASCENDING),
+                ('content_son.category', pymongo.ASCENDING), ('displayname', pymongo.ASCENDING),
+                ('_id', pymongo.ASCENDING),
+            ],
             sparse=True
         )
 
@@ -427,3 +511,36 @@ def query_for_course(course_key, category=None):
     else:
         dbkey['{}.run'.format(prefix)] = course_key.run
     return dbkey
+
+
+def count_id_for_course(course_key, category):
+    """
+    Construct the _id of the document holding the number of assets of the given type
+    (thumbnail v assets) in the course, which are the assets found by query_for_course
+    """
+    run = None if getattr(course_key, 'deprecated', False) else course_key.run
+    return make_count_id(course_key.org, course_key.course, run, category)
+
+
+def make_count_id(org, course, run, category):
+    """
+    Construct the _id of the document holding the number of assets of the given category
+    in the given course. run is None for courses with deprecated keys, whose assets don't
+    record their run.
+    """
+    if run is None:
+        return u'/'.join([org, course, category])
+    return u'/'.join([org, course, run, category])
+
+
+def keyset_query(sort, previous_item):
+    """
+    Construct the list of clauses of an $or query for the items which follow previous_item
+    in the order given by sort, a list of (field, direction) pairs ending with a unique field.
+    """
+    clauses = []
+    for index, (field, direction) in enumerate(sort):
+        clause = SON((earlier_field, previous_item.get(earlier_field)) for earlier_field, __ in sort[:index])
+        clause[field] = {'$gt' if direction == pymongo.ASCENDING else '$lt': previous_item.get(field)}
+        clauses.append(clause)
+    return clauses
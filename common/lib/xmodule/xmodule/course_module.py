@@ -653,7 +653,140 @@ class CourseFields(object):
     )
 
 
-class CourseDescriptor(CourseFields, SequenceDescriptor):
+class CourseDisplayMixin(object):
+    """
+    The dates, numbers, and certificate display logic shared by CourseDescriptor and
+    CourseSummary.
+    """
+    def _i18n_service(self):
+        """
+        Return the i18n service to use to display the course.
+        """
+        raise NotImplementedError
+
+    def has_ended(self):
+        """
+        Returns True if the current time is after the specified course end date.
+        Returns False if there is no end date specified.
+        """
+        if self.end is None:
+            return False
+
+        return datetime.now(UTC()) > self.end
+
+    def may_certify(self):
+        """
+        Return True if it is acceptable to show the student a certificate download link
+        """
+        show_early = self.certificates_display_behavior in ('early_with_info', 'early_no_info') or self.certificates_show_before_end
+        return show_early or self.has_ended()
+
+    def has_started(self):
+        return datetime.now(UTC()) > self.start
+
+    @property
+    def lowest_passing_grade(self):
+        return min(self.grade_cutoffs.values())
+
+    @property
+    def id(self):
+        """Return the course_id for this course"""
+        return self.location.course_key
+
+    def start_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the desired text corresponding the course's start date and time in UTC.  Prefers .advertised_start,
+        then falls back to .start
+        """
+        i18n = self._i18n_service()
+        _ = i18n.ugettext
+        strftime = i18n.strftime
+
+        def try_parse_iso_8601(text):
+            try:
+                result = Date().from_json(text)
+                if result is None:
+                    result = text.title()
+                else:
+                    result = strftime(result, format_string)
+                    if format_string == "DATE_TIME":
+                        result = self._add_timezone_string(result)
+            except ValueError:
+                result = text.title()
+
+            return result
+
+        if isinstance(self.advertised_start, basestring):
+            return try_parse_iso_8601(self.advertised_start)
+        elif self.start_date_is_still_default:
+            # Translators: TBD stands for 'To Be Determined' and is used when a course
+            # does not yet have an announced start date.
+            return _('TBD')
+        else:
+            when = self.advertised_start or self.start
+
+            if format_string == "DATE_TIME":
+                return self._add_timezone_string(strftime(when, format_string))
+
+            return strftime(when, format_string)
+
+    @property
+    def start_date_is_still_default(self):
+        """
+        Checks if the start date set for the course is still default, i.e. .start has not been modified,
+        and .advertised_start has not been set.
+        """
+        return self.advertised_start is None and self.start == CourseFields.start.default
+
+    def end_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the end date or date_time for the course formatted as a string.
+
+        If the course does not have an end date set (course.end is None), an empty string will be returned.
+        """
+        if self.end is None:
+            return ''
+        else:
+            strftime = self._i18n_service().strftime
+            date_time = strftime(self.end, format_string)
+            return date_time if format_string == "SHORT_DATE" else self._add_timezone_string(date_time)
+
+    def _add_timezone_string(self, date_time):
+        """
+        Adds 'UTC' string to the end of start/end date and time texts.
+        """
+        return date_time + u" UTC"
+
+    @property
+    def number(self):
+        return self.location.course
+
+    @property
+    def display_number_with_default(self):
+        """
+        Return a display course number if it has been specified, otherwise return the 'course' that is in the location
+        """
+        if self.display_coursenumber:
+            return self.display_coursenumber
+
+        return self.number
+
+    @property
+    def org(self):
+        return self.location.org
+
+    @property
+    def display_org_with_default(self):
+        """
+        Return a display organization if it has been specified, otherwise return the 'org' that is in the location
+        """
+        if self.display_organization:
+            return self.display_organization
+
+        return self.org
+
+
+class CourseDescriptor(CourseDisplayMixin, CourseFields, SequenceDescriptor):
     module_class = SequenceModule
 
     def __init__(self, *args, **kwargs):
@@ -808,26 +941,6 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
 
         return xml_object
 
-    def has_ended(self):
-        """
-        Returns True if the current time is after the specified course end date.
-        Returns False if there is no end date specified.
-        """
-        if self.end is None:
-            return False
-
-        return datetime.now(UTC()) > self.end
-
-    def may_certify(self):
-        """
-        Return True if it is acceptable to show the student a certificate download link
-        """
-        show_early = self.certificates_display_behavior in ('early_with_info', 'early_no_info') or self.certificates_show_before_end
-        return show_early or self.has_ended()
-
-    def has_started(self):
-        return datetime.now(UTC()) > self.start
-
     @property
     def grader(self):
         return grader_from_conf(self.raw_grader)
@@ -858,10 +971,6 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
         policy['GRADE_CUTOFFS'] = value
         self.grading_policy = policy
 
-    @property
-    def lowest_passing_grade(self):
-        return min(self._grading_policy['GRADE_CUTOFFS'].values())
-
     @property
     def is_cohorted(self):
         """
@@ -1056,74 +1165,8 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
     def make_id(org, course, url_name):
         return '/'.join([org, course, url_name])
 
-    @property
-    def id(self):
-        """Return the course_id for this course"""
-        return self.location.course_key
-
-    def start_datetime_text(self, format_string="SHORT_DATE"):
-        """
-        Returns the desired text corresponding the course's start date and time in UTC.  Prefers .advertised_start,
-        then falls back to .start
-        """
-        i18n = self.runtime.service(self, "i18n")
-        _ = i18n.ugettext
-        strftime = i18n.strftime
-
-        def try_parse_iso_8601(text):
-            try:
-                result = Date().from_json(text)
-                if result is None:
-                    result = text.title()
-                else:
-                    result = strftime(result, format_string)
-                    if format_string == "DATE_TIME":
-                        result = self._add_timezone_string(result)
-            except ValueError:
-                result = text.title()
-
-            return result
-
-        if isinstance(self.advertised_start, basestring):
-            return try_parse_iso_8601(self.advertised_start)
-        elif self.start_date_is_still_default:
-            # Translators: TBD stands for 'To Be Determined' and is used when a course
-            # does not yet have an announced start date.
-            return _('TBD')
-        else:
-            when = self.advertised_start or self.start
-
-            if format_string == "DATE_TIME":
-                return self._add_timezone_string(strftime(when, format_string))
-
-            return strftime(when, format_string)
-
-    @property
-    def start_date_is_still_default(self):
-        """
-        Checks if the start date set for the course is still default, i.e. .start has not been modified,
-        and .advertised_start has not been set.
-        """
-        return self.advertised_start is None and self.start == CourseFields.start.default
-
-    def end_datetime_text(self, format_string="SHORT_DATE"):
-        """
-        Returns the end date or date_time for the course formatted as a string.
-
-        If the course does not have an end date set (course.end is None), an empty string will be returned.
-        """
-        if self.end is None:
-            return ''
-        else:
-            strftime = self.runtime.service(self, "i18n").strftime
-            date_time = strftime(self.end, format_string)
-            return date_time if format_string == "SHORT_DATE" else self._add_timezone_string(date_time)
-
-    def _add_timezone_string(self, date_time):
-        """
-        Adds 'UTC' string to the end of start/end date and time texts.
-        """
-        return date_time + u" UTC"
+    def _i18n_service(self):
+        return self.runtime.service(self, "i18n")
 
     @property
     def forum_posts_allowed(self):
@@ -1143,39 +1186,59 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
         return True
 
     @property
-    def number(self):
-        return self.location.course
-
-    @property
-    def display_number_with_default(self):
+    def video_pipeline_configured(self):
         """
-        Return a display course number if it has been specified, otherwise return the 'course' that is in the location
+        Returns whether the video pipeline advanced setting is configured for this course.
         """
-        if self.display_coursenumber:
-            return self.display_coursenumber
+        return (
+            self.video_upload_pipeline is not None and
+            'course_video_upload_token' in self.video_upload_pipeline
+        )
 
-        return self.number
 
-    @property
-    def org(self):
-        return self.location.org
+class CourseSummary(CourseDisplayMixin):
+    """
+    A lightweight summary of a course: the fields of its CourseDescriptor needed to
+    list the course, for instance on the student dashboard, without the rest of it.
 
-    @property
-    def display_org_with_default(self):
+    Summaries are made by modulestores' `get_course_summaries`, which may cache them
+    and share them between callers.
+    """
+    FIELDS = (
+        'display_name', 'start', 'end', 'advertised_start', 'course_image', 'static_asset_path',
+        'display_coursenumber', 'display_organization', 'certificates_display_behavior',
+        'certificates_show_before_end', 'cert_name_short', 'cert_name_long', 'end_of_course_survey_url',
+        'visible_to_staff_only', 'days_early_for_beta', 'mobile_available',
+    )
+
+    # Like a course's, so that access to the course can be checked in the same way
+    _class_tags = frozenset()
+
+    def __init__(self, course):
         """
-        Return a display organization if it has been specified, otherwise return the 'org' that is in the location
+        Summarize `course`, a CourseDescriptor.
         """
-        if self.display_organization:
-            return self.display_organization
-
-        return self.org
+        self.location = course.location
+        self.url_name = course.url_name
+        self.data_dir = getattr(course, 'data_dir', '')
+        for field_name in self.FIELDS:
+            setattr(self, field_name, getattr(course, field_name))
+        # for the grade needed for a certificate
+        self.grade_cutoffs = dict(course.grade_cutoffs)
+        self._i18n = course.runtime.service(course, "i18n")
+
+    def _i18n_service(self):
+        return self._i18n
 
     @property
-    def video_pipeline_configured(self):
+    def display_name_with_default(self):
         """
-        Returns whether the video pipeline advanced setting is configured for this course.
+        Return the display name of the course, or its converted url name if it has none.
         """
-        return (
-            self.video_upload_pipeline is not None and
-            'course_video_upload_token' in self.video_upload_pipeline
-        )
+        name = self.display_name
+        if name is None:
+            name = self.url_name.replace('_', ' ')
+        return name.replace('<', '&lt;').replace('>', '&gt;')
+
+    def __repr__(self):
+        return "CourseSummary({!r})".format(self.location)
@@ -21,7 +21,7 @@ from abc import ABCMeta, abstractmethod
 from contracts import contract, new_contract
 from xblock.plugin import default_select
 
-from .exceptions import InvalidLocationError, InsufficientSpecificationError
+from .exceptions import InvalidLocationError, InsufficientSpecificationError, ItemNotFoundError
 from xmodule.errortracker import make_error_tracker
 from xmodule.assetstore import AssetMetadata
 from opaque_keys.edx.keys import CourseKey, UsageKey, AssetKey
@@ -640,6 +640,15 @@ class ModuleStoreRead(ModuleStoreAssetInterface):
         '''
         pass
 
+    @abstractmethod
+    def get_course_summaries(self, course_keys, **kwargs):
+        '''
+        Returns a list of :class:`~xmodule.course_module.CourseSummary` objects for the
+        courses with the given keys, in the same order, leaving out those that don't
+        exist or don't load without errors.
+        '''
+        pass
+
     @abstractmethod
     def has_course(self, course_id, ignore_case=False, **kwargs):
         '''
@@ -907,6 +916,26 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
                 return course
         return None
 
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        See ModuleStoreRead.get_course_summaries
+
+        Default impl--loads each course
+        """
+        # imported here, as the course module imports the modulestore
+        from xmodule.course_module import CourseSummary
+        from xmodule.error_module import ErrorDescriptor
+
+        summaries = []
+        for course_key in course_keys:
+            try:
+                course = self.get_course(course_key, **kwargs)
+            except ItemNotFoundError:
+                continue
+            if course is not None and not isinstance(course, ErrorDescriptor):
+                summaries.append(CourseSummary(course))
+        return summaries
+
     def has_course(self, course_id, ignore_case=False, **kwargs):
         """
         Returns the course_id of the course if it was found, else None
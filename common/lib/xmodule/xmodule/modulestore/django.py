@@ -20,6 +20,8 @@ from xmodule.util.django import get_current_request_hostname
 import xmodule.modulestore  # pylint: disable=unused-import
 from xmodule.modulestore.mixed import MixedModuleStore
 from xmodule.modulestore.draft_and_published import BranchSettingMixin
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import StructureCache
 from xmodule.contentstore.django import contentstore
 import xblock.reference.plugins
 
@@ -44,6 +46,32 @@ def load_function(path):
     return getattr(import_module(module_path), name)
 
 
+# The process-wide cache of split modulestore structures, created on first use
+_STRUCTURE_CACHE = None
+
+
+def get_structure_cache():
+    """
+    Return the process-wide StructureCache shared by all split modulestores, or None
+    if settings.SPLIT_STRUCTURE_CACHE_BYTES disables it.
+
+    If a 'course_structure_cache' django cache is configured, it is used to back the
+    in-process cache, so that structures are shared between processes too.
+    """
+    global _STRUCTURE_CACHE  # pylint: disable=global-statement
+    max_bytes = getattr(settings, 'SPLIT_STRUCTURE_CACHE_BYTES', 0)
+    if not max_bytes:
+        return None
+
+    if _STRUCTURE_CACHE is None:
+        try:
+            backing_cache = get_cache('course_structure_cache')
+        except InvalidCacheBackendError:
+            backing_cache = None
+        _STRUCTURE_CACHE = StructureCache(max_bytes, backing_cache)
+    return _STRUCTURE_CACHE
+
+
 def create_modulestore_instance(engine, content_store, doc_store_config, options, i18n_service=None, fs_service=None):
     """
     This will return a new instance of a modulestore given an engine and options
@@ -74,6 +102,9 @@ def create_modulestore_instance(engine, content_store, doc_store_config, options
     if issubclass(class_, BranchSettingMixin):
         _options['branch_setting_func'] = _get_modulestore_branch_setting
 
+    if issubclass(class_, SplitMongoModuleStore):
+        _options['structure_cache'] = get_structure_cache()
+
     return class_(
         contentstore=content_store,
         metadata_inheritance_cache_subsystem=metadata_inheritance_cache,
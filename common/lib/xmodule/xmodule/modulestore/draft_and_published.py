@@ -81,6 +81,14 @@ class ModuleStoreDraftAndPublished(BranchSettingMixin):
     def has_changes(self, xblock):
         raise NotImplementedError
 
+    @abstractmethod
+    def get_changes_map(self, course_key):
+        """
+        Returns a dict mapping the location of every block in the draft version of the course
+        to what `has_changes` would return for that block, computed in a single pass over the course.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def publish(self, location, user_id):
         raise NotImplementedError
@@ -6,6 +6,7 @@ In this way, courses can be served up both - say - XMLModuleStore or MongoModule
 """
 
 import logging
+from collections import defaultdict
 from contextlib import contextmanager
 import itertools
 import functools
@@ -310,6 +311,28 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except ItemNotFoundError:
             return None
 
+    @strip_key
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        Returns summaries of the courses with the given keys, in the same order, leaving out
+        those that don't exist or don't load without errors.
+
+        Each modulestore is asked for the summaries of all of its courses at once.
+        """
+        keys_by_store = defaultdict(list)
+        for course_key in course_keys:
+            keys_by_store[self._get_modulestore_for_courseid(course_key)].append(course_key)
+
+        summaries = {}
+        for store, store_keys in keys_by_store.iteritems():
+            for summary in store.get_course_summaries(store_keys, **kwargs):
+                summaries[self._clean_course_id_for_mapping(summary.id)] = summary
+        return [
+            summaries[course_id]
+            for course_id in (self._clean_course_id_for_mapping(course_key) for course_key in course_keys)
+            if course_id in summaries
+        ]
+
     @strip_key
     @contract(library_key='LibraryLocator')
     def get_library(self, library_key, depth=0, **kwargs):
@@ -815,6 +838,14 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(xblock.location.course_key, 'has_changes')
         return store.has_changes(xblock)
 
+    def get_changes_map(self, course_key):
+        """
+        Returns a dict mapping the location of every block in the course to whether it has
+        unpublished changes; see `has_changes`.
+        """
+        store = self._verify_modulestore_support(course_key, 'get_changes_map')
+        return store.get_changes_map(course_key)
+
     def _verify_modulestore_support(self, course_key, method):
         """
         Finds and returns the store that contains the course for the given location, and verifying
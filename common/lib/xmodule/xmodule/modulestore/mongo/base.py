@@ -41,6 +41,7 @@ from xblock.fields import Scope, ScopeIds, Reference, ReferenceList, ReferenceVa
 from xblock.runtime import KvsFieldData
 
 from xmodule.assetstore import AssetMetadata, CourseAssetsFromStorage
+from xmodule.course_module import CourseSummary
 from xmodule.error_module import ErrorDescriptor
 from xmodule.errortracker import null_error_tracker, exc_info_to_str
 from xmodule.exceptions import HeartbeatFailure
@@ -576,6 +577,12 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
     def _compute_metadata_inheritance_tree(self, course_id):
         '''
+        Compute the inherited metadata and the child to parent index for the course in one pass.
+
+        Returns a tuple of the metadata inheritance tree (a dict of location url to inherited metadata)
+        and the parent map (a dict of child location url to the list of the `_id`s of its parents,
+        draft parents first).
+
         TODO (cdodge) This method can be deleted when the 'split module store' work has been completed
         '''
         # get all collections in the course, this query should not return any leaf nodes
@@ -602,10 +609,19 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         # it's ok to keep these as deprecated strings b/c the overall cache is indexed by course_key and this
         # is a dictionary relative to that course
         results_by_url = {}
+        parent_map = {}
         root = None
 
         # now go through the results and order them by the location url
         for result in resultset:
+            # index the parents of every child while the full set of parents is at hand
+            for child in result.get('definition', {}).get('children', []):
+                child_parents = parent_map.setdefault(child, [])
+                if result['_id'].get('revision') == MongoRevisionKey.draft:
+                    child_parents.insert(0, result['_id'])
+                else:
+                    child_parents.append(result['_id'])
+
             # manually pick it apart b/c the db has tag and we want as_published revision regardless
             location = as_published(Location._from_deprecated_son(result['_id'], course_id.run))
 
@@ -647,7 +663,21 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         if root is not None:
             _compute_inherited_metadata(root)
 
-        return metadata_to_inherit
+        return metadata_to_inherit, parent_map
+
+    @staticmethod
+    def _parent_map_cache_key(course_id):
+        """
+        Return the metadata_inheritance_cache_subsystem key of the course's parent map
+        """
+        return u'{}.parents'.format(course_id)
+
+    def _cache_parent_map(self, course_id, parent_map):
+        """
+        Put the parent map for the course into the request_cache, if available
+        """
+        if self.request_cache is not None:
+            self.request_cache.data.setdefault('parent_map', {})[unicode(course_id)] = parent_map
 
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
@@ -672,11 +702,14 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         if not tree:
             # if not in subsystem, or we are on force refresh, then we have to compute
-            tree = self._compute_metadata_inheritance_tree(course_id)
+            tree, parent_map = self._compute_metadata_inheritance_tree(course_id)
 
             # now write out computed tree to caching subsystem (e.g. memcached), if available
             if self.metadata_inheritance_cache_subsystem is not None:
                 self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+                self.metadata_inheritance_cache_subsystem.set(self._parent_map_cache_key(course_id), parent_map)
+            # the parent map was computed along with the tree, so keep it for this request too
+            self._cache_parent_map(course_id, parent_map)
 
         # now populate a request_cache, if available. NOTE, we are outside of the
         # scope of the above if: statement so that after a memcache hit, it'll get
@@ -690,6 +723,49 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         return tree
 
+    def _get_cached_parent_map(self, course_id):
+        '''
+        Return the course's map of child location url to the `_id`s of its parents (draft first),
+        which is computed along with the metadata inheritance tree.
+
+        Returns None if the map can't be cached (no request_cache nor metadata_inheritance_cache_subsystem),
+        as recomputing it for every lookup would cost far more than querying for the parent.
+        '''
+        if self.request_cache is None and self.metadata_inheritance_cache_subsystem is None:
+            return None
+
+        course_id = self.fill_in_run(course_id)
+        if self.request_cache is not None:
+            parent_map = self.request_cache.data.get('parent_map', {}).get(unicode(course_id))
+            if parent_map is not None:
+                return parent_map
+
+        parent_map = None
+        if self.metadata_inheritance_cache_subsystem is not None:
+            parent_map = self.metadata_inheritance_cache_subsystem.get(self._parent_map_cache_key(course_id))
+
+        if parent_map is None:
+            # recomputing the tree computes and caches the parent map as well
+            self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+            if self.request_cache is not None:
+                return self.request_cache.data['parent_map'][unicode(course_id)]
+            # None if the caching subsystem refused to store it
+            return self.metadata_inheritance_cache_subsystem.get(self._parent_map_cache_key(course_id))
+
+        self._cache_parent_map(course_id, parent_map)
+        return parent_map
+
+    def _drop_cached_parent_map(self, course_id):
+        '''
+        Drop the course's cached parent map, after removing items from the course without refreshing
+        the metadata inheritance tree, so that it's recomputed when next needed.
+        '''
+        course_id = self.fill_in_run(course_id)
+        if self.request_cache is not None:
+            self.request_cache.data.get('parent_map', {}).pop(unicode(course_id), None)
+        if self.metadata_inheritance_cache_subsystem is not None:
+            self.metadata_inheritance_cache_subsystem.delete(self._parent_map_cache_key(course_id))
+
     def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
@@ -874,6 +950,32 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         except ItemNotFoundError:
             return None
 
+    @autoretry_read()
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        See ModuleStoreRead.get_course_summaries
+
+        Finds the items of all of the courses in one query.
+        """
+        course_keys = [self.fill_in_run(course_key) for course_key in course_keys]
+        locations = [course_key.make_usage_key('course', course_key.run) for course_key in course_keys]
+        if not locations:
+            return []
+
+        items = {}
+        for item in self.collection.find({'_id': {'$in': [location.to_deprecated_son() for location in locations]}}):
+            items[(item['_id']['org'], item['_id']['course'], item['_id']['name'])] = item
+
+        summaries = []
+        for course_key, location in zip(course_keys, locations):
+            item = items.get((location.org, location.course, location.name))
+            if item is None:
+                continue
+            course = self._load_items(course_key, [item])[0]
+            if not isinstance(course, ErrorDescriptor):
+                summaries.append(CourseSummary(course))
+        return summaries
+
     def has_course(self, course_key, ignore_case=False, **kwargs):
         """
         Returns the course_id of the course if it was found, else None
@@ -1297,10 +1399,13 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                     jsonfields[field_name] = field.read_json(xblock)
         return jsonfields
 
-    def _get_non_orphan_parents(self, location, parents, revision):
+    def _get_non_orphan_parents(self, location, parents, revision, parent_map=None):
         """
         Extract non orphan parents by traversing the list of possible parents and remove current location
         from orphan parents to avoid parents calculation overhead next time.
+
+        If given a parent_map (see _get_cached_parent_map), the ancestors are looked up in it, and
+        orphans are left alone as the lookups are cheap.
         """
         non_orphan_parents = []
         # get bulk_record once rather than for each iteration
@@ -1313,8 +1418,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             ancestor_loc = parent_loc
             while ancestor_loc is not None:
                 current_loc = ancestor_loc
-                ancestor_loc = self._get_raw_parent_location(as_published(current_loc), revision)
-                if ancestor_loc is None:
+                ancestor_loc = self._get_raw_parent_location(as_published(current_loc), revision, parent_map)
+                if ancestor_loc is None and parent_map is None:
                     bulk_record.dirty = True
                     # The parent is an orphan, so remove all the children including
                     # the location whose parent we are looking for from orphan parent
@@ -1332,33 +1437,45 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         return non_orphan_parents
 
-    def _get_raw_parent_location(self, location, revision=ModuleStoreEnum.RevisionOption.published_only):
+    def _get_raw_parent_location(
+        self, location, revision=ModuleStoreEnum.RevisionOption.published_only, parent_map=None
+    ):
         '''
         Helper for get_parent_location that finds the location that is the parent of this location in this course,
         but does NOT return a version agnostic location.
+
+        If given a parent_map (see _get_cached_parent_map), the parents are looked up in it rather than queried.
         '''
         assert location.revision is None
         assert revision == ModuleStoreEnum.RevisionOption.published_only \
             or revision == ModuleStoreEnum.RevisionOption.draft_preferred
 
-        # create a query with tag, org, course, and the children field set to the given location
-        query = self._course_key_to_son(location.course_key)
-        query['definition.children'] = unicode(location)
+        if parent_map is not None:
+            parents = [
+                {'_id': parent_id}
+                for parent_id in parent_map.get(unicode(location), [])
+                if revision == ModuleStoreEnum.RevisionOption.draft_preferred
+                or parent_id.get('revision') == MongoRevisionKey.published
+            ]
+        else:
+            # create a query with tag, org, course, and the children field set to the given location
+            query = self._course_key_to_son(location.course_key)
+            query['definition.children'] = unicode(location)
 
-        # if only looking for the PUBLISHED parent, set the revision in the query to None
-        if revision == ModuleStoreEnum.RevisionOption.published_only:
-            query['_id.revision'] = MongoRevisionKey.published
+            # if only looking for the PUBLISHED parent, set the revision in the query to None
+            if revision == ModuleStoreEnum.RevisionOption.published_only:
+                query['_id.revision'] = MongoRevisionKey.published
 
-        # query the collection, sorting by DRAFT first
-        parents = self.collection.find(query, {'_id': True}, sort=[SORT_REVISION_FAVOR_DRAFT])
+            # query the collection, sorting by DRAFT first
+            parents = list(self.collection.find(query, {'_id': True}, sort=[SORT_REVISION_FAVOR_DRAFT]))
 
-        if parents.count() == 0:
+        if len(parents) == 0:
             # no parents were found
             return None
 
         if revision == ModuleStoreEnum.RevisionOption.published_only:
-            if parents.count() > 1:
-                non_orphan_parents = self._get_non_orphan_parents(location, parents, revision)
+            if len(parents) > 1:
+                non_orphan_parents = self._get_non_orphan_parents(location, parents, revision, parent_map)
                 if len(non_orphan_parents) == 0:
                     # no actual parent found
                     return None
@@ -1366,7 +1483,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 if len(non_orphan_parents) > 1:
                     # should never have multiple PUBLISHED parents
                     raise ReferentialIntegrityError(
-                        u"{} parents claim {}".format(parents.count(), location)
+                        u"{} parents claim {}".format(len(parents), location)
                     )
                 else:
                     return non_orphan_parents[0]
@@ -1387,7 +1504,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
             # since we sorted by SORT_REVISION_FAVOR_DRAFT, the 0'th parent is the one we want
             if published_parents > 1:
-                non_orphan_parents = self._get_non_orphan_parents(location, all_parents, revision)
+                non_orphan_parents = self._get_non_orphan_parents(location, all_parents, revision, parent_map)
                 return non_orphan_parents[0]
 
             found_id = all_parents[0]['_id']
@@ -1409,7 +1526,13 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                         preferring DRAFT, if parent(s) exists,
                         else returns None
         '''
-        parent = self._get_raw_parent_location(location, revision)
+        parent_map = None
+        if revision == ModuleStoreEnum.RevisionOption.published_only \
+                and not self._is_in_bulk_operation(location.course_key):
+            # Published parents only change through writes that refresh or drop the cached parent map
+            # (drafts can be inserted without either), and it isn't refreshed until a bulk operation ends.
+            parent_map = self._get_cached_parent_map(location.course_key)
+        parent = self._get_raw_parent_location(location, revision, parent_map)
         if parent:
             return as_published(parent)
         return None
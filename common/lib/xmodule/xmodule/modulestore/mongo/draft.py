@@ -8,6 +8,7 @@ and otherwise returns i4x://org/course/cat/name).
 
 import pymongo
 import logging
+from bson.son import SON
 
 from opaque_keys.edx.locations import Location
 from xmodule.exceptions import InvalidVersionError
@@ -607,9 +608,12 @@ class DraftModuleStore(MongoModuleStore):
 
         _internal([root_usage.to_deprecated_son() for root_usage in root_usages])
         if len(to_be_deleted) > 0:
-            bulk_record = self._get_bulk_ops_record(root_usages[0].course_key)
+            course_key = root_usages[0].course_key
+            bulk_record = self._get_bulk_ops_record(course_key)
             bulk_record.dirty = True
             self.collection.remove({'_id': {'$in': to_be_deleted}}, safe=self.collection.safe)
+            if not self._is_in_bulk_operation(course_key):
+                self._drop_cached_parent_map(course_key)
 
     @MongoModuleStore.memoize_request_cache
     def has_changes(self, xblock):
@@ -632,6 +636,54 @@ class DraftModuleStore(MongoModuleStore):
         else:
             return False
 
+    def get_changes_map(self, course_key):
+        """
+        Returns a dict mapping the location of every block in the course to what `has_changes`
+        would return for it, computed from a single query for the ids and children of the
+        course's blocks.
+        """
+        course_key = self.fill_in_run(course_key)
+        query = SON([
+            ('_id.tag', 'i4x'),
+            ('_id.org', course_key.org),
+            ('_id.course', course_key.course),
+        ])
+        drafts = set()
+        children = {}
+        for result in self.collection.find(query, {'_id': 1, 'definition.children': 1}):
+            location = as_published(Location._from_deprecated_son(result['_id'], course_key.run))
+            is_draft = result['_id'].get('revision') == MongoRevisionKey.draft
+            if is_draft:
+                drafts.add(location)
+            # the draft's children are the ones seen on the draft branch
+            if is_draft or location not in children:
+                children[location] = [
+                    course_key.make_usage_key_from_deprecated_string(child)
+                    for child in result.get('definition', {}).get('children', [])
+                ]
+
+        changes = {}
+
+        def has_changes_subtree(location):
+            """
+            Compute has_changes for location and, if needed, its children.
+            """
+            if location not in changes:
+                if location in drafts:
+                    changes[location] = True
+                else:
+                    child_locations = children[location]
+                    # dangling pointers imply a change, as in has_changes
+                    changes[location] = (
+                        any(child not in children for child in child_locations) or
+                        any([has_changes_subtree(child) for child in child_locations])
+                    )
+            return changes[location]
+
+        for location in children:
+            has_changes_subtree(location)
+        return changes
+
     def publish(self, location, user_id, **kwargs):
         """
         Publish the subtree rooted at location to the live course and remove the drafts.
@@ -710,6 +762,8 @@ class DraftModuleStore(MongoModuleStore):
             bulk_record = self._get_bulk_ops_record(location.course_key)
             bulk_record.dirty = True
             self.collection.remove({'_id': {'$in': to_be_deleted}})
+            if not self._is_in_bulk_operation(location.course_key):
+                self._drop_cached_parent_map(location.course_key)
         return self.get_item(as_published(location))
 
     def unpublish(self, location, user_id, **kwargs):
@@ -71,6 +71,39 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.module_data = module_data
         self.default_class = default_class
         self.local_modules = {}
+        # definition id -> definition, for the definitions fetched so far
+        self._definitions = {}
+        # definition id -> the set of ids, including it, of the definitions of the subtree of blocks
+        # it was cached with, which haven't been fetched yet
+        self._pending_definition_ids = {}
+
+    def add_pending_definitions(self, definition_ids):
+        """
+        Record the definitions of a subtree of blocks that was cached without loading them, so
+        that when the first one is needed, the subtree's are fetched together in a single query.
+        """
+        batch = set(definition_id for definition_id in definition_ids if definition_id not in self._definitions)
+        for definition_id in batch:
+            self._pending_definition_ids[definition_id] = batch
+
+    def get_definition(self, course_key, definition_id):
+        """
+        Return the definition with the given id, or None if there is no such definition.
+
+        If the definition hasn't been fetched yet, it is fetched along with the rest of the
+        pending definitions of its subtree (see `add_pending_definitions`). Definitions are
+        immutable, so they are kept for the life of this runtime.
+        """
+        if definition_id not in self._definitions:
+            batch = self._pending_definition_ids.get(definition_id, set([definition_id]))
+            definition_ids = [pending_id for pending_id in batch if pending_id not in self._definitions]
+            for pending_id in batch:
+                self._pending_definition_ids.pop(pending_id, None)
+            batch.clear()
+            for definition in self.modulestore.get_definitions(course_key, definition_ids):
+                self._definitions[definition['_id']] = definition
+
+        return self._definitions.get(definition_id)
 
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
@@ -169,7 +202,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         if definition_id is not None and not json_data.get('definition_loaded', False):
             definition_loader = DefinitionLazyLoader(
-                self.modulestore,
+                self,
                 course_key,
                 block_key.type,
                 definition_id,
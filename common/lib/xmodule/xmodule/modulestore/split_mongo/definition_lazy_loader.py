@@ -12,8 +12,10 @@ class DefinitionLazyLoader(object):
     def __init__(self, modulestore, course_key, block_type, definition_id, field_converter):
         """
         Simple placeholder for yet-to-be-fetched data
-        :param modulestore: the pymongo db connection with the definitions
-        :param definition_locator: the id of the record in the above to fetch
+        :param modulestore: the split modulestore, or anything else with a
+            get_definition(course_key, definition_id) method (such as a CachingDescriptorSystem,
+            which fetches pending definitions in batches)
+        :param definition_id: the id of the definition to fetch
         """
         self.modulestore = modulestore
         self.course_key = course_key
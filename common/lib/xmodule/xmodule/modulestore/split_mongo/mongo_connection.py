@@ -1,7 +1,12 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
+import cPickle as pickle
+import logging
 import re
+import threading
+import zlib
+from collections import OrderedDict
 from mongodb_proxy import autoretry_read, MongoProxy
 import pymongo
 
@@ -9,11 +14,17 @@ import pymongo
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 from contracts import check
+import dogstats_wrapper as dog_stats_api
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore.split_mongo import BlockKey
 import datetime
 import pytz
 
+log = logging.getLogger(__name__)
+
+# memcached's default limit on the size of an item, less some room for its key and header
+BACKING_CACHE_MAX_BYTES = 1024 * 1024 - 1024
+
 
 def structure_from_mongo(structure):
     """
@@ -66,16 +77,160 @@ def structure_to_mongo(structure):
     return new_structure
 
 
+def _copy_structure(structure):
+    """
+    Return a copy of the decoded `structure` that can be modified the way the modulestore
+    modifies the structures it loads without changing `structure`: the dicts of the structure,
+    its blocks, and their fields and edit info are copied, and the values in them, which are
+    only ever replaced, are shared.
+    """
+    new_structure = dict(structure)
+    new_structure['blocks'] = {}
+    for block_key, block in structure['blocks'].iteritems():
+        new_block = dict(block)
+        for key in ('fields', 'edit_info'):
+            if key in new_block:
+                new_block[key] = dict(new_block[key])
+        new_structure['blocks'][block_key] = new_block
+    return new_structure
+
+
+class StructureCache(object):
+    """
+    A bounded, thread-safe LRU cache of decoded structures, keyed by structure id.
+
+    Structures are immutable once written, so entries never need invalidating. The cache keeps
+    its own copy of each structure, and every `get` hands back a private copy of the structure's
+    dicts (see `_copy_structure`), so that callers are free to modify the structures they are
+    given (the modulestore does, while loading definitions) without corrupting what other threads
+    will read. The cache is bounded by the size of the structures when pickled.
+
+    If a `backing_cache` (anything with django-cache-style `get` and `set` methods, such as
+    memcached) is given, entries are also written there, pickled and zlib-compressed, and local
+    misses are looked up there, so that structures are shared between processes as well. Entries
+    over `backing_cache_max_bytes` compressed, which memcached would refuse, aren't written there.
+    """
+    def __init__(self, max_bytes, backing_cache=None, backing_cache_max_bytes=BACKING_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.backing_cache = backing_cache
+        self.backing_cache_max_bytes = backing_cache_max_bytes
+        # key -> (structure, size)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+
+    def get(self, key):
+        """
+        Return a copy of the structure cached under `key`, or None if it isn't cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # re-insert it as the most recently used entry
+                self._entries[key] = entry
+                self.hits += 1
+
+        if entry is not None:
+            dog_stats_api.increment('split_modulestore.structure_cache', tags=['result:hit', 'source:local'])
+            return _copy_structure(entry[0])
+
+        data = self.backing_cache.get(key) if self.backing_cache is not None else None
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            dog_stats_api.increment('split_modulestore.structure_cache', tags=['result:miss'])
+            return None
+
+        pickled = zlib.decompress(data)
+        structure = pickle.loads(pickled)
+        self._store(key, structure, len(pickled))
+        with self._lock:
+            self.hits += 1
+        dog_stats_api.increment('split_modulestore.structure_cache', tags=['result:hit', 'source:backing'])
+        return _copy_structure(structure)
+
+    def set(self, key, structure):
+        """
+        Cache a snapshot of `structure` under `key`.
+        """
+        pickled = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
+        self._store(key, _copy_structure(structure), len(pickled))
+        if self.backing_cache is None:
+            return
+
+        data = zlib.compress(pickled, 1)
+        if len(data) > self.backing_cache_max_bytes:
+            with self._lock:
+                self.oversized += 1
+            dog_stats_api.increment('split_modulestore.structure_cache.oversized')
+            log.info(
+                "Not caching structure %s in the backing cache: %d bytes compressed is over the %d byte limit",
+                key, len(data), self.backing_cache_max_bytes
+            )
+            return
+        self.backing_cache.set(key, data)
+
+    def _store(self, key, structure, size):
+        """
+        Add `structure`, whose pickle is `size` bytes, to the local cache, evicting the least
+        recently used entries until the cache fits in `max_bytes` again.
+        """
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (structure, size)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all entries from the local cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Return a dict of the cache's size and hit/miss counters.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'oversized': self.oversized,
+            }
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_cache=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        If a :class:`StructureCache` is given as `structure_cache`, structures read from or
+        written to this connection are cached in it.
         """
         self.database = MongoProxy(
             pymongo.database.Database(
@@ -93,6 +248,9 @@ class MongoConnection(object):
         if user is not None and password is not None:
             self.database.authenticate(user, password)
 
+        self.structure_cache = structure_cache
+        self._structure_cache_prefix = u'{}.{}.structures.'.format(db, collection)
+
         self.course_index = self.database[collection + '.active_versions']
         self.structures = self.database[collection + '.structures']
         self.definitions = self.database[collection + '.definitions']
@@ -114,11 +272,31 @@ class MongoConnection(object):
         else:
             raise HeartbeatFailure("Can't connect to {}".format(self.database.name))
 
+    def _structure_cache_key(self, key):
+        """
+        Return the key under which the structure with id `key` is cached.
+        """
+        return self._structure_cache_prefix + unicode(key)
+
+    def _cache_structure(self, structure):
+        """
+        Add the decoded `structure` to the structure cache, if there is one.
+        """
+        if self.structure_cache is not None and structure is not None:
+            self.structure_cache.set(self._structure_cache_key(structure['_id']), structure)
+
     def get_structure(self, key):
         """
         Get the structure from the persistence mechanism whose id is the given key
         """
-        return structure_from_mongo(self.structures.find_one({'_id': key}))
+        if self.structure_cache is not None:
+            structure = self.structure_cache.get(self._structure_cache_key(key))
+            if structure is not None:
+                return structure
+
+        structure = structure_from_mongo(self.structures.find_one({'_id': key}))
+        self._cache_structure(structure)
+        return structure
 
     @autoretry_read()
     def find_structures_by_id(self, ids):
@@ -128,7 +306,24 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        return [structure_from_mongo(structure) for structure in self.structures.find({'_id': {'$in': ids}})]
+        structures = []
+        if self.structure_cache is not None:
+            uncached_ids = []
+            for structure_id in ids:
+                structure = self.structure_cache.get(self._structure_cache_key(structure_id))
+                if structure is None:
+                    uncached_ids.append(structure_id)
+                else:
+                    structures.append(structure)
+            ids = uncached_ids
+            if not ids:
+                return structures
+
+        for structure in self.structures.find({'_id': {'$in': ids}}):
+            structure = structure_from_mongo(structure)
+            self._cache_structure(structure)
+            structures.append(structure)
+        return structures
 
     @autoretry_read()
     def find_structures_derived_from(self, ids):
@@ -170,6 +365,7 @@ class MongoConnection(object):
         Insert a new structure into the database.
         """
         self.structures.insert(structure_to_mongo(structure))
+        self._cache_structure(structure)
 
     def get_course_index(self, key, ignore_case=False):
         """
@@ -187,6 +383,20 @@ class MongoConnection(object):
             }
         return self.course_index.find_one(query)
 
+    def find_course_indexes(self, course_keys):
+        """
+        Find the course_indexes of the courses with the given keys, in one query.
+        """
+        if not course_keys:
+            return []
+        return self.course_index.find({'$or': [
+            {
+                key_attr: getattr(course_key, key_attr)
+                for key_attr in ('org', 'course', 'run')
+            }
+            for course_key in course_keys
+        ]})
+
     def find_matching_course_indexes(self, branch=None, search_targets=None):
         """
         Find the course_index matching particular conditions.
@@ -255,7 +465,7 @@ class MongoConnection(object):
         """
         Retrieve all definitions listed in `definitions`.
         """
-        return self.definitions.find({'$in': {'_id': definitions}})
+        return self.definitions.find({'_id': {'$in': definitions}})
 
     def insert_definition(self, definition):
         """
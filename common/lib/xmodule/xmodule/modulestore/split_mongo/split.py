@@ -77,8 +77,9 @@ from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.course_module import CourseSummary
 from xmodule.error_module import ErrorDescriptor
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from types import NoneType
 from xmodule.assetstore import AssetMetadata
 
@@ -106,6 +107,9 @@ log = logging.getLogger(__name__)
 # When blacklists are this, all children should be excluded
 EXCLUDE_ALL = '*'
 
+# The number of course summaries each store keeps, for the versions of courses last summarized
+COURSE_SUMMARY_CACHE_SIZE = 1000
+
 
 new_contract('BlockUsageLocator', BlockUsageLocator)
 new_contract('BlockKey', BlockKey)
@@ -397,13 +401,23 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
-            for definition in bulk_write_record.definitions.values():
-                definition_id = definition.get('_id')
+            for definition_id, definition in bulk_write_record.definitions.items():
                 if definition_id in ids:
                     ids.remove(definition_id)
-                    definitions.append(definition)
+                    if definition is not None:
+                        definitions.append(definition)
+
+            # The definitions that haven't been loaded from the db yet, so load them
+            db_definitions = list(self.db_connection.get_definitions(list(ids)))
+            for definition in db_definitions:
+                bulk_write_record.definitions[definition['_id']] = definition
+                bulk_write_record.definitions_in_db.add(definition['_id'])
+        else:
+            # cast strings to ObjectIds if necessary
+            ids = [course_key.as_object_id(definition_id) for definition_id in ids]
+            db_definitions = self.db_connection.get_definitions(ids)
 
-        definitions.extend(self.db_connection.get_definitions(list(ids)))
+        definitions.extend(db_definitions)
         return definitions
 
     def update_definition(self, course_key, definition):
@@ -600,20 +614,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None,
-                 services=None, **kwargs):
+                 services=None, structure_cache=None, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param structure_cache: an optional StructureCache in which to keep decoded structures. As
+            structures are immutable, one cache can be shared by every store in the process.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
 
-        self.db_connection = MongoConnection(**doc_store_config)
+        self.db_connection = MongoConnection(structure_cache=structure_cache, **doc_store_config)
         self.db = self.db_connection.database
 
         # Code review question: How should I expire entries?
         # _add_cache could use a lru mechanism to control the cache size?
         self.thread_cache = threading.local()
 
+        # (version agnostic course key, version guid) -> CourseSummary, least recently used first
+        self._course_summaries = OrderedDict()
+
         if default_class is not None:
             module_path, __, class_name = default_class.rpartition('.')
             class_ = getattr(import_module(module_path), class_name)
@@ -664,7 +683,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             base_block_ids: list of BlockIds to fetch
             course_key: the destination course providing the context
             depth: how deep below these to prefetch
-            lazy: whether to fetch definitions or use placeholders
+            lazy: whether to fetch definitions or use placeholders. The placeholders of all the
+                blocks cached by one call are fetched together, when the first of them is needed.
         '''
         with self.bulk_operations(course_key):
             new_module_data = {}
@@ -698,6 +718,12 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                         )
                         block['fields'].update(converted_fields)
                         block['definition_loaded'] = True
+            else:
+                system.add_pending_definitions(
+                    block['definition']
+                    for block in new_module_data.itervalues()
+                    if block.get('definition') is not None and not block.get('definition_loaded', False)
+                )
 
             system.module_data.update(new_module_data)
             return system.module_data
@@ -910,6 +936,66 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(course_id)
         return self._get_structure(course_id, depth, **kwargs)
 
+    @autoretry_read()
+    def get_course_summaries(self, course_keys, **kwargs):
+        """
+        See ModuleStoreRead.get_course_summaries
+
+        Summarizes the heads of the keys' branches.  Finds the indexes of all of the courses
+        in one query, and the structures of those whose current versions haven't been
+        summarized yet in at most one more.
+        """
+        course_keys = [
+            course_key for course_key in course_keys
+            if isinstance(course_key, CourseLocator) and not course_key.deprecated and course_key.branch is not None
+        ]
+        summaries = {}
+        index_keys = []
+        for course_key in course_keys:
+            if self._is_in_bulk_operation(course_key):
+                # The course's index and structures may not have been written yet
+                summary = super(SplitMongoModuleStore, self).get_course_summaries([course_key])
+                if summary:
+                    summaries[course_key] = summary[0]
+            else:
+                index_keys.append(course_key)
+
+        indexes = {
+            (index['org'], index['course'], index['run']): index
+            for index in self.db_connection.find_course_indexes(index_keys)
+        }
+        keys_by_version = defaultdict(list)
+        for course_key in index_keys:
+            index = indexes.get((course_key.org, course_key.course, course_key.run))
+            if index is None or course_key.branch not in index['versions']:
+                continue
+            version_guid = index['versions'][course_key.branch]
+            summary = self._course_summaries.pop((course_key.version_agnostic(), version_guid), None)
+            if summary is None:
+                keys_by_version[version_guid].append(course_key)
+            else:
+                self._cache_course_summary(course_key, version_guid, summary)
+                summaries[course_key] = summary
+
+        if keys_by_version:
+            for structure in self.db_connection.find_structures_by_id(keys_by_version.keys()):
+                for course_key in keys_by_version[structure['_id']]:
+                    envelope = CourseEnvelope(course_key.replace(version_guid=structure['_id']), structure)
+                    course = self._load_items(envelope, [structure['root']], 0, lazy=True)[0]
+                    if not isinstance(course, ErrorDescriptor):
+                        summaries[course_key] = CourseSummary(course)
+                        self._cache_course_summary(course_key, structure['_id'], summaries[course_key])
+
+        return [summaries[course_key] for course_key in course_keys if course_key in summaries]
+
+    def _cache_course_summary(self, course_key, version_guid, summary):
+        """
+        Keep `summary` as the most recently used summary of the given version of a course.
+        """
+        self._course_summaries[(course_key.version_agnostic(), version_guid)] = summary
+        while len(self._course_summaries) > COURSE_SUMMARY_CACHE_SIZE:
+            self._course_summaries.popitem(last=False)
+
     def get_library(self, library_id, depth=0, **kwargs):
         """
         Gets the 'library' root block for the library identified by the locator
@@ -57,6 +57,14 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         course_id = self._map_revision_to_branch(course_id)
         return super(DraftVersioningModuleStore, self).get_course(course_id, depth=depth, **kwargs)
 
+    def get_course_summaries(self, course_keys, **kwargs):
+        course_keys = [
+            self._map_revision_to_branch(course_key)
+            if isinstance(course_key, CourseLocator) and not course_key.deprecated else course_key
+            for course_key in course_keys
+        ]
+        return super(DraftVersioningModuleStore, self).get_course_summaries(course_keys, **kwargs)
+
     def get_library(self, library_id, depth=0, **kwargs):
         library_id = self._map_revision_to_branch(library_id)
         return super(DraftVersioningModuleStore, self).get_library(library_id, depth=depth, **kwargs)
@@ -288,6 +296,44 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
 
+    def get_changes_map(self, course_key):
+        """
+        Returns a dict mapping the location of every block in the draft branch of the course to
+        what `has_changes` would return for it, computed from one comparison of the draft and
+        published structures.
+        """
+        draft_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.draft)).structure
+        published_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.published)).structure
+        changes = {}
+
+        def has_changes_subtree(block_key):
+            """
+            Compute has_changes for block_key and, if needed, its children.
+            """
+            if block_key not in changes:
+                draft_block = self._get_block_from_structure(draft_course, block_key)
+                published_block = self._get_block_from_structure(published_course, block_key)
+                if draft_block is None or published_block is None:
+                    changes[block_key] = True
+                elif self._get_version(draft_block) != self._get_version(published_block):
+                    changes[block_key] = True
+                else:
+                    changes[block_key] = any([
+                        has_changes_subtree(child_block_key)
+                        for child_block_key in draft_block.setdefault('fields', {}).get('children', [])
+                    ])
+            return changes[block_key]
+
+        for block_key in draft_course['blocks']:
+            has_changes_subtree(block_key)
+
+        course_key = course_key.for_branch(None).version_agnostic()
+        return {
+            course_key.make_usage_key(block_key.type, block_key.id): block_changes
+            for block_key, block_changes in changes.iteritems()
+            if block_key in draft_course['blocks']
+        }
+
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
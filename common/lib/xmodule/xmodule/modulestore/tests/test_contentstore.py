@@ -7,6 +7,7 @@ import unittest
 import mimetypes
 from tempfile import mkdtemp
 import path
+import pymongo
 import shutil
 
 from opaque_keys.edx.locator import CourseLocator, AssetLocator
@@ -17,6 +18,7 @@ from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
 import ddt
 from __builtin__ import delattr
+from mock import patch
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 
 log = logging.getLogger(__name__)
@@ -166,6 +168,52 @@ class TestContentstore(unittest.TestCase):
         self.assertEqual(count, 0)
         self.assertEqual(course_assets, [])
 
+    @ddt.data(
+        (True, 'displayname', pymongo.ASCENDING), (True, 'uploadDate', pymongo.DESCENDING),
+        (False, 'displayname', pymongo.ASCENDING), (False, 'uploadDate', pymongo.DESCENDING),
+    )
+    @ddt.unpack
+    def test_get_all_content_after(self, deprecated, sort_field, direction):
+        """
+        Test paging through get_all_content_for_course by the last asset of each page
+        """
+        self.set_up_assets(deprecated)
+        sort = [(sort_field, direction)]
+        all_assets, __ = self.contentstore.get_all_content_for_course(self.course1_key, sort=sort)
+        first_page, count = self.contentstore.get_all_content_for_course(self.course1_key, maxresults=2, sort=sort)
+        self.assertEqual(count, len(self.course1_files))
+        second_page, count = self.contentstore.get_all_content_for_course(
+            self.course1_key, maxresults=2, sort=sort, after=first_page[-1]['asset_key']
+        )
+        self.assertEqual(count, len(self.course1_files))
+        self.assertEqual(
+            [asset['asset_key'] for asset in first_page + second_page],
+            [asset['asset_key'] for asset in all_assets]
+        )
+
+    @ddt.data(True, False)
+    def test_count_maintained(self, deprecated):
+        """
+        Test that the counted number of assets in a course is kept up to date
+        """
+        self.set_up_assets(deprecated)
+        __, count = self.contentstore.get_all_content_for_course(self.course1_key, maxresults=1)
+        self.assertEqual(count, len(self.course1_files))
+
+        # saving a new asset adds one, saving an existing asset again doesn't
+        asset_key = self.course1_key.make_asset_key('asset', self.course2_files[-1])
+        self.save_asset(self.course2_files[-1], asset_key, self.course2_files[-1], False)
+        self.save_asset(self.course2_files[-1], asset_key, self.course2_files[-1], False)
+        with patch.object(self.contentstore.fs_files, 'find', wraps=self.contentstore.fs_files.find) as mock_find:
+            __, count = self.contentstore.get_all_content_for_course(self.course1_key, maxresults=1)
+            self.assertEqual(mock_find.call_count, 1)
+        self.assertEqual(count, len(self.course1_files) + 1)
+
+        self.contentstore.delete(asset_key)
+        self.contentstore.delete(asset_key)
+        __, count = self.contentstore.get_all_content_for_course(self.course1_key, maxresults=1)
+        self.assertEqual(count, len(self.course1_files))
+
     @ddt.data(True, False)
     def test_attrs(self, deprecated):
         """
@@ -560,6 +560,47 @@ class TestMixedModuleStore(CourseComparisonTest):
         for key in locations:
             self.assertFalse(self._has_changes(locations[key]))
 
+    @ddt.data('draft', 'split')
+    def test_get_changes_map(self, default_ms):
+        """
+        Tests that get_changes_map() agrees with has_changes() for every block
+        """
+        locations = self.setup_has_changes(default_ms)
+
+        # Change the child
+        child = self.store.get_item(locations['child'])
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        changes_map = self.store.get_changes_map(self.course.id)
+        for key in locations:
+            xblock = self.store.get_item(locations[key])
+            self.assertEqual(changes_map[xblock.location], self.store.has_changes(xblock))
+        self.assertTrue(changes_map[self.store.get_item(locations['child']).location])
+        self.assertFalse(changes_map[self.store.get_item(locations['child_sibling']).location])
+
+    def test_get_changes_map_split_store(self):
+        """
+        Tests that the split store's get_changes_map() is keyed by version and branch agnostic
+        locations, when called on the split store itself rather than through the mixed store
+        """
+        locations = self.setup_has_changes('split')
+
+        # Change the child
+        child = self.store.get_item(locations['child'])
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        split_ms = self.store._get_modulestore_by_type(ModuleStoreEnum.Type.split)  # pylint: disable=protected-access
+        changes_map = split_ms.get_changes_map(self.course.id.for_branch(ModuleStoreEnum.BranchName.draft))
+        for key in locations:
+            # the split store's locations include the branch and version
+            xblock = split_ms.get_item(locations[key].for_branch(ModuleStoreEnum.BranchName.draft))
+            location = xblock.location.version_agnostic().for_branch(None)
+            self.assertEqual(changes_map[location], split_ms.has_changes(xblock))
+        self.assertTrue(changes_map[locations['child'].version_agnostic().for_branch(None)])
+        self.assertFalse(changes_map[locations['child_sibling'].version_agnostic().for_branch(None)])
+
     @ddt.data('draft', 'split')
     def test_has_changes_publish_ancestors(self, default_ms):
         """
@@ -884,6 +925,41 @@ class TestMixedModuleStore(CourseComparisonTest):
         course = self.store.get_item(self.course_locations[self.XML_COURSEID1])
         self.assertEqual(course.id, self.course_locations[self.XML_COURSEID1].course_key)
 
+    # draft: one query for all the courses
+    # split: active_versions, structure (the course's fields are all in the structure)
+    @ddt.data(('draft', 1, 0), ('split', 2, 0))
+    @ddt.unpack
+    def test_get_course_summaries(self, default_ms, max_find, max_send):
+        self.initdb(default_ms)
+        mongo_course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        missing_course_key = self.store.make_course_key('foo', 'bar', 'missing')
+        with check_mongo_calls(max_find, max_send):
+            summaries = self.store.get_course_summaries([missing_course_key, mongo_course_key])
+        self.assertEqual([summary.id for summary in summaries], [mongo_course_key])
+        course = self.store.get_course(mongo_course_key)
+        self.assertEqual(summaries[0].display_name_with_default, course.display_name_with_default)
+        self.assertEqual(summaries[0].start, course.start)
+        self.assertEqual(summaries[0].location, course.location)
+
+        xml_course_key = self.course_locations[self.XML_COURSEID1].course_key
+        summaries = self.store.get_course_summaries([xml_course_key, mongo_course_key])
+        self.assertEqual([summary.id for summary in summaries], [xml_course_key, mongo_course_key])
+
+    def test_split_course_summaries_cached_for_version(self):
+        self.initdb('split')
+        course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        self.store.get_course_summaries([course_key])
+        # only the course index is read while the course is unchanged
+        with check_mongo_calls(1, 0):
+            summary = self.store.get_course_summaries([course_key])[0]
+        self.assertEqual(summary.display_name, self.store.get_course(course_key).display_name)
+
+        course = self.store.get_course(course_key)
+        course.display_name = 'Renamed'
+        self.store.update_item(course, self.user_id)
+        summary = self.store.get_course_summaries([course_key])[0]
+        self.assertEqual(summary.display_name, 'Renamed')
+
     # notice this doesn't test getting a public item via draft_preferred which draft would have 2 hits (split
     # still only 2)
     # Draft: count via definition.children query, then fetch via that query
@@ -16,6 +16,7 @@ from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
 import unittest
+from mock import patch, Mock
 from xblock.core import XBlock
 
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -43,6 +44,7 @@ from xmodule.modulestore.mongo.base import as_draft
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.modulestore.tests.factories import check_mongo_calls
 
 
 log = logging.getLogger(__name__)
@@ -626,6 +628,60 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         self.assertEqual(component.published_on, published_date)
         self.assertEqual(component.published_by, published_by)
 
+    def test_get_parent_location_from_parent_map(self):
+        """
+        Tests that published parents are looked up in the parent map cached with the inheritance tree
+        """
+        locations = self._create_test_tree('parent_map')
+        course_key = locations['parent'].course_key
+
+        with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+            with self.draft_store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+                # computing the parent map is a single query for the whole course
+                with check_mongo_calls(1):
+                    self.assertEqual(self.draft_store.get_parent_location(locations['child']), locations['parent'])
+                self.assertIn(unicode(locations['child']), self.draft_store._get_cached_parent_map(course_key))
+
+                # the rest are found without any queries
+                with check_mongo_calls(0):
+                    self.assertEqual(
+                        self.draft_store.get_parent_location(locations['child_sibling']), locations['parent']
+                    )
+                    self.assertEqual(
+                        self.draft_store.get_parent_location(locations['parent']), locations['grandparent']
+                    )
+                    self.assertIsNone(self.draft_store.get_parent_location(locations['grandparent']))
+
+            # the draft preferred parent is still queried
+            with check_mongo_calls(1):
+                self.assertEqual(
+                    self.draft_store.get_parent_location(
+                        locations['child'], revision=ModuleStoreEnum.RevisionOption.draft_preferred
+                    ),
+                    locations['parent']
+                )
+
+    def test_get_parent_location_after_unpublish(self):
+        """
+        Tests that unpublishing outside of a bulk operation drops the cached parent map
+        """
+        locations = self._create_test_tree('unpublish_parent_map')
+        course_key = locations['child'].course_key
+        html_location = course_key.make_usage_key('html', 'unpublish_html')
+        self.draft_store.create_child(self.dummy_user, locations['child'], 'html', block_id='unpublish_html')
+        self.draft_store.publish(locations['child'], self.dummy_user)
+
+        with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+            with self.draft_store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+                self.assertEqual(self.draft_store.get_parent_location(html_location), locations['child'])
+
+            # removes the published unit and component, leaving drafts of them
+            self.draft_store.unpublish(locations['child'], self.dummy_user)
+
+            with self.draft_store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+                self.assertIsNone(self.draft_store.get_parent_location(html_location))
+                self.assertIn(unicode(html_location), self.draft_store._get_cached_parent_map(course_key))
+
     def test_export_course_with_peer_component(self):
         """
         Test export course when link_to_location is given in peer grading interface settings.
@@ -10,6 +10,7 @@ import unittest
 import uuid
 
 from contracts import contract
+from mock import patch
 from nose.plugins.attrib import attr
 
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -579,6 +580,46 @@ class TestHasChildrenAtDepth(SplitModuleTest):
         self.assertFalse(ch3.has_children_at_depth(1))
 
 
+class TestDefinitionBatching(SplitModuleTest):
+    """
+    Test that lazily loaded definitions are fetched in batches.
+    """
+    def test_pending_definitions_fetched_together(self):
+        course_locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        db_connection = modulestore().db_connection
+        with patch.object(db_connection, 'get_definitions', wraps=db_connection.get_definitions) as get_definitions:
+            with patch.object(db_connection, 'get_definition') as get_definition:
+                course = modulestore().get_course(course_locator, depth=None)
+                runtime = course.runtime
+                definition_ids = set(block['definition'] for block in runtime.module_data.itervalues())
+                self.assertGreater(len(definition_ids), 1)
+                for definition_id in definition_ids:
+                    definition = runtime.get_definition(course.id, definition_id)
+                    self.assertEqual(definition['_id'], definition_id)
+
+        # Every definition in the course was fetched by the first one needed
+        self.assertEqual(get_definitions.call_count, 1)
+        self.assertItemsEqual(get_definitions.call_args[0][0], definition_ids)
+        self.assertFalse(get_definition.called)
+
+    def test_pending_definitions_fetched_by_subtree(self):
+        course_locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        db_connection = modulestore().db_connection
+        with patch.object(db_connection, 'get_definitions', wraps=db_connection.get_definitions) as get_definitions:
+            # only the course is cached at first; each child is cached on its own when it's loaded
+            course = modulestore().get_course(course_locator, depth=0)
+            runtime = course.runtime
+            for child in course.get_children():
+                get_definitions.reset_mock()
+                definition_id = runtime.module_data[BlockKey.from_usage_key(child.location)]['definition']
+                self.assertEqual(runtime.get_definition(course.id, definition_id)['_id'], definition_id)
+                # Only the child's definition was fetched, not those of the other children
+                for call_args in get_definitions.call_args_list:
+                    self.assertEqual(call_args[0][0], [definition_id])
+                # and it's no longer pending
+                self.assertNotIn(definition_id, runtime._pending_definition_ids)  # pylint: disable=protected-access
+
+
 class SplitModuleCourseTests(SplitModuleTest):
     '''
     Course CRUD operation tests
@@ -75,6 +75,15 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.assertConnCalls(call.get_definition(self.course_key.as_object_id(version_guid)))
         self.assertEqual(result, self.conn.get_definition.return_value)
 
+    @ddt.data('deadbeef1234' * 2, u'deadbeef1234' * 2, ObjectId())
+    def test_no_bulk_read_definitions(self, version_guid):
+        # Reading definitions when no bulk operation is active should just call
+        # through to the db_connection
+        self.conn.get_definitions.return_value = [self.definition]
+        result = self.bulk.get_definitions(self.course_key, [version_guid])
+        self.assertConnCalls(call.get_definitions([self.course_key.as_object_id(version_guid)]))
+        self.assertEqual(result, [self.definition])
+
     def test_no_bulk_write_definition(self):
         # Writing a definition when no bulk operation is active should just
         # call through to the db_connection.
@@ -586,6 +595,18 @@ class TestBulkWriteMixinOpen(TestBulkWriteMixin):
             self.assertEqual(result, self.conn.get_definition.return_value)
             self.assertCacheNotCleared()
 
+    def test_read_definitions_without_write_only_reads_once(self):
+        # Reading the same definitions multiple times shouldn't hit the database
+        # for them more than once
+        self.conn.get_definitions.side_effect = lambda ids: [
+            definition for definition in [self.definition] if definition['_id'] in ids
+        ]
+        for _ in xrange(2):
+            result = self.bulk.get_definitions(self.course_key, [self.definition['_id']])
+            self.assertEqual(result, [self.definition])
+        self.assertEqual(self.conn.get_definitions.call_args_list, [call([self.definition['_id']]), call([])])
+        self.assertCacheNotCleared()
+
     @ddt.data('deadbeef1234' * 2, u'deadbeef1234' * 2, ObjectId())
     def test_read_definition_after_write_no_db(self, version_guid):
         # Reading a definition that's already been written shouldn't hit the db at all
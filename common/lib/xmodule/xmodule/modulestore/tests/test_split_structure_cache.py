@@ -0,0 +1,112 @@
+"""
+Tests of the process-wide cache of split modulestore structures.
+"""
+import unittest
+
+from bson.objectid import ObjectId
+from mock import MagicMock
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import StructureCache
+
+
+def make_structure(num_blocks=1):
+    """
+    Return a minimal decoded structure with `num_blocks` blocks.
+    """
+    return {
+        '_id': ObjectId(),
+        'root': BlockKey('course', 'course'),
+        'blocks': {
+            BlockKey('html', 'block{}'.format(index)): {'fields': {'data': unicode(ObjectId())}}
+            for index in range(num_blocks)
+        },
+    }
+
+
+class TestStructureCache(unittest.TestCase):
+    """
+    Tests of StructureCache.
+    """
+    def test_miss(self):
+        cache = StructureCache(1024 * 1024)
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_get_returns_copy(self):
+        cache = StructureCache(1024 * 1024)
+        structure = make_structure()
+        cache.set('key', structure)
+
+        cached = cache.get('key')
+        self.assertEqual(cached, structure)
+        self.assertIsNot(cached, structure)
+
+        # Modifying a structure after it was cached, or one returned from
+        # the cache, must not change what the cache returns
+        cached['blocks'].clear()
+        structure['root'] = BlockKey('course', 'other')
+        self.assertEqual(len(cache.get('key')['blocks']), 1)
+        self.assertEqual(cache.get('key')['root'], BlockKey('course', 'course'))
+        self.assertEqual(cache.stats()['hits'], 3)
+
+    def test_lru_eviction(self):
+        cache = StructureCache(1024 * 1024)
+        cache.set('first', make_structure())
+        entry_size = cache.stats()['bytes']
+        cache.max_bytes = entry_size * 2 + entry_size // 2
+
+        cache.set('second', make_structure())
+        # Touch 'first', so that 'second' is the least recently used
+        self.assertIsNotNone(cache.get('first'))
+        cache.set('third', make_structure())
+
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNotNone(cache.get('third'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
+
+    def test_too_large_to_cache(self):
+        cache = StructureCache(10)
+        cache.set('key', make_structure(10))
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+    def test_backing_cache(self):
+        backing_cache = {}
+        backing = MagicMock()
+        backing.get.side_effect = backing_cache.get
+        backing.set.side_effect = backing_cache.__setitem__
+
+        structure = make_structure()
+        StructureCache(1024 * 1024, backing).set('key', structure)
+        self.assertIn('key', backing_cache)
+
+        # A different process, with an empty local cache, finds it in the backing cache
+        other_process_cache = StructureCache(1024 * 1024, backing)
+        self.assertEqual(other_process_cache.get('key'), structure)
+        self.assertEqual(other_process_cache.stats()['entries'], 1)
+
+    def test_modifying_blocks_returned(self):
+        cache = StructureCache(1024 * 1024)
+        cache.set('key', make_structure())
+
+        # The modulestore adds to the fields and edit info of the blocks it loads
+        for block in cache.get('key')['blocks'].itervalues():
+            block['fields']['display_name'] = 'loaded'
+            block['definition_loaded'] = True
+        for block in cache.get('key')['blocks'].itervalues():
+            self.assertNotIn('display_name', block['fields'])
+            self.assertNotIn('definition_loaded', block)
+
+    def test_too_large_for_backing_cache(self):
+        backing = MagicMock()
+        backing.get.return_value = None
+        cache = StructureCache(1024 * 1024, backing, backing_cache_max_bytes=10)
+        cache.set('key', make_structure())
+
+        # It's still cached locally, but not written to the backing cache
+        self.assertFalse(backing.set.called)
+        self.assertIsNotNone(cache.get('key'))
+        self.assertEqual(cache.stats()['oversized'], 1)
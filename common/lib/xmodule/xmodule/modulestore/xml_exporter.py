@@ -2,8 +2,11 @@
 Methods for exporting course data to XML
 """
 
+import calendar
 import logging
 import lxml.etree
+import tarfile
+import time
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
@@ -11,6 +14,7 @@ from xmodule.assetstore import AssetMetadata
 from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
+from fs.memoryfs import MemoryFS
 from fs.osfs import OSFS
 from json import dumps
 import json
@@ -38,13 +42,55 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     `root_dir`: The directory to write the exported xml to
     `course_dir`: The name of the directory inside `root_dir` to write the course content to
     """
+    export_fs = OSFS(root_dir).makeopendir(course_dir)
+    _export_course_xml(modulestore, contentstore, course_key, export_fs)
 
+    # export the static assets
+    if contentstore:
+        root_course_dir = root_dir + '/' + course_dir
+        contentstore.export_all_for_course(
+            course_key,
+            root_course_dir + '/static/',
+            root_course_dir + '/policies/assets.json',
+        )
+
+
+def export_to_tarball(modulestore, contentstore, course_key, course_dir, progress_callback=None):
+    """
+    Export the course like `export_to_xml`, as a tar.gz archive of the directory
+    `course_dir`, without writing anything to disk. Returns an iterator over the
+    chunks of the archive, which can be streamed as they are read.
+
+    The xml of the course is exported to memory before this returns, so that
+    errors exporting it (such as `SerializationError`) are raised here rather
+    than while the archive is read. The static assets are read from the
+    contentstore chunk by chunk, and compressed as the archive is read.
+
+    `progress_callback`: if given, called with the number of bytes of the
+    course's files added to the archive so far, and their total, each time more
+    of the archive is produced
+    """
+    xml_fs = MemoryFS()
+    _export_course_xml(modulestore, contentstore, course_key, xml_fs)
+
+    assets = []
+    if contentstore:
+        assets, __ = contentstore.get_all_content_for_course(course_key)
+        with xml_fs.open('policies/assets.json', 'w') as assets_policy:
+            json.dump(contentstore.get_assets_policy(assets), assets_policy, sort_keys=True, indent=4)
+
+    return _iter_tarball(xml_fs, contentstore, assets, course_dir, progress_callback)
+
+
+def _export_course_xml(modulestore, contentstore, course_key, export_fs):
+    """
+    Export the modules of the course, and all its content but its static
+    assets, to the filesystem `export_fs`.
+    """
     with modulestore.bulk_operations(course_key):
 
         course = modulestore.get_course(course_key, depth=None)  # None means infinite
-        fsm = OSFS(root_dir)
-        export_fs = course.runtime.export_fs = fsm.makeopendir(course_dir)
-        root_course_dir = root_dir + '/' + course_dir
+        course.runtime.export_fs = export_fs
 
         root = lxml.etree.Element('unknown')
 
@@ -60,27 +106,18 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
             lxml.etree.ElementTree(root).write(course_xml)
 
         # Export the modulestore's asset metadata.
-        asset_dir = root_course_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makeopendir(AssetMetadata.EXPORTED_ASSET_DIR)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = modulestore.get_all_asset_metadata(course_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file)
 
-        # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if contentstore:
-            contentstore.export_all_for_course(
-                course_key,
-                root_course_dir + '/static/',
-                root_course_dir + '/policies/assets.json',
-            )
-
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
             if course.course_image == course.fields['course_image'].default:
@@ -94,10 +131,8 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_course_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    output_dir = export_fs.makeopendir('static/images', recursive=True)
+                    with output_dir.open('course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -190,6 +225,116 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
                         draft_node.module.add_xml_to_node(node)
 
 
+class _ChunkBuffer(object):
+    """
+    File-like object that keeps what is written to it until it is popped.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        """
+        Return everything written since the last pop.
+        """
+        data = ''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class _StreamingTarFile(tarfile.TarFile):
+    """
+    A `TarFile` whose members can be added from an iterator over their data,
+    rather than from a file that is read in one go.
+    """
+    def addchunks(self, tarinfo, chunks):
+        """
+        Add the member `tarinfo` whose data are the strings `chunks`, which
+        must add up to `tarinfo.size` bytes. This is a generator, which yields
+        the length of each chunk once it has been added.
+        """
+        self.addfile(tarinfo)
+        written = 0
+        for chunk in chunks:
+            self.fileobj.write(chunk)
+            written += len(chunk)
+            yield len(chunk)
+        if written != tarinfo.size:
+            raise IOError(u'{} has {} bytes rather than {}'.format(tarinfo.name, written, tarinfo.size))
+
+        blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+        if remainder > 0:
+            self.fileobj.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+            blocks += 1
+        self.offset += blocks * tarfile.BLOCKSIZE
+
+
+def _iter_tarball(xml_fs, contentstore, assets, course_dir, progress_callback):
+    """
+    Yield the chunks of a tar.gz archive of the files in `xml_fs` and of the
+    static `assets` from `contentstore`, in the directory `course_dir`.
+    """
+    output = _ChunkBuffer()
+    tar_file = _StreamingTarFile.open(fileobj=output, mode='w|gz', encoding='utf-8')
+
+    total = sum(xml_fs.getsize(file_path) for file_path in xml_fs.walkfiles())
+    total += sum(asset['length'] for asset in assets)
+    done = 0
+    for tarinfo, chunks in _tarball_members(xml_fs, contentstore, assets, course_dir):
+        for length in tar_file.addchunks(tarinfo, chunks):
+            done += length
+            if progress_callback is not None:
+                progress_callback(done, total)
+            data = output.pop()
+            if data:
+                yield data
+
+    tar_file.close()
+    yield output.pop()
+
+
+def _tarball_members(xml_fs, contentstore, assets, course_dir):
+    """
+    Yield the `TarInfo` and the chunks of data of each member of the archive
+    made by `_iter_tarball`.
+    """
+    now = time.time()
+    for dir_path in xml_fs.walkdirs():
+        yield _make_tarinfo(course_dir + dir_path, 0, now, tarfile.DIRTYPE), []
+    for file_path in xml_fs.walkfiles():
+        yield _make_tarinfo(course_dir + file_path, xml_fs.getsize(file_path), now), [xml_fs.getcontents(file_path)]
+
+    for asset in assets:
+        content = contentstore.find(asset['asset_key'], as_stream=True)
+        try:
+            # assets are exported where they were imported from, as by `MongoContentStore.export`
+            file_path = content.name
+            if content.import_path is not None:
+                file_path = os.path.dirname(content.import_path) + '/' + file_path
+            mtime = calendar.timegm(content.last_modified_at.utctimetuple()) if content.last_modified_at else now
+            tarinfo = _make_tarinfo(course_dir + '/static/' + file_path.lstrip('/'), content.length, mtime)
+            yield tarinfo, content.stream_data()
+        finally:
+            content.close()
+
+
+def _make_tarinfo(name, size, mtime, file_type=tarfile.REGTYPE):
+    """
+    Return the `TarInfo` of an archive member.
+    """
+    tarinfo = tarfile.TarInfo(name.rstrip('/'))
+    tarinfo.size = size
+    tarinfo.mtime = mtime
+    tarinfo.type = file_type
+    tarinfo.mode = 0755 if file_type == tarfile.DIRTYPE else 0644
+    return tarinfo
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
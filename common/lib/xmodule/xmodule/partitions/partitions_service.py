@@ -79,3 +79,11 @@ class PartitionService(object):
         return user_partition.scheme.get_group_for_user(
             self._course_id, self._user, user_partition, assign=assign, track_function=self._track_function
         )
+
+    def get_groups_for_users(self, user_partition):
+        """
+        Returns a dict from the id of each user of the course who is assigned to a group
+        of the specified user partition to that group, looked up for all the users at
+        once. Unlike `get_group`, nobody is assigned to a group.
+        """
+        return user_partition.scheme.get_groups_for_users(self._course_id, user_partition)
@@ -2,6 +2,7 @@ import json
 import logging
 import warnings
 
+from django.conf import settings
 from lxml import etree
 
 from xblock.fields import Integer, Scope
@@ -96,6 +97,17 @@ class SequenceModule(SequenceFields, XModule):
             else:
                 self.position = 1
             return json.dumps({'success': True})
+        elif dispatch == 'render_position':
+            # render the child at 'position', which wasn't rendered with the
+            # rest of the sequence (see student_view)
+            position = data.get('position', u'')
+            children = self.get_display_items()
+            if not position.isdigit() or not 0 < int(position) <= len(children):
+                raise NotFoundError('Unexpected position')
+            rendered_child = children[int(position) - 1].render(STUDENT_VIEW, {})
+            return json.dumps({
+                'html': rendered_child.head_html() + rendered_child.content + rendered_child.foot_html(),
+            })
         raise NotFoundError('Unexpected dispatch type')
 
     def student_view(self, context):
@@ -104,19 +116,30 @@ class SequenceModule(SequenceFields, XModule):
         if self.position is None:
             self.position = 1
 
+        # Only render the child at the current position if children are rendered
+        # lazily; the others are rendered by the 'render_position' handler when
+        # they're shown
+        render_lazily = settings.FEATURES.get('ENABLE_LAZY_SEQUENCE_RENDERING', False)
+
         ## Returns a set of all types of all sub-children
         contents = []
 
         fragment = Fragment()
 
-        for child in self.get_display_items():
+        for position, child in enumerate(self.get_display_items(), start=1):
             progress = child.get_progress()
-            rendered_child = child.render(STUDENT_VIEW, context)
-            fragment.add_frag_resources(rendered_child)
+            lazy = render_lazily and position != self.position
+            if lazy:
+                content = u''
+            else:
+                rendered_child = child.render(STUDENT_VIEW, context)
+                fragment.add_frag_resources(rendered_child)
+                content = rendered_child.content
 
             titles = child.get_content_titles()
             childinfo = {
-                'content': rendered_child.content,
+                'content': content,
+                'lazy': lazy,
                 'title': "\n".join(titles),
                 'page_title': titles[0] if titles else '',
                 'progress_status': Progress.to_js_status_str(progress),
@@ -12,6 +12,7 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import string
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -19,8 +20,10 @@ from django.db import models, transaction
 from html_to_text import html_to_text
 from mail_utils import wrap_message
 
+from xmodule.modulestore.django import modulestore
 from xmodule_django.models import CourseKeyField
-from util.keyword_substitution import substitute_keywords_with_data
+from util import keyword_substitution
+from util.keyword_substitution import substitute_keywords, substitute_keywords_with_data
 
 log = logging.getLogger(__name__)
 
@@ -228,6 +231,152 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile_plaintext(self, plaintext, context):
+        """
+        Compile the plain text message for sending to many recipients.
+
+        Returns a CompiledEmailMessage whose `render` gives the same result as
+        `render_plaintext` for each recipient.
+        """
+        return CompiledEmailMessage(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Compile the HTML message for sending to many recipients.
+
+        Returns a CompiledEmailMessage whose `render` gives the same result as
+        `render_htmltext` for each recipient.
+        """
+        return CompiledEmailMessage(self.html_template, htmltext, context)
+
+
+class CompiledEmailMessage(object):
+    """
+    An email message made from a template and a message body, compiled so that
+    everything that is the same for all recipients is rendered once.
+
+    Rendering the message for a recipient then only substitutes the recipient's
+    own values, and wraps only the lines in which they appear.
+    """
+    # The values in the context which are different for each recipient
+    RECIPIENT_FIELDS = ('name', 'email', 'user_id')
+
+    # Stands for the message body in a line, when it must be rendered for each recipient
+    MESSAGE_BODY = object()
+
+    def __init__(self, format_string, message_body, context):
+        formatter = string.Formatter()
+        self.context = context
+        self.course = None
+        keywords = keyword_substitution.KEYWORD_FUNCTION_MAP
+        if 'course_id' in context and any(keyword in message_body for keyword in keywords):
+            # the keywords are substituted with data about each recipient
+            self.course = modulestore().get_course(context['course_id'], depth=0)
+            self.message_body = message_body
+        else:
+            self.message_body = None
+
+        # Render the template, leaving the recipient fields as (field_name, conversion, format_spec)
+        parts = []
+        for literal_text, field_name, format_spec, conversion in formatter.parse(format_string):
+            self._append_text(parts, literal_text)
+            if field_name is None:
+                continue
+            root_name = field_name.split('.')[0].split('[')[0]
+            if root_name in self.RECIPIENT_FIELDS:
+                parts.append((field_name, conversion, format_spec))
+            else:
+                self._append_text(parts, self._format_field(formatter, field_name, conversion, format_spec, context))
+
+        # Insert the message body in place of the first body tag of the rendered template
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        for index, part in enumerate(parts):
+            if isinstance(part, basestring) and message_body_tag in part:
+                before, after = part.split(message_body_tag, 1)
+                if self.message_body is None:
+                    parts[index] = before + message_body + after
+                else:
+                    parts[index:index + 1] = [before, self.MESSAGE_BODY, after]
+                break
+
+        # Split the parts into lines, wrapping those which are the same for every recipient now
+        self.lines = []
+        line = []
+        for part in parts:
+            if isinstance(part, basestring):
+                first_text, newline, part = part.partition('\n')
+                line.append(first_text)
+                while newline:
+                    self._append_line(line)
+                    text, newline, part = part.partition('\n')
+                    line = [text]
+            else:
+                line.append(part)
+        self._append_line(line)
+
+    @staticmethod
+    def _append_text(parts, text):
+        """
+        Append `text` to `parts`, joining it to the last part if that's text too.
+        """
+        if parts and isinstance(parts[-1], basestring):
+            parts[-1] += text
+        else:
+            parts.append(text)
+
+    @staticmethod
+    def _format_field(formatter, field_name, conversion, format_spec, context):
+        """
+        Format a replacement field of the template the way `str.format` does.
+        """
+        value = formatter.get_field(field_name, (), context)[0]
+        if conversion == 's':
+            # as for unicode templates, which `Formatter.convert_field` doesn't handle
+            value = unicode(value)
+        else:
+            value = formatter.convert_field(value, conversion)
+        format_spec = formatter.vformat(format_spec, (), context)
+        return formatter.format_field(value, format_spec)
+
+    def _append_line(self, line):
+        """
+        Append a line made of `line`, a list of parts, to the lines of the message.
+        """
+        if all(isinstance(part, basestring) for part in line):
+            self.lines.append(wrap_message(''.join(line)))
+        else:
+            self.lines.append(line)
+
+    def render(self, context, user=None):
+        """
+        Render the message for the recipient whose values of RECIPIENT_FIELDS are given by `context`.
+
+        `user`, the recipient's User, is used to substitute keywords in the message
+        body. It's looked up if it isn't given and keywords need substituting.
+        """
+        formatter = string.Formatter()
+        context = dict(self.context, **context)
+        lines = []
+        for line in self.lines:
+            if isinstance(line, basestring):
+                lines.append(line)
+                continue
+            rendered = []
+            for part in line:
+                if isinstance(part, basestring):
+                    rendered.append(part)
+                elif part is self.MESSAGE_BODY:
+                    if 'user_id' in context:
+                        if user is None:
+                            user = User.objects.get(id=context['user_id'])
+                        rendered.append(substitute_keywords(self.message_body, user, self.course))
+                    else:
+                        rendered.append(self.message_body)
+                else:
+                    rendered.append(self._format_field(formatter, part[0], part[1], part[2], context))
+            lines.append(wrap_message(''.join(rendered)))
+        return '\n'.join(lines)
+
 
 class CourseAuthorization(models.Model):
     """
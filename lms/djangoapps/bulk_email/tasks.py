@@ -5,7 +5,9 @@ to a course.
 import re
 import random
 import json
-from time import sleep
+from multiprocessing.pool import ThreadPool
+from Queue import Queue
+from time import sleep, time
 
 import dogstats_wrapper as dog_stats_api
 from smtplib import SMTPServerDisconnected, SMTPDataError, SMTPConnectError, SMTPException
@@ -445,14 +447,25 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connections = []
     try:
-        connection = get_connection()
-        connection.open()
+        for __ in range(max(settings.BULK_EMAIL_SEND_CONNECTIONS, 1)):
+            connection = get_connection()
+            connections.append(connection)
+            connection.open()
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
 
+        # Sending in batches goes through the whole list, leaving nothing for the loop below.
+        if len(connections) > 1:
+            email_context['course_id'] = course_email.course_id
+            _send_course_email_batches(
+                connections, to_list, course_email, course_email_template, email_context, subject, from_addr,
+                subtask_status,
+            )
+
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
             # At the end of processing this user, they will be popped off of the to_list.
@@ -578,7 +591,124 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        for connection in connections:
+            connection.close()
+
+
+def _send_course_email_batches(connections, to_list, course_email, course_email_template, email_context, subject,
+                               from_addr, subtask_status):
+    """
+    Sends `course_email` to the recipients in `to_list` in batches, sending one email of each
+    batch over each of `connections` in parallel.
+
+    The template and message body are compiled once, so that only each recipient's own
+    values are rendered for each email.  As when sending one email at a time, recipients are
+    popped off the end of `to_list` once they have been processed, and errors that should
+    cause the subtask to be retried or to fail are raised, once the rest of their batch has
+    been processed.  The number of batches and the time spent sending them are added to
+    `subtask_status`.
+    """
+    task_id = subtask_status.task_id
+    email_id = course_email.id
+    course_title = email_context['course_title']
+    plaintext_message = course_email_template.compile_plaintext(course_email.text_message, email_context)
+    html_message = course_email_template.compile_htmltext(course_email.html_message, email_context)
+    needs_users = plaintext_message.course is not None or html_message.course is not None
+
+    idle_connections = Queue()
+    for connection in connections:
+        idle_connections.put(connection)
+
+    def send(email_msg):
+        """
+        Sends `email_msg` over an idle connection, returning the exception raised, if any.
+        """
+        connection = idle_connections.get()
+        try:
+            with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
+                connection.send_messages([email_msg])
+        except Exception as exc:  # pylint: disable=broad-except
+            return exc
+        finally:
+            idle_connections.put(connection)
+        return None
+
+    pool = ThreadPool(len(connections))
+    try:
+        while to_list:
+            batch = to_list[-len(connections):]
+            users = User.objects.in_bulk([recipient['pk'] for recipient in batch]) if needs_users else {}
+
+            email_msgs = []
+            for recipient in batch:
+                recipient_context = {
+                    'name': recipient['profile__name'],
+                    'email': recipient['email'],
+                    'user_id': recipient['pk'],
+                }
+                user = users.get(recipient['pk'])
+                email_msg = EmailMultiAlternatives(
+                    subject,
+                    plaintext_message.render(recipient_context, user),
+                    from_addr,
+                    [recipient['email']],
+                )
+                email_msg.attach_alternative(html_message.render(recipient_context, user), 'text/html')
+                email_msgs.append(email_msg)
+
+            start_time = time()
+            errors = pool.map(send, email_msgs)
+            duration = time() - start_time
+
+            # As when sending one email at a time, a task that has been retried for rate-limiting
+            # reasons waits between emails.
+            min_duration = 0
+            if settings.BULK_EMAIL_MAX_SEND_RATE:
+                min_duration = float(len(batch)) / settings.BULK_EMAIL_MAX_SEND_RATE
+            if subtask_status.retried_nomax > 0:
+                min_duration = max(min_duration, len(batch) * settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+            if duration < min_duration:
+                sleep(min_duration - duration)
+                duration = min_duration
+
+            subtask_status.increment(batches=1, batch_duration_ms=int(duration * 1000))
+            dog_stats_api.histogram(
+                'course_email.batch.emails_per_second', value=len(batch) / max(duration, 0.001),
+                tags=[_statsd_tag(course_title)]
+            )
+
+            unprocessed = []
+            batch_exception = None
+            for recipient, exc in zip(batch, errors):
+                email = recipient['email']
+                if exc is None:
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+                elif isinstance(exc, SMTPDataError) and not 400 <= exc.smtp_code < 500:
+                    # According to SMTP spec, 5xx range error codes indicate hard failure.
+                    log.warning('Task %s: email with id %s not delivered to %s due to error %s', task_id, email_id, email, exc.smtp_error)
+                    dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                    subtask_status.increment(failed=1)
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
+                    log.warning('Task %s: email with id %s not delivered to %s due to error %s', task_id, email_id, email, exc)
+                    dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                    subtask_status.increment(failed=1)
+                else:
+                    # Leave the recipient on the list, for the handling of the exception to retry.
+                    unprocessed.append(recipient)
+                    if batch_exception is None:
+                        batch_exception = exc
+
+            del to_list[-len(batch):]
+            to_list.extend(unprocessed)
+            if batch_exception is not None:
+                raise batch_exception
+    finally:
+        pool.terminate()
 
 
 def _get_current_task():
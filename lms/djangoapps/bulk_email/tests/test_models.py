@@ -10,6 +10,8 @@ from student.tests.factories import UserFactory
 from mock import patch, Mock
 
 from bulk_email.models import CourseEmail, SEND_TO_STAFF, CourseEmailTemplate, CourseAuthorization
+from mail_utils import MAX_LINE_LENGTH
+from util import keyword_substitution
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 
@@ -131,6 +133,71 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_render(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        plaintext = template.compile_plaintext("My new plain text.", context)
+        htmltext = template.compile_htmltext("<p>My new html text.</p>", context)
+        for email in ('your-email@test.com', u'\u00fcnicode@test.com'):
+            context['email'] = email
+            self.assertEqual(
+                plaintext.render({'email': email}),
+                template.render_plaintext("My new plain text.", context)
+            )
+            self.assertEqual(
+                htmltext.render({'email': email}),
+                template.render_htmltext("<p>My new html text.</p>", context)
+            )
+
+    def test_compiled_render_keywords(self):
+        template = CourseEmailTemplate.get_template()
+        course = Mock(display_name=u'Bogus C\u00f6urse Display Name')
+        context = self._get_sample_html_context()
+        context['course_id'] = SlashSeparatedCourseKey('edX', 'bogus', '2014')
+        # The keywords make a line longer than MAX_LINE_LENGTH when they are substituted
+        message = u"Hello %%USER_ID%%,\n" + u"Welcome to %%COURSE_DISPLAY_NAME%%. " * 30
+        keyword_map = {
+            '%%USER_ID%%': lambda user, course: u'anonymous-{0}'.format(user.id),
+            '%%COURSE_DISPLAY_NAME%%': lambda user, course: course.display_name,
+        }
+        with patch.dict(keyword_substitution.KEYWORD_FUNCTION_MAP, keyword_map), \
+                patch('bulk_email.models.modulestore') as mock_modulestore, \
+                patch('util.keyword_substitution.modulestore') as mock_keyword_modulestore:
+            mock_modulestore.return_value.get_course.return_value = course
+            mock_keyword_modulestore.return_value.get_course.return_value = course
+            plaintext = template.compile_plaintext(message, context)
+            htmltext = template.compile_htmltext(message, context)
+            for user in (UserFactory.create(), UserFactory.create(email=u'\u00fcnicode@test.com')):
+                recipient = {'name': user.profile.name, 'email': user.email, 'user_id': user.id}
+                context.update(recipient)
+                expected_plaintext = template.render_plaintext(message, context)
+                self.assertIn(u'Hello anonymous-{0},'.format(user.id), expected_plaintext)
+                self.assertIn(course.display_name, expected_plaintext)
+                self.assertEqual(plaintext.render(recipient), expected_plaintext)
+                self.assertEqual(plaintext.render(recipient, user=user), expected_plaintext)
+                self.assertEqual(
+                    htmltext.render(recipient, user=user),
+                    template.render_htmltext(message, context)
+                )
+
+    def test_compiled_render_long_lines(self):
+        # The recipient's email is in a line of the template longer than MAX_LINE_LENGTH
+        template = CourseEmailTemplate(
+            plain_template=u"{course_title}\n" + u"Sent to {email}. " * 100 + u"\n{{message_body}}\n{platform_name}",
+            html_template=u"<p>{course_title}</p>{{message_body}}<p>" + u"Sent to {email}. " * 100 + u"</p>",
+        )
+        context = self._get_sample_html_context()
+        message = u"My new plain text, which is quite long. " * 50
+        self.assertGreater(len(message), MAX_LINE_LENGTH)
+        plaintext = template.compile_plaintext(message, context)
+        htmltext = template.compile_htmltext(message, context)
+        for email in ('your-email@test.com', u'\u00fcnicode@test.com'):
+            context['email'] = email
+            expected_plaintext = template.render_plaintext(message, context)
+            self.assertTrue(all(len(line) <= MAX_LINE_LENGTH for line in expected_plaintext.split('\n')))
+            self.assertEqual(plaintext.render({'email': email}), expected_plaintext)
+            self.assertEqual(htmltext.render({'email': email}), template.render_htmltext(message, context))
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
@@ -5,7 +5,11 @@ Runs tasks on answers to course problems to validate that code
 paths actually work.
 
 """
+import asyncore
 import json
+import math
+import smtpd
+import threading
 from uuid import uuid4
 from itertools import cycle, chain, repeat
 from mock import patch, Mock
@@ -27,6 +31,7 @@ from celery.states import SUCCESS, FAILURE
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from bulk_email.models import CourseEmail, Optout, SEND_TO_ALL
 
@@ -43,6 +48,26 @@ class TestTaskFailure(Exception):
     pass
 
 
+class StandInSMTPServer(smtpd.SMTPServer):
+    """
+    A local SMTP server which keeps the recipients of the messages it's sent.
+    """
+    def __init__(self):
+        smtpd.SMTPServer.__init__(self, ('localhost', 0), None)
+        self.port = self.socket.getsockname()[1]
+        self.recipients = []
+        self.thread = threading.Thread(target=asyncore.loop, kwargs={'timeout': 0.1})
+        self.thread.start()
+
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        self.recipients.extend(rcpttos)
+
+    def stop(self):
+        """Stop serving, once the connections to the server have been closed."""
+        self.close()
+        self.thread.join()
+
+
 def my_update_subtask_status(entry_id, current_task_id, new_subtask_status):
     """
     Check whether a subtask has been updated before really updating.
@@ -196,6 +221,26 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
 
+    @override_settings(
+        BULK_EMAIL_SEND_CONNECTIONS=4,
+        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+        EMAIL_HOST='localhost',
+    )
+    def test_successful_in_batches(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        server = StandInSMTPServer()
+        self.addCleanup(server.stop)
+        with override_settings(EMAIL_PORT=server.port):
+            entry = self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+
+        self.assertEquals(len(set(server.recipients)), num_emails)
+        subtask_status = json.loads(entry.subtasks)['status'].values()[0]
+        self.assertEquals(subtask_status['batches'], int(math.ceil(num_emails / 4.0)))
+        self.assertGreater(subtask_status['batch_duration_ms'], 0)
+
     def test_successful_twice(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -258,6 +303,10 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         # Test that celery handles permanent SMTPDataErrors by failing and not retrying.
         self._test_email_address_failures(SMTPDataError(554, "Email address is blacklisted"))
 
+    @override_settings(BULK_EMAIL_SEND_CONNECTIONS=4)
+    def test_smtp_blacklisted_user_in_batches(self):
+        self._test_email_address_failures(SMTPDataError(554, "Email address is blacklisted"))
+
     def test_ses_blacklisted_user(self):
         # Test that celery handles permanent SMTPDataErrors by failing and not retrying.
         self._test_email_address_failures(SESAddressBlacklistedError(554, "Email address is blacklisted"))
@@ -320,6 +369,10 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
     def test_retry_after_smtp_disconnect(self):
         self._test_retry_after_limited_retry_error(SMTPServerDisconnected(425, "Disconnecting"))
 
+    @override_settings(BULK_EMAIL_SEND_CONNECTIONS=4)
+    def test_max_retry_after_smtp_disconnect_in_batches(self):
+        self._test_max_retry_limit_causes_failure(SMTPServerDisconnected(425, "Disconnecting"))
+
     def test_max_retry_after_smtp_disconnect(self):
         self._test_max_retry_limit_causes_failure(SMTPServerDisconnected(425, "Disconnecting"))
 
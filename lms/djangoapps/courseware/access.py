@@ -9,7 +9,7 @@ from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 
 from xmodule.course_module import (
-    CourseDescriptor, CATALOG_VISIBILITY_CATALOG_AND_ABOUT,
+    CourseDescriptor, CourseSummary, CATALOG_VISIBILITY_CATALOG_AND_ABOUT,
     CATALOG_VISIBILITY_ABOUT)
 from xmodule.error_module import ErrorDescriptor
 from xmodule.x_module import XModule
@@ -17,8 +17,10 @@ from xmodule.x_module import XModule
 from xblock.core import XBlock
 
 from external_auth.models import ExternalAuthMap
+from courseware.course_outline import OutlineItem
 from courseware.masquerade import is_masquerading_as_student
 from django.utils.timezone import UTC
+from request_cache.middleware import RequestCache
 from student import auth
 from student.roles import (
     GlobalStaff, CourseStaffRole, CourseInstructorRole,
@@ -66,16 +68,72 @@ def has_access(user, action, obj, course_key=None):
 
     Returns a bool.  It is up to the caller to actually deny access in a way
     that makes sense in context.
+
+    While handling a request, the result of each check is remembered for the
+    rest of the request, so that repeating it costs a dict lookup.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
         user = AnonymousUser()
 
+    memo_key = _access_memo_key(user, action, obj, course_key)
+    if memo_key is None:
+        return _has_access(user, action, obj, course_key)
+
+    request_data = RequestCache.get_request_cache().data
+    results = request_data.setdefault('courseware.access', {}).setdefault(user.id, {})
+    counts = request_data.setdefault('courseware.access.counts', {'hits': 0, 'misses': 0})
+    if memo_key in results:
+        counts['hits'] += 1
+    else:
+        counts['misses'] += 1
+        results[memo_key] = _has_access(user, action, obj, course_key)
+    return results[memo_key]
+
+
+def access_check_counts():
+    """
+    Return a dict counting the access checks made while handling the current
+    request that were remembered ('hits') and that had to be made ('misses').
+    """
+    counts = RequestCache.get_request_cache().data.get('courseware.access.counts', {})
+    return {'hits': counts.get('hits', 0), 'misses': counts.get('misses', 0)}
+
+
+def _access_memo_key(user, action, obj, course_key):
+    """
+    Return the key under which the result of `has_access` for `user` is remembered
+    for the current request, or None if it shouldn't be remembered.
+    """
+    if RequestCache.get_current_request() is None:
+        return None
+
+    if isinstance(obj, (XBlock, OutlineItem)):
+        # Descriptors and modules of the same block can have different access
+        obj_key = (type(obj), obj.location)
+    elif isinstance(obj, (CourseKey, UsageKey, basestring)):
+        obj_key = obj
+    else:
+        return None
+    # Staff start masquerading as students part way through handling a request
+    return (action, obj_key, course_key, is_masquerading_as_student(user))
+
+
+def _has_access(user, action, obj, course_key):
+    """
+    Check whether `user` has the access to do `action` on `obj`; see `has_access`.
+    """
     # delegate the work to type-specific functions.
     # (start with more specific types, then get more general)
     if isinstance(obj, CourseDescriptor):
         return _has_access_course_desc(user, action, obj)
 
+    if isinstance(obj, CourseSummary):
+        return _has_access_course_summary(user, action, obj)
+
+    if isinstance(obj, OutlineItem):
+        return _has_access_outline_item(user, action, obj, course_key)
+
     if isinstance(obj, ErrorDescriptor):
         return _has_access_error_desc(user, action, obj, course_key)
 
@@ -281,6 +339,41 @@ def _has_access_course_desc(user, action, course):
     return _dispatch(checkers, action, user, course)
 
 
+def _has_access_course_summary(user, action, course):
+    """
+    Check if user has access to the course summarized by `course`, a CourseSummary.
+
+    Valid actions:
+
+    'load' -- load the courseware, see inside the course
+    'staff' -- staff access to course.
+    """
+    checkers = {
+        'load': lambda: _has_access_descriptor(user, 'load', course, course.id),
+        'staff': lambda: _has_staff_access_to_descriptor(user, course, course.id),
+    }
+
+    return _dispatch(checkers, action, user, course)
+
+
+def _has_access_outline_item(user, action, item, course_key):
+    """
+    Check if user has access to the chapter or section of a course outline
+    summarized by `item`, an OutlineItem.
+
+    Valid actions:
+
+    'load' -- load the chapter or section, showing it to the user.
+    'staff' -- staff access to the chapter or section.
+    """
+    checkers = {
+        'load': lambda: _has_access_descriptor(user, 'load', item, course_key),
+        'staff': lambda: _has_staff_access_to_descriptor(user, item, course_key),
+    }
+
+    return _dispatch(checkers, action, user, item)
+
+
 def _has_access_error_desc(user, action, descriptor, course_key):
     """
     Only staff should see error descriptors.
@@ -0,0 +1,170 @@
+"""
+The outline of a course: its chapters and sections, with what the courseware's
+table of contents needs to know about them.
+
+The outline is the same for every student, so it's made from the course's
+descriptors rather than from each student's modules, and, for modulestores that
+keep track of when their courses change, cached for each version of the course.
+"""
+import json
+
+from courseware.models import StudentModule
+from opaque_keys.edx.keys import UsageKey
+from util.cache import cache
+from xmodule.fields import Date
+from xmodule.util.duedate import get_extended_due_date
+from xmodule.x_module import XModule
+
+
+def get_course_outline(course):
+    """
+    Return the outline of `course`, a course descriptor: a list of dicts describing
+    its chapters, each with a list of dicts describing the chapter's sections.
+
+    Chapters and sections hidden from the table of contents are left out. Returns
+    None if some chapter or section chooses what to display for each student, in
+    which case the table of contents must be made from the student's modules.
+    """
+    version = get_course_version(course)
+    cache_key = u'course_outline.{}.{}'.format(course.id, version)
+    if version is not None:
+        outline = cache.get(cache_key)
+        if outline is not None:
+            return outline['chapters']
+
+    chapters = _make_outline(course)
+    if version is not None:
+        # cache courses without an outline too, so that they aren't walked every time
+        cache.set(cache_key, {'chapters': chapters})
+    return chapters
+
+
+def _make_outline(course):
+    """
+    Make the outline of `course`; see `get_course_outline`.
+    """
+    chapters = []
+    for chapter in course.get_children():
+        if not _displays_itself(chapter):
+            return None
+        if chapter.hide_from_toc:
+            continue
+
+        sections = []
+        for section in chapter.get_children():
+            if not _displays_itself(section):
+                return None
+            if section.hide_from_toc:
+                continue
+            item = _outline_item(section)
+            item.update({
+                'format': section.format if section.format is not None else '',
+                'due': section.due,
+                'graded': section.graded,
+            })
+            sections.append(item)
+
+        item = _outline_item(chapter)
+        item['sections'] = sections
+        chapters.append(item)
+    return chapters
+
+
+def get_course_version(course):
+    """
+    Return a string identifying the version of `course` that was loaded, or
+    None if its modulestore doesn't keep track of that.
+
+    Split versions whole course structures. Old Mongo only records when anything
+    in the course was last edited or published, which it updates on the course
+    along with the edited block's other ancestors.
+    """
+    course_entry = getattr(course.runtime, 'course_entry', None)
+    if course_entry is not None:
+        return unicode(course_entry.structure['_id'])
+    subtree_edited_on = getattr(course, 'subtree_edited_on', None)
+    if subtree_edited_on is not None:
+        return subtree_edited_on.isoformat()
+    return None
+
+
+def _displays_itself(descriptor):
+    """
+    Whether the module of `descriptor` is displayed as itself, rather than
+    choosing other modules to display for each student.
+    """
+    module_class = getattr(descriptor, 'module_class', None)
+    if module_class is None:
+        return True
+    return module_class.displayable_items.__func__ is XModule.displayable_items.__func__
+
+
+def _outline_item(descriptor):
+    """
+    Return the fields of `descriptor` needed for every item of the outline,
+    including those which has_access reads to decide whether it can be loaded
+    (see OutlineItem).
+    """
+    return {
+        'display_name': descriptor.display_name_with_default,
+        'url_name': descriptor.url_name,
+        'location': unicode(descriptor.location),
+        'visible_to_staff_only': descriptor.visible_to_staff_only,
+        'start': descriptor.start,
+        'days_early_for_beta': descriptor.days_early_for_beta,
+        'detached': 'detached' in descriptor._class_tags,  # pylint: disable=protected-access
+    }
+
+
+class OutlineItem(object):
+    """
+    An item of a course outline, standing in for its descriptor when checking
+    access to it with has_access, which applies the same rules as to the
+    descriptor.
+    """
+    def __init__(self, item):
+        self.location = UsageKey.from_string(item['location'])
+        self.visible_to_staff_only = item['visible_to_staff_only']
+        self.start = item['start']
+        self.days_early_for_beta = item['days_early_for_beta']
+        self._class_tags = frozenset(['detached'] if item['detached'] else [])
+
+    def __repr__(self):
+        return "OutlineItem({!r})".format(self.location)
+
+
+def get_due_dates(user, course_key, outline):
+    """
+    Return the due dates of the sections of `outline` for `user`, keyed by the
+    locations of their outline items, taking into account the extensions found
+    in the user's StudentModules.
+
+    The extensions are read with a single query, for the sections which are due.
+    """
+    due_dates = {}
+    for chapter in outline:
+        for section in chapter['sections']:
+            due_dates[section['location']] = section['due']
+
+    locations = {
+        UsageKey.from_string(location).map_into_course(course_key): location
+        for location, due in due_dates.iteritems() if due is not None
+    }
+    if not locations or not user.is_authenticated():
+        return due_dates
+
+    student_modules = StudentModule.objects.filter(
+        student=user.pk,
+        course_id=course_key,
+        module_state_key__in=locations.keys(),
+        state__contains='"extended_due"',
+    ).only('module_state_key', 'state')
+    for student_module in student_modules:
+        location = locations.get(student_module.module_state_key.map_into_course(course_key))
+        if location is None:
+            continue
+        extended_due = json.loads(student_module.state).get('extended_due')
+        due_dates[location] = get_extended_due_date({
+            'due': due_dates[location], 'extended_due': Date().from_json(extended_due),
+        })
+    return due_dates
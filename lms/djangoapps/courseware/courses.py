@@ -12,6 +12,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.content import StaticContent
+from xmodule.course_module import CourseFields
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from static_replace import replace_static_urls
 from xmodule.modulestore import ModuleStoreEnum
@@ -126,7 +127,7 @@ def course_image_url(course):
         # courses can use custom course image paths, otherwise just
         # return the default static path.
         url = '/static/' + (course.static_asset_path or getattr(course, 'data_dir', ''))
-        if hasattr(course, 'course_image') and course.course_image != course.fields['course_image'].default:
+        if hasattr(course, 'course_image') and course.course_image != CourseFields.course_image.default:
             url += '/' + course.course_image
         else:
             url += '/images/course_image.jpg'
@@ -1,18 +1,21 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
 from collections import defaultdict
+import hashlib
 import json
 import random
 import logging
 
 from contextlib import contextmanager
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.test.client import RequestFactory
 
 import dogstats_wrapper as dog_stats_api
 
 from courseware import courses
+from courseware.access import has_access
 from courseware.model_data import FieldDataCache
 from student.models import anonymous_id_for_user
 from xmodule import graders
@@ -24,6 +27,7 @@ from .models import StudentModule
 from .module_render import get_module_for_descriptor
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
+from xblock.fields import Scope
 
 log = logging.getLogger("edx.courseware")
 
@@ -141,17 +145,96 @@ def answer_distributions(course_key):
     return answer_counts
 
 
+class MaxScoresCache(object):
+    """
+    A cache of the unweighted max score of problems.
+
+    The key assumption here is that any problem that has not yet recorded a
+    score for a user is worth the same number of points. A problem is free to
+    score one student at 2/5 and another at 1/3, but a problem that has never
+    issued a score -- say one that a student has only seen listed on their
+    progress page -- should be worth the same number of points for everyone.
+
+    Entries are keyed by the problem's usage key and a hash of its content
+    fields, so editing and republishing a problem gives it a fresh entry
+    rather than a stale one. Lookups go to a local dict first and then to
+    django's cache, which is shared by every process; one instance can be
+    reused while grading many students in the same course.
+    """
+    CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
+
+    def __init__(self):
+        self._versions = {}
+        self._max_scores = {}
+
+    def _cache_key(self, problem_descriptor):
+        """
+        Return the cache key for `problem_descriptor`'s current content.
+        """
+        location = problem_descriptor.location
+        if location not in self._versions:
+            content = problem_descriptor.get_explicitly_set_fields_by_scope(Scope.content)
+            self._versions[location] = hashlib.md5(json.dumps(content, sort_keys=True)).hexdigest()
+        return u"grades.max_score.{}.{}".format(unicode(location), self._versions[location])
+
+    def get(self, problem_descriptor):
+        """
+        Return the cached max score of `problem_descriptor`, or None if unknown.
+        """
+        key = self._cache_key(problem_descriptor)
+        if key not in self._max_scores:
+            self._max_scores[key] = cache.get(key)
+        return self._max_scores[key]
+
+    def set(self, problem_descriptor, max_score):
+        """
+        Record the max score of `problem_descriptor`.
+        """
+        key = self._cache_key(problem_descriptor)
+        if self._max_scores.get(key) != max_score:
+            self._max_scores[key] = max_score
+            cache.set(key, max_score, self.CACHE_TIMEOUT)
+
+
+def _module_state_key(usage_key):
+    """
+    Return the string under which `usage_key` is stored in the
+    `StudentModule.module_state_key` column (branch and version stripped).
+    """
+    return StudentModule._meta.get_field('module_state_key').get_prep_value(usage_key)
+
+
+def student_module_scores_for(course_id, student_ids):
+    """
+    Bulk load the (grade, max_grade) of every StudentModule row in
+    `course_id` belonging to any of `student_ids`, using a single query.
+
+    Returns a dict mapping each student id to a dict of
+    {stored module_state_key: (grade, max_grade)}. Every student in
+    `student_ids` gets an entry, even if they have no rows at all, so the
+    result can be passed straight to `grade` as `student_module_scores`.
+    """
+    scores = {student_id: {} for student_id in student_ids}
+    rows = StudentModule.objects.filter(
+        course_id=course_id,
+        student__in=student_ids,
+    ).values_list('student', 'module_state_key', 'grade', 'max_grade')
+    for student_id, module_state_key, grade_value, max_grade in rows:
+        scores[student_id][module_state_key] = (grade_value, max_grade)
+    return scores
+
+
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False):
+def grade(student, request, course, keep_raw_scores=False, student_module_scores=None, max_scores_cache=None):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
     """
     with manual_transaction():
-        return _grade(student, request, course, keep_raw_scores)
+        return _grade(student, request, course, keep_raw_scores, student_module_scores, max_scores_cache)
 
 
-def _grade(student, request, course, keep_raw_scores):
+def _grade(student, request, course, keep_raw_scores, student_module_scores=None, max_scores_cache=None):
     """
     Unwrapped version of "grade"
 
@@ -170,8 +253,18 @@ def _grade(student, request, course, keep_raw_scores):
     - keep_raw_scores : if True, then value for key 'raw_scores' contains scores
       for every graded module
 
+    student_module_scores: optional dict of {stored module_state_key: (grade, max_grade)}
+      holding *all* of this student's StudentModule rows for the course, as built by
+      `student_module_scores_for`. When given, no per-section or per-problem
+      StudentModule queries are made.
+
+    max_scores_cache: optional MaxScoresCache to share between calls; a new one
+      is used if it isn't given.
+
     More information on the format is in the docstring for CourseGrader.
     """
+    if max_scores_cache is None:
+        max_scores_cache = MaxScoresCache()
     grading_context = course.grading_context
     raw_scores = []
 
@@ -207,7 +300,12 @@ def _grade(student, request, course, keep_raw_scores):
                     for descriptor in section['xmoduledescriptors']
                 )
 
-            if not should_grade_section:
+            if not should_grade_section and student_module_scores is not None:
+                should_grade_section = any(
+                    _module_state_key(descriptor.location) in student_module_scores
+                    for descriptor in section['xmoduledescriptors']
+                )
+            elif not should_grade_section:
                 with manual_transaction():
                     should_grade_section = StudentModule.objects.filter(
                         student=student,
@@ -232,7 +330,8 @@ def _grade(student, request, course, keep_raw_scores):
                 for module_descriptor in yield_dynamic_descriptor_descendents(section_descriptor, create_module):
 
                     (correct, total) = get_score(
-                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores
+                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores,
+                        student_module_scores=student_module_scores, max_scores_cache=max_scores_cache
                     )
                     if correct is None and total is None:
                         continue
@@ -351,6 +450,7 @@ def _progress_summary(student, request, course):
             return None
 
     submissions_scores = sub_api.get_scores(course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id))
+    max_scores_cache = MaxScoresCache()
 
     chapters = []
     # Don't include chapters that aren't displayable (e.g. due to error)
@@ -375,7 +475,8 @@ def _progress_summary(student, request, course):
                 for module_descriptor in yield_dynamic_descriptor_descendents(section_module, module_creator):
                     course_id = course.id
                     (correct, total) = get_score(
-                        course_id, student, module_descriptor, module_creator, scores_cache=submissions_scores
+                        course_id, student, module_descriptor, module_creator, scores_cache=submissions_scores,
+                        max_scores_cache=max_scores_cache
                     )
                     if correct is None and total is None:
                         continue
@@ -407,7 +508,8 @@ def _progress_summary(student, request, course):
     return chapters
 
 
-def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None):
+def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None, student_module_scores=None,
+              max_scores_cache=None):
     """
     Return the score for a user on a problem, as a tuple (correct, total).
     e.g. (5,7) if you got 5 out of 7 points.
@@ -421,6 +523,11 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
            Can return None if user doesn't have access, or if something else went wrong.
     scores_cache: A dict of location names to (earned, possible) point tuples.
            If an entry is found in this cache, it takes precedence.
+    student_module_scores: An optional dict of stored module_state_keys to (grade, max_grade)
+           tuples covering all of the user's StudentModule rows in the course. If given, it is
+           used instead of querying StudentModule for this problem.
+    max_scores_cache: An optional MaxScoresCache. If the user has no grade for the problem, can
+           load it, and its max score is cached there, the problem is not instantiated.
     """
     scores_cache = scores_cache or {}
 
@@ -447,18 +554,41 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
         # These are not problems, and do not have a score
         return (None, None)
 
-    try:
-        student_module = StudentModule.objects.get(
-            student=user,
-            course_id=course_id,
-            module_state_key=problem_descriptor.location
-        )
-    except StudentModule.DoesNotExist:
+    if student_module_scores is not None:
         student_module = None
+        stored_grade, stored_max_grade = student_module_scores.get(
+            _module_state_key(problem_descriptor.location), (None, None)
+        )
+    else:
+        try:
+            student_module = StudentModule.objects.get(
+                student=user,
+                course_id=course_id,
+                module_state_key=problem_descriptor.location
+            )
+        except StudentModule.DoesNotExist:
+            student_module = None
+            stored_grade, stored_max_grade = None, None
+        else:
+            stored_grade, stored_max_grade = student_module.grade, student_module.max_grade
 
-    if student_module is not None and student_module.max_grade is not None:
-        correct = student_module.grade if student_module.grade is not None else 0
-        total = student_module.max_grade
+    use_max_scores_cache = max_scores_cache is not None and settings.FEATURES.get('ENABLE_MAX_SCORE_CACHE')
+    # Only look the max score up when the student module hasn't got it, as it's a cache read
+    if stored_max_grade is None and use_max_scores_cache:
+        cached_max_score = max_scores_cache.get(problem_descriptor)
+    else:
+        cached_max_score = None
+
+    if stored_max_grade is not None:
+        correct = stored_grade if stored_grade is not None else 0
+        total = stored_max_grade
+    elif cached_max_score is not None:
+        # We don't have a real score, but we know what the problem is worth. Problems
+        # the user can't load aren't counted, as when module_creator returns None for them.
+        if getattr(user, 'known', True) and not has_access(user, 'load', problem_descriptor, course_id):
+            return (None, None)
+        correct = 0.0
+        total = cached_max_score
     else:
         # If the problem was not in the cache, or hasn't been graded yet,
         # we need to instantiate the problem.
@@ -475,11 +605,17 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
         if total is None:
             return (None, None)
 
+        if use_max_scores_cache:
+            max_scores_cache.set(problem_descriptor, total)
+
     # Now we re-weight the problem, if specified
     weight = problem_descriptor.weight
     if weight is not None:
         if total == 0:
-            log.exception("Cannot reweight a problem with zero total points. Problem: " + str(student_module))
+            log.exception(
+                "Cannot reweight a problem with zero total points. Problem: " +
+                str(student_module or problem_descriptor.location)
+            )
             return (correct, total)
         correct = correct * weight / total
         total = weight
@@ -500,7 +636,21 @@ def manual_transaction():
         transaction.commit()
 
 
-def iterate_grades_for(course_id, students):
+def _chunks(iterable, chunk_size):
+    """
+    Yield successive lists of at most `chunk_size` items from `iterable`.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iterate_grades_for(course_id, students, chunk_size=None):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
     (student, gradeset, err_msg) for every student enrolled in the course.
@@ -508,6 +658,12 @@ def iterate_grades_for(course_id, students):
     If an error occurred, gradeset will be an empty dict and err_msg will be an
     exception message. If there was no error, err_msg is an empty string.
 
+    Students are graded in chunks of `chunk_size` (defaulting to
+    settings.GRADES_BATCH_SIZE). The StudentModule grades of a whole chunk
+    are fetched with a single query, and every student in the chunk is then
+    graded from that in-memory table; the results are the same as calling
+    `grade` for each student individually.
+
     The gradeset is a dictionary with the following fields:
 
     - grade : A final letter grade.
@@ -519,31 +675,41 @@ def iterate_grades_for(course_id, students):
     - raw_scores: contains scores for every graded module
     """
     course = courses.get_course_by_id(course_id)
+    if chunk_size is None:
+        chunk_size = settings.GRADES_BATCH_SIZE
 
     # We make a fake request because grading code expects to be able to look at
     # the request. We have to attach the correct user to the request before
     # grading that student.
     request = RequestFactory().get('/')
-
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course_id)]):
-            try:
-                request.user = student
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course)
-                yield student, gradeset, ""
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course_id,
-                    exc.message
-                )
-                yield student, {}, exc.message
+    max_scores_cache = MaxScoresCache()
+
+    for student_chunk in _chunks(students, chunk_size):
+        with dog_stats_api.timer('lms.grades.iterate_grades_for.bulk_load', tags=[u'action:{}'.format(course_id)]):
+            chunk_scores = student_module_scores_for(course_id, [student.id for student in student_chunk])
+
+        for student in student_chunk:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course_id)]):
+                try:
+                    request.user = student
+                    # Grading calls problem rendering, which calls masquerading,
+                    # which checks session vars -- thus the empty session dict below.
+                    # It's not pretty, but untangling that is currently beyond the
+                    # scope of this feature.
+                    request.session = {}
+                    gradeset = grade(
+                        student, request, course,
+                        student_module_scores=chunk_scores[student.id], max_scores_cache=max_scores_cache
+                    )
+                    yield student, gradeset, ""
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Keep marching on even if this student couldn't be graded for
+                    # some reason, but log it for future reference.
+                    log.exception(
+                        'Cannot grade student %s (%s) in course %s because of exception: %s',
+                        student.username,
+                        student.id,
+                        course_id,
+                        exc.message
+                    )
+                    yield student, {}, exc.message
@@ -17,8 +17,10 @@ from django.core.urlresolvers import reverse
 from django.http import Http404, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from capa.safe_exec import SafeExecCache
 from capa.xqueue_interface import XQueueInterface
 from courseware.access import has_access, get_user_role
+from courseware.course_outline import get_course_outline, get_due_dates, OutlineItem
 from courseware.masquerade import setup_masquerade
 from courseware.model_data import FieldDataCache, DjangoKeyValueStore
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
@@ -69,6 +71,11 @@ XQUEUE_INTERFACE = XQueueInterface(
     REQUESTS_AUTH,
 )
 
+# Results of the python code run by capa problems, kept in this process in
+# front of the shared cache, so that e.g. checking a popular problem with the
+# same seed and answer doesn't run the code in the sandbox again.
+SAFE_EXEC_CACHE = SafeExecCache(cache)
+
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
 # coupled enough that it's kind of tricky--you've been warned!
@@ -114,10 +121,15 @@ def toc_for_course(request, course, active_chapter, active_section, field_data_c
     NOTE: assumes that if we got this far, user has access to course.  Returns
     None if this is not the case.
 
-    field_data_cache must include data from the course module and 2 levels of its descendents
+    field_data_cache must include data from the course module and 2 levels of its descendents.
+    It's only used if the table of contents can't be made from the course's outline.
     '''
 
     with modulestore().bulk_operations(course.id):
+        outline = get_course_outline(course)
+        if outline is not None:
+            return _toc_from_outline(request.user, course, outline, active_chapter, active_section)
+
         course_module = get_module_for_descriptor(request.user, request, course, field_data_cache, course.id)
         if course_module is None:
             return None
@@ -149,6 +161,47 @@ def toc_for_course(request, course, active_chapter, active_section, field_data_c
         return chapters
 
 
+def _toc_from_outline(user, course, outline, active_chapter, active_section):
+    """
+    Create the table of contents returned by `toc_for_course` from the course's
+    outline, without loading the chapters and sections or the user's modules.
+    """
+    if not has_access(user, 'load', course, course.id):
+        return None
+
+    due_dates = get_due_dates(user, course.id, outline)
+
+    def can_load(item):
+        """
+        Whether the user can load the module of the outline item `item`.
+        """
+        return has_access(user, 'load', OutlineItem(item), course.id)
+
+    chapters = list()
+    for chapter in outline:
+        if not can_load(chapter):
+            continue
+
+        sections = list()
+        for section in chapter['sections']:
+            if not can_load(section):
+                continue
+            sections.append({'display_name': section['display_name'],
+                             'url_name': section['url_name'],
+                             'format': section['format'],
+                             'due': due_dates[section['location']],
+                             'active': (chapter['url_name'] == active_chapter and
+                                        section['url_name'] == active_section),
+                             'graded': section['graded'],
+                             })
+
+        chapters.append({'display_name': chapter['display_name'],
+                         'url_name': chapter['url_name'],
+                         'sections': sections,
+                         'active': chapter['url_name'] == active_chapter})
+    return chapters
+
+
 def get_module(user, request, usage_key, field_data_cache,
                position=None, log_if_not_found=True, wrap_xmodule_display=True,
                grade_bucket_type=None, depth=0,
@@ -535,7 +588,7 @@ def get_module_system_for_user(user, field_data_cache,
         course_id=course_id,
         open_ended_grading_interface=open_ended_grading_interface,
         s3_interface=s3_interface,
-        cache=cache,
+        cache=SAFE_EXEC_CACHE,
         can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_id)),
         get_python_lib_zip=(lambda: get_python_lib_zip(contentstore, course_id)),
         # TODO: When we merge the descriptor and module systems, we can stop reaching into the mixologist (cpennington)
@@ -7,6 +7,8 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 import courseware.access as access
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
+from request_cache.middleware import RequestCache
+from student.roles import CourseStaffRole
 from student.tests.factories import AnonymousUserFactory, CourseEnrollmentAllowedFactory
 from xmodule.course_module import (
     CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT,
@@ -75,6 +77,27 @@ class AccessTestCase(TestCase):
             self.student, 'instructor', self.course.course_key
         ))
 
+    def test_memoized_for_request(self):
+        RequestCache().process_request(Mock())
+        self.addCleanup(RequestCache().clear_request_cache)
+        course_key = self.course.course_key
+        with patch('courseware.access._has_access', wraps=access._has_access) as mock_has_access:
+            self.assertFalse(access.has_access(self.student, 'staff', course_key))
+            self.assertFalse(access.has_access(self.student, 'staff', course_key))
+            self.assertEqual(mock_has_access.call_count, 1)
+            self.assertEqual(access.access_check_counts(), {'hits': 1, 'misses': 1})
+
+            # Giving the user a role forgets the checks made without it
+            CourseStaffRole(course_key).add_users(self.student)
+            self.assertTrue(access.has_access(self.student, 'staff', course_key))
+            self.assertEqual(mock_has_access.call_count, 2)
+
+    def test_not_memoized_outside_request(self):
+        with patch('courseware.access._has_access', wraps=access._has_access) as mock_has_access:
+            access.has_access(self.student, 'staff', self.course.course_key)
+            access.has_access(self.student, 'staff', self.course.course_key)
+            self.assertEqual(mock_has_access.call_count, 2)
+
     def test__has_access_string(self):
         user = Mock(is_staff=True)
         self.assertFalse(access._has_access_string(user, 'staff', 'not_global', self.course.course_key))
@@ -0,0 +1,157 @@
+"""
+Tests of the course outline used for the courseware's table of contents.
+"""
+import json
+from datetime import datetime, timedelta
+
+import ddt
+from django.core.cache import get_cache
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import patch
+from pytz import UTC
+
+from courseware import course_outline
+from courseware import module_render as render
+from courseware.model_data import FieldDataCache
+from courseware.tests.factories import StaffFactory, StudentModuleFactory, UserFactory
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, TEST_DATA_MOCK_MODULESTORE
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+@ddt.ddt
+@override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
+class TestTocFromOutline(ModuleStoreTestCase):
+    """
+    Tests of the table of contents made from a course outline.
+    """
+    def setUp(self):
+        super(TestTocFromOutline, self).setUp()
+        self.due = datetime(2014, 10, 1, tzinfo=UTC)
+
+    def create_course(self, store_type):
+        """
+        Create a course with a chapter of sections, some of which aren't visible to students.
+        """
+        with self.store.default_store(store_type):
+            self.course = CourseFactory.create()
+            self.chapter = ItemFactory.create(parent=self.course, category='chapter', display_name='Chapter')
+            self.section = ItemFactory.create(
+                parent=self.chapter, category='sequential', display_name='Section', due=self.due, format='Homework',
+            )
+            ItemFactory.create(
+                parent=self.chapter, category='sequential', display_name='Staff Only', visible_to_staff_only=True,
+            )
+            ItemFactory.create(
+                parent=self.chapter, category='sequential', display_name='Not Started',
+                start=datetime.now(UTC) + timedelta(days=10),
+            )
+            ItemFactory.create(
+                parent=self.chapter, category='sequential', display_name='Hidden', hide_from_toc=True,
+            )
+
+    def toc(self, user):
+        """
+        Return the table of contents of the course for `user`, made from the
+        outline and from the user's modules.
+        """
+        request = RequestFactory().get('dummy_url')
+        request.user = user
+        course = modulestore().get_course(self.course.id, depth=2)
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course.id, user, course, depth=2)
+        from_outline = render.toc_for_course(request, course, 'Chapter', None, field_data_cache)
+        with patch('courseware.module_render.get_course_outline', return_value=None):
+            from_modules = render.toc_for_course(request, course, 'Chapter', None, field_data_cache)
+        return from_outline, from_modules
+
+    def section_names(self, toc):
+        """
+        Return the names of the sections in the first chapter of `toc`.
+        """
+        return [section['display_name'] for section in toc[0]['sections']]
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_student(self, store_type):
+        self.create_course(store_type)
+        from_outline, from_modules = self.toc(UserFactory.create())
+        self.assertEqual(from_outline, from_modules)
+        self.assertEqual(self.section_names(from_outline), ['Section'])
+        self.assertEqual(from_outline[0]['sections'][0]['format'], 'Homework')
+        self.assertEqual(from_outline[0]['sections'][0]['due'], self.due)
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_staff(self, store_type):
+        self.create_course(store_type)
+        from_outline, from_modules = self.toc(StaffFactory.create(course_key=self.course.id))
+        self.assertEqual(from_outline, from_modules)
+        self.assertEqual(self.section_names(from_outline), ['Section', 'Staff Only', 'Not Started'])
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_extended_due_date(self, store_type):
+        self.create_course(store_type)
+        user = UserFactory.create()
+        extended_due = self.due + timedelta(days=7)
+        StudentModuleFactory.create(
+            student=user,
+            course_id=self.course.id,
+            module_state_key=self.section.location,
+            state=json.dumps({'extended_due': extended_due.strftime('%Y-%m-%dT%H:%M:%SZ')}),
+        )
+        from_outline, from_modules = self.toc(user)
+        self.assertEqual(from_outline, from_modules)
+        self.assertEqual(from_outline[0]['sections'][0]['due'], extended_due)
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_due_dates_single_query(self, store_type):
+        self.create_course(store_type)
+        user = UserFactory.create()
+        extended_due = self.due + timedelta(days=7)
+        StudentModuleFactory.create(
+            student=user,
+            course_id=self.course.id,
+            module_state_key=self.section.location,
+            state=json.dumps({'extended_due': extended_due.strftime('%Y-%m-%dT%H:%M:%SZ')}),
+        )
+        course = modulestore().get_course(self.course.id)
+        outline = course_outline.get_course_outline(course)
+        with self.assertNumQueries(1):
+            due_dates = course_outline.get_due_dates(user, course.id, outline)
+        sections = outline[0]['sections']
+        self.assertEqual(due_dates[sections[0]['location']], extended_due)
+        self.assertEqual(due_dates[sections[1]['location']], None)
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_cached_outline_not_walked(self, store_type):
+        self.create_course(store_type)
+        user = UserFactory.create()
+        request = RequestFactory().get('dummy_url')
+        request.user = user
+        with patch.object(course_outline, 'cache', get_cache('default')):
+            self.toc(user)
+
+            # Once the outline is cached, the course's chapters and sections aren't needed
+            course = modulestore().get_course(self.course.id)
+            with patch.object(course, 'get_children', side_effect=AssertionError):
+                from_outline = render.toc_for_course(request, course, 'Chapter', None, None)
+        self.assertEqual(self.section_names(from_outline), ['Section'])
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_outline_cached_for_version(self, store_type):
+        self.create_course(store_type)
+        user = UserFactory.create()
+        with patch.object(course_outline, 'cache', get_cache('default')):
+            with patch.object(course_outline, '_make_outline', wraps=course_outline._make_outline) as mock_make:
+                self.toc(user)
+                self.toc(user)
+                self.assertEqual(mock_make.call_count, 1)
+
+                # A new version of the course gets a new outline
+                ItemFactory.create(parent_location=self.chapter.location, category='sequential', display_name='New')
+                from_outline, __ = self.toc(user)
+                self.assertEqual(mock_make.call_count, 2)
+                self.assertIn('New', self.section_names(from_outline))
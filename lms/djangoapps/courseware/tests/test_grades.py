@@ -1,19 +1,26 @@
 """
 Test grade calculation.
 """
+from django.core.cache import cache
 from django.http import Http404
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
-from mock import patch
+from mock import patch, Mock
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
-from courseware.grades import grade, iterate_grades_for
+from courseware.grades import (
+    grade, get_score, iterate_grades_for, student_module_scores_for, MaxScoresCache
+)
+from courseware.tests.factories import StudentModuleFactory
+from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MOCK_MODULESTORE
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
-def _grade_with_errors(student, request, course, keep_raw_scores=False):
+def _grade_with_errors(student, request, course, keep_raw_scores=False, student_module_scores=None,
+                       max_scores_cache=None):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -24,7 +31,10 @@ def _grade_with_errors(student, request, course, keep_raw_scores=False):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grade(student, request, course, keep_raw_scores=keep_raw_scores)
+    return grade(
+        student, request, course, keep_raw_scores=keep_raw_scores,
+        student_module_scores=student_module_scores, max_scores_cache=max_scores_cache
+    )
 
 
 @override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
@@ -105,6 +115,46 @@ class TestGradeIteration(ModuleStoreTestCase):
         self.assertTrue(all_gradesets[student2])
         self.assertTrue(all_gradesets[student5])
 
+    def test_chunked_grades_match_individual_grades(self):
+        """Grading in bulk-loaded chunks gives the same gradesets as grading
+        each student on their own."""
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        sequential = ItemFactory.create(
+            parent=chapter, category='sequential', metadata={'graded': True, 'format': 'Homework'}
+        )
+        vertical = ItemFactory.create(parent=sequential, category='vertical')
+        problems = [ItemFactory.create(parent=vertical, category='problem') for __ in range(2)]
+        self.course = modulestore().get_course(self.course.id)
+
+        student1, student2 = self.students[:2]
+        StudentModuleFactory.create(
+            student=student1, course_id=self.course.id, module_state_key=problems[0].location,
+            grade=1, max_grade=1
+        )
+        StudentModuleFactory.create(
+            student=student2, course_id=self.course.id, module_state_key=problems[1].location,
+            grade=0, max_grade=1
+        )
+
+        request = RequestFactory().get('/')
+        request.session = {}
+        for chunk_size in (1, 2, len(self.students)):
+            for student, gradeset, err_msg in iterate_grades_for(self.course.id, self.students, chunk_size):
+                self.assertEqual(err_msg, "")
+                request.user = student
+                self.assertEqual(gradeset, grade(student, request, self.course))
+
+    def test_student_module_scores_for(self):
+        """All of a chunk's StudentModule grades are loaded, keyed by student."""
+        problem = ItemFactory.create(parent=self.course, category='problem')
+        StudentModuleFactory.create(
+            student=self.students[0], course_id=self.course.id, module_state_key=problem.location,
+            grade=2, max_grade=3
+        )
+        scores = student_module_scores_for(self.course.id, [self.students[0].id, self.students[1].id])
+        self.assertEqual(scores[self.students[0].id], {unicode(problem.location): (2, 3)})
+        self.assertEqual(scores[self.students[1].id], {})
+
     ################################# Helpers #################################
     def _gradesets_and_errors_for(self, course_id, students):
         """Simple helper method to iterate through student grades and give us
@@ -120,3 +170,69 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+@override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
+class TestMaxScoresCache(ModuleStoreTestCase):
+    """
+    Test the cache of problem max scores used when a student hasn't been graded.
+    """
+    def setUp(self):
+        super(TestMaxScoresCache, self).setUp()
+        cache.clear()
+        self.course = CourseFactory.create()
+        self.problem = ItemFactory.create(parent=self.course, category='problem', data='<problem></problem>')
+        self.student = UserFactory.create()
+
+    def test_shared_between_instances(self):
+        self.assertIsNone(MaxScoresCache().get(self.problem))
+        MaxScoresCache().set(self.problem, 3)
+        self.assertEqual(MaxScoresCache().get(self.problem), 3)
+
+    def test_content_change_invalidates(self):
+        MaxScoresCache().set(self.problem, 3)
+        self.problem.data = '<problem><p>Edited</p></problem>'
+        self.assertIsNone(MaxScoresCache().get(self.problem))
+
+    def test_get_score_fills_and_uses_cache(self):
+        max_scores_cache = MaxScoresCache()
+        module_creator = Mock(return_value=Mock(max_score=Mock(return_value=4)))
+        score = get_score(self.course.id, self.student, self.problem, module_creator, max_scores_cache=max_scores_cache)
+        self.assertEqual(score, (0.0, 4))
+        self.assertEqual(module_creator.call_count, 1)
+
+        # A second lookup, even from another process, doesn't need the problem
+        module_creator.reset_mock()
+        score = get_score(self.course.id, self.student, self.problem, module_creator, max_scores_cache=MaxScoresCache())
+        self.assertEqual(score, (0.0, 4))
+        self.assertFalse(module_creator.called)
+
+    def test_cached_max_score_needs_access(self):
+        # A staff-only problem isn't counted for a student, whose module_creator returns None for it
+        staff_only_problem = ItemFactory.create(
+            parent=self.course, category='problem', data='<problem></problem>', visible_to_staff_only=True
+        )
+        MaxScoresCache().set(staff_only_problem, 3)
+        module_creator = Mock(return_value=None)
+        score = get_score(
+            self.course.id, self.student, staff_only_problem, module_creator, max_scores_cache=MaxScoresCache()
+        )
+        self.assertEqual(score, (None, None))
+
+    def test_not_read_for_graded_problem(self):
+        StudentModuleFactory.create(
+            student=self.student, course_id=self.course.id, module_state_key=self.problem.location,
+            grade=1, max_grade=2
+        )
+        max_scores_cache = Mock(spec=MaxScoresCache)
+        score = get_score(self.course.id, self.student, self.problem, Mock(), max_scores_cache=max_scores_cache)
+        self.assertEqual(score, (1, 2))
+        self.assertFalse(max_scores_cache.get.called)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_MAX_SCORE_CACHE': False})
+    def test_disabled(self):
+        MaxScoresCache().set(self.problem, 3)
+        module_creator = Mock(return_value=Mock(max_score=Mock(return_value=4)))
+        score = get_score(self.course.id, self.student, self.problem, module_creator, max_scores_cache=MaxScoresCache())
+        self.assertEqual(score, (0.0, 4))
+        self.assertTrue(module_creator.called)
@@ -626,6 +626,72 @@ class TestHtmlModifiers(ModuleStoreTestCase):
         )
 
 
+@override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
+class TestLazySequenceRendering(ModuleStoreTestCase):
+    """
+    Tests of rendering only the current unit of a sequence.
+    """
+    def setUp(self):
+        super(TestLazySequenceRendering, self).setUp()
+        self.user = UserFactory.create()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.sequence = ItemFactory.create(parent=chapter, category='sequential')
+        for index in range(3):
+            vertical = ItemFactory.create(parent=self.sequence, category='vertical')
+            ItemFactory.create(parent=vertical, category='html', data='<p>Content of unit {}</p>'.format(index + 1))
+
+    def render_sequence(self):
+        """
+        Render the sequence's student view at the second position.
+        """
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, self.user, self.sequence)
+        module = render.get_module(self.user, self.request, self.sequence.location, field_data_cache, position=2)
+        return module.render(STUDENT_VIEW).content
+
+    def test_all_units_rendered(self):
+        content = self.render_sequence()
+        for index in range(3):
+            self.assertIn('Content of unit {}'.format(index + 1), content)
+
+    @patch.dict(settings.FEATURES, {'ENABLE_LAZY_SEQUENCE_RENDERING': True})
+    def test_current_unit_rendered(self):
+        content = self.render_sequence()
+        self.assertNotIn('Content of unit 1', content)
+        self.assertIn('Content of unit 2', content)
+        self.assertNotIn('Content of unit 3', content)
+        self.assertEqual(content.count('data-lazy="true"'), 2)
+
+    @patch.dict(settings.FEATURES, {'ENABLE_LAZY_SEQUENCE_RENDERING': True})
+    def test_render_position(self):
+        request = RequestFactory().post('dummy_url', data={'position': 3})
+        request.user = self.user
+        request.session = {}
+        response = render.handle_xblock_callback(
+            request,
+            self.course.id.to_deprecated_string(),
+            quote_slashes(self.sequence.location.to_deprecated_string()),
+            'xmodule_handler',
+            'render_position',
+        )
+        self.assertIn('Content of unit 3', json.loads(response.content)['html'])
+
+        request = RequestFactory().post('dummy_url', data={'position': 4})
+        request.user = self.user
+        request.session = {}
+        with self.assertRaises(Http404):
+            render.handle_xblock_callback(
+                request,
+                self.course.id.to_deprecated_string(),
+                quote_slashes(self.sequence.location.to_deprecated_string()),
+                'xmodule_handler',
+                'render_position',
+            )
+
+
 class ViewInStudioTest(ModuleStoreTestCase):
     """Tests for the 'View in Studio' link visiblity."""
 
@@ -197,10 +197,13 @@ def forum_form_discussion(request, course_key):
     course_settings = make_course_settings(course)
 
     user = cc.User.from_django_user(request.user)
-    user_info = user.to_dict()
 
     try:
-        unsafethreads, query_params = get_threads(request, course_key)   # This might process a search query
+        # This might process a search query
+        (unsafethreads, query_params), user_info = cc.utils.perform_concurrently(
+            lambda: get_threads(request, course_key),
+            user.to_dict,
+        )
         is_staff = cached_has_permission(request.user, 'openclose_thread', course.id)
         threads = [utils.prepare_content(thread, course_key, is_staff) for thread in unsafethreads]
     except cc.utils.CommentClientMaintenanceError:
@@ -264,18 +267,22 @@ def single_thread(request, course_key, discussion_id, thread_id):
     course = get_course_with_access(request.user, 'load_forum', course_key)
     course_settings = make_course_settings(course)
     cc_user = cc.User.from_django_user(request.user)
-    user_info = cc_user.to_dict()
     is_moderator = cached_has_permission(request.user, "see_all_cohorts", course_key)
 
     # Currently, the front end always loads responses via AJAX, even for this
     # page; it would be a nice optimization to avoid that extra round trip to
     # the comments service.
+    thread = cc.Thread.find(thread_id)
+    retrieve_params = {
+        'recursive': request.is_ajax(),
+        'user_id': request.user.id,
+        'response_skip': request.GET.get("resp_skip"),
+        'response_limit': request.GET.get("resp_limit"),
+    }
     try:
-        thread = cc.Thread.find(thread_id).retrieve(
-            recursive=request.is_ajax(),
-            user_id=request.user.id,
-            response_skip=request.GET.get("resp_skip"),
-            response_limit=request.GET.get("resp_limit")
+        user_info, thread = cc.utils.perform_concurrently(
+            cc_user.to_dict,
+            lambda: thread.retrieve(**retrieve_params),
         )
     except cc.utils.CommentClientRequestError as e:
         if e.status_code == 404:
@@ -377,10 +384,12 @@ def user_profile(request, course_key, user_id):
         else:
             profiled_user = cc.User(id=user_id, course_id=course_key)
 
-        threads, page, num_pages = profiled_user.active_threads(query_params)
+        (threads, page, num_pages), user_info = cc.utils.perform_concurrently(
+            lambda: profiled_user.active_threads(query_params),
+            cc.User.from_django_user(request.user).to_dict,
+        )
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
@@ -1,20 +1,30 @@
 # -*- coding: utf-8 -*-
 from datetime import datetime
+import httplib
 import json
+from StringIO import StringIO
+import threading
 from pytz import UTC
 
+import ddt
+from django.core.cache import get_cache
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 from django.test.utils import override_settings
+from django.utils import translation
 from edxmako import add_lookup
 import mock
+import requests
 
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MOCK_MODULESTORE
 from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 import django_comment_client.utils as utils
+import lms.lib.comment_client as cc
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
@@ -144,6 +154,7 @@ class CoursewareContextTestCase(ModuleStoreTestCase):
         assertThreadCorrect(threads[1], self.discussion2, "Subsection / Discussion 2")
 
 
+@ddt.ddt
 @override_settings(MODULESTORE=TEST_DATA_MOCK_MODULESTORE)
 class CategoryMapTestCase(ModuleStoreTestCase):
     """
@@ -616,6 +627,35 @@ class CategoryMapTestCase(ModuleStoreTestCase):
             ["Topic_A", "Topic_B", "Topic_C", "discussion1", "discussion2", "discussion3"]
         )
 
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_maps_cached_for_version(self, store_type):
+        with self.store.default_store(store_type):
+            course = CourseFactory.create(start=datetime(2012, 2, 3, tzinfo=UTC), discussion_topics={})
+            ItemFactory.create(
+                parent=course, category="discussion", discussion_id="discussion1",
+                discussion_category="Chapter", discussion_target="Discussion 1",
+            )
+
+        with mock.patch.object(utils, 'cache', get_cache('default')):
+            with mock.patch.object(
+                utils, '_get_discussion_modules', wraps=utils._get_discussion_modules  # pylint: disable=protected-access
+            ) as mock_get_modules:
+                course = modulestore().get_course(course.id)
+                utils.get_discussion_category_map(course)
+                utils.get_discussion_id_map(course)
+                self.assertEqual(utils.get_discussion_categories_ids(course), ["discussion1"])
+                self.assertEqual(mock_get_modules.call_count, 1)
+
+                # A new version of the course gets new maps
+                ItemFactory.create(
+                    parent_location=course.location, category="discussion", discussion_id="discussion2",
+                    discussion_category="Chapter", discussion_target="Discussion 2",
+                )
+                course = modulestore().get_course(course.id)
+                self.assertItemsEqual(utils.get_discussion_categories_ids(course), ["discussion1", "discussion2"])
+                self.assertIn("discussion2", utils.get_discussion_id_map(course))
+                self.assertEqual(mock_get_modules.call_count, 2)
+
 
 class JsonResponseTestCase(TestCase, UnicodeTestMixin):
     def _test_unicode_data(self, text):
@@ -636,3 +676,59 @@ class RenderMustacheTests(TestCase):
         """
         add_lookup('main', '', package=__name__)
         self.assertEqual(utils.render_mustache('test.mustache', {}), 'Testing 1 2 3.\n')
+
+
+@override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=True)
+class PerformConcurrentlyTestCase(TestCase):
+    """
+    Test the `perform_concurrently` utility function of the comments client.
+    """
+    def test_concurrent(self):
+        started = threading.Event()
+
+        def wait_for_other():
+            return started.wait(5)
+
+        def start():
+            started.set()
+            return 'started'
+
+        # the first function would time out if the second weren't called at the same time
+        self.assertEqual(cc.utils.perform_concurrently(wait_for_other, start), [True, 'started'])
+
+    def test_first_error_raised(self):
+        def raise_error(message):
+            raise cc.utils.CommentClientRequestError(message, 404)
+
+        with self.assertRaisesRegexp(cc.utils.CommentClientRequestError, 'second'):
+            cc.utils.perform_concurrently(
+                lambda: 'first', lambda: raise_error('second'), lambda: raise_error('third')
+            )
+
+    def test_language(self):
+        with translation.override('eo'):
+            self.assertEqual(
+                cc.utils.perform_concurrently(translation.get_language, translation.get_language),
+                ['eo', 'eo']
+            )
+
+    @override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=False)
+    def test_not_concurrent(self):
+        self.assertEqual(
+            cc.utils.perform_concurrently(threading.current_thread, threading.current_thread),
+            [threading.current_thread()] * 2
+        )
+
+
+class MakeSessionTestCase(TestCase):
+    """
+    Test the session the comments client shares between requests.
+    """
+    def test_cookies_not_stored(self):
+        session = cc.utils.make_session()
+        request = requests.Request('GET', 'http://localhost:4567/api/v1/threads').prepare()
+        headers = httplib.HTTPMessage(StringIO('Set-Cookie: sessionid=secret; Path=/\r\n\r\n'))
+        requests.cookies.extract_cookies_to_jar(
+            session.cookies, request, mock.Mock(_original_response=mock.Mock(msg=headers))
+        )
+        self.assertEqual(len(session.cookies), 0)
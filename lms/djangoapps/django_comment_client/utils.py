@@ -11,6 +11,7 @@ from django.http import HttpResponse
 from django.utils import simplejson
 from django.utils.timezone import UTC
 
+from courseware.course_outline import get_course_version
 from django_comment_common.models import Role, FORUM_ROLE_STUDENT
 from django_comment_client.permissions import check_permissions_by_view, cached_has_permission
 
@@ -21,6 +22,7 @@ from openedx.core.djangoapps.course_groups.cohorts import get_cohort_by_id, get_
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from opaque_keys.edx.locations import i4xEncoder
 from opaque_keys.edx.keys import CourseKey
+from util.cache import cache
 from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
@@ -72,14 +74,41 @@ def _get_discussion_modules(course):
     return filter(has_required_keys, all_modules)
 
 
+def _get_discussion_maps(course):
+    """
+    Returns a dict of the discussion id map and the unfiltered, sorted category map of the
+    course, which are the same for every request and so are cached for each version of
+    the course (see `get_course_version`) by modulestores that keep track of it.
+    """
+    version = get_course_version(course)
+    cache_key = u'discussion_maps.{}.{}'.format(course.id, version)
+    if version is not None:
+        maps = cache.get(cache_key)
+        if maps is not None:
+            return maps
+
+    modules = _get_discussion_modules(course)
+    maps = {
+        'id_map': _make_discussion_id_map(modules),
+        'category_map': _make_discussion_category_map(course, modules),
+    }
+    if version is not None:
+        cache.set(cache_key, maps)
+    return maps
+
+
 def get_discussion_id_map(course):
+    return _get_discussion_maps(course)['id_map']
+
+
+def _make_discussion_id_map(modules):
     def get_entry(module):
         discussion_id = module.discussion_id
         title = module.discussion_target
         last_category = module.discussion_category.split("/")[-1].strip()
         return (discussion_id, {"location": module.location, "title": last_category + " / " + title})
 
-    return dict(map(get_entry, _get_discussion_modules(course)))
+    return dict(map(get_entry, modules))
 
 
 def _filter_unstarted_categories(category_map):
@@ -133,11 +162,11 @@ def _sort_map_entries(category_map, sort_alpha):
 
 
 def get_discussion_category_map(course):
-    course_id = course.id
+    return _filter_unstarted_categories(_get_discussion_maps(course)['category_map'])
 
-    unexpanded_category_map = defaultdict(list)
 
-    modules = _get_discussion_modules(course)
+def _make_discussion_category_map(course, modules):
+    unexpanded_category_map = defaultdict(list)
 
     is_course_cohorted = course.is_cohorted
     cohorted_discussion_ids = course.cohorted_discussions
@@ -200,7 +229,7 @@ def get_discussion_category_map(course):
 
     _sort_map_entries(category_map, course.discussion_sort_alpha)
 
-    return _filter_unstarted_categories(category_map)
+    return category_map
 
 
 def get_discussion_categories_ids(course):
@@ -12,6 +12,7 @@ from django.db.models import Q
 from django.contrib.auth.models import User
 import xmodule.graders as xmgraders
 from django.core.exceptions import ObjectDoesNotExist
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 
 
 STUDENT_FEATURES = ('id', 'username', 'first_name', 'last_name', 'is_staff', 'email')
@@ -153,6 +154,14 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features):
+    """
+    Generate the same dictionaries as `enrolled_students_features`, one
+    student at a time, without loading all the enrolled students in memory.
+    """
     include_cohort_column = 'cohort' in features
 
     students = User.objects.filter(
@@ -161,7 +170,15 @@ def enrolled_students_features(course_key, features):
     ).order_by('username').select_related('profile')
 
     if include_cohort_column:
-        students = students.prefetch_related('course_groups')
+        # `iterator()` ignores prefetch_related(), so look up the cohort of
+        # every student in the course with one query instead.
+        cohort_names = dict(
+            CourseUserGroup.objects.filter(
+                course_id=course_key,
+                group_type=CourseUserGroup.COHORT,
+                users__isnull=False,
+            ).values_list('users', 'name')
+        )
 
     def extract_student(student, features):
         """ convert student to dictionary """
@@ -191,16 +208,11 @@ def enrolled_students_features(course_key, features):
                 student_dict[meta_feature] = meta_dict.get(meta_key)
 
         if include_cohort_column:
-            # Note that we use student.course_groups.all() here instead of
-            # student.course_groups.filter(). The latter creates a fresh query,
-            # therefore negating the performance gain from prefetch_related().
-            student_dict['cohort'] = next(
-                (cohort.name for cohort in student.course_groups.all() if cohort.course_id == course_key),
-                "[unassigned]"
-            )
+            student_dict['cohort'] = cohort_names.get(student.id, "[unassigned]")
         return student_dict
 
-    return [extract_student(student, features) for student in students]
+    for student in students.iterator():
+        yield extract_student(student, features)
 
 
 def coupon_codes_features(features, coupons_list):
@@ -64,17 +64,26 @@ def format_dictlist(dictlist, features):
     }
     """
 
+    header = features
+    datarows = list(iter_dictlist_rows(dictlist, features))
+
+    return header, datarows
+
+
+def iter_dictlist_rows(dictlist, features):
+    """
+    Generate the datarows of `format_dictlist` one at a time, so that
+    `dictlist` can be any iterable of dictionaries, e.g. a generator.
+    """
     def dict_to_entry(dct):
         """ Convert dictionary to a list for a csv row """
         relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
+        ordered = sorted(relevant_items, key=lambda (k, v): features.index(k))
         vals = [v for (_, v) in ordered]
         return vals
 
-    header = features
-    datarows = map(dict_to_entry, dictlist)
-
-    return header, datarows
+    for dct in dictlist:
+        yield dict_to_entry(dct)
 
 
 def format_instances(instances, features):
@@ -95,9 +95,9 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
 
         query_features = ('username', 'cohort')
         # There should be a constant of 2 SQL queries when calling
-        # enrolled_students_features.  The first query comes from the call to
-        # User.objects.filter(...), and the second comes from
-        # prefetch_related('course_groups').
+        # enrolled_students_features.  The first query looks up the cohort
+        # of every student in the course, and the second comes from the call
+        # to User.objects.filter(...).
         with self.assertNumQueries(2):
             userreports = enrolled_students_features(course.id, query_features)
         self.assertEqual(len([r for r in userreports if r['username'] in cohorted_usernames]), len(cohorted_students))
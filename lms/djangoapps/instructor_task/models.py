@@ -14,8 +14,10 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 """
 from cStringIO import StringIO
 from gzip import GzipFile
+from tempfile import TemporaryFile
 from uuid import uuid4
 import csv
+import errno
 import json
 import hashlib
 import os.path
@@ -190,12 +192,88 @@ class InstructorTask(models.Model):
         return json.dumps({'message': 'Task revoked before running'})
 
 
+class ReportWriter(object):
+    """
+    Writes the rows of a CSV report to a `ReportStore` as they are produced,
+    rather than building the whole report in memory. Get one from
+    `ReportStore.open_writer()`.
+
+    The report only becomes visible in the store once the writer is closed, and
+    is discarded if the writer is aborted instead. Used as a context manager,
+    the writer is closed on success and aborted if an exception is raised.
+    """
+    def __init__(self, fileobj, gzip=False):
+        self._fileobj = fileobj
+        self._gzip_file = GzipFile(fileobj=fileobj, mode="wb") if gzip else None
+        self._csvwriter = csv.writer(self._gzip_file or fileobj)
+        self.closed = False
+
+    def writerow(self, row):
+        """
+        Append `row` (an iterable of unicode strings, or of anything
+        convertible to one) to the report.
+        """
+        self._csvwriter.writerow([unicode(item).encode('utf-8') for item in row])
+
+    def writerows(self, rows):
+        """
+        Append each row of `rows` to the report.
+        """
+        for row in rows:
+            self.writerow(row)
+
+    def close(self):
+        """
+        Finish writing the report, and make it visible in the store.
+        """
+        if self.closed:
+            return
+        try:
+            if self._gzip_file is not None:
+                self._gzip_file.close()
+            self._commit()
+        except Exception:
+            self.abort()
+            raise
+        self.closed = True
+
+    def abort(self):
+        """
+        Discard the report written so far.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._discard()
+
+    def _commit(self):
+        """
+        Subclasses should override this to publish the completed file.
+        """
+        raise NotImplementedError
+
+    def _discard(self):
+        """
+        Subclasses should override this to throw away the incomplete file.
+        """
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Reports can either be stored whole, with `store()` or
+    `store_rows()`, or be appended to row by row through a `ReportWriter`
+    returned by `open_writer()`, which avoids holding large reports in memory.
     """
     @classmethod
     def from_config(cls):
@@ -209,14 +287,49 @@ class ReportStore(object):
         elif storage_type.lower() == "localfs":
             return LocalFSReportStore.from_config()
 
-    def _get_utf8_encoded_rows(self, rows):
+    def open_writer(self, course_id, filename, gzip=None):
         """
-        Given a list of `rows` containing unicode strings, return a
-        new list of rows with those strings encoded as utf-8 for CSV
-        compatibility.
+        Return a `ReportWriter` to append the rows of the CSV file `filename`
+        for `course_id` to. Subclasses should override this.
         """
-        for row in rows:
-            yield [unicode(item).encode('utf-8') for item in row]
+        raise NotImplementedError
+
+    def store_rows(self, course_id, filename, rows):
+        """
+        Given a `course_id`, `filename`, and `rows` (each row is an iterable of
+        strings), write this data out. `rows` may be any iterable, including a
+        generator, as the rows are written as they are read.
+        """
+        with self.open_writer(course_id, filename) as writer:
+            writer.writerows(rows)
+
+    def _open_for_reading(self, course_id, filename):
+        """
+        Return a file object with the (decompressed) contents of the stored
+        file. Subclasses should override this.
+        """
+        raise NotImplementedError
+
+    def iter_rows(self, course_id, filename):
+        """
+        Yield the rows of the stored CSV file `filename` for `course_id`, as
+        lists of unicode strings. Files whose names start with a "." are not
+        listed by `links_for`, so can be used for intermediate results that
+        are read back with this.
+        """
+        report_file = self._open_for_reading(course_id, filename)
+        try:
+            for row in csv.reader(report_file):
+                yield [item.decode('utf-8') for item in row]
+        finally:
+            report_file.close()
+
+    def delete(self, course_id, filename):
+        """
+        Remove the stored file `filename` for `course_id`, if there is one.
+        Subclasses should override this.
+        """
+        raise NotImplementedError
 
 
 class S3ReportStore(ReportStore):
@@ -305,22 +418,24 @@ class S3ReportStore(ReportStore):
             }
         )
 
-    def store_rows(self, course_id, filename, rows):
+    def open_writer(self, course_id, filename, gzip=None):
         """
-        Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        Return an `S3ReportWriter` that uploads the csv file in parts as it is
+        written, gzip'd unless `gzip` is False. S3 only makes the file visible
+        once the last part is uploaded, when the writer is closed.
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
         """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
-
-        self.store(course_id, filename, output_buffer)
+        gzip = True if gzip is None else gzip
+        headers = {"Content-Type": "text/csv"}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        multipart_upload = self.bucket.initiate_multipart_upload(
+            self.key_for(course_id, filename).key,
+            headers=headers
+        )
+        return S3ReportWriter(multipart_upload, gzip=gzip)
 
     def links_for(self, course_id):
         """
@@ -331,8 +446,121 @@ class S3ReportStore(ReportStore):
         return [
             (key.key.split("/")[-1], key.generate_url(expires_in=300))
             for key in sorted(self.bucket.list(prefix=course_dir.key), reverse=True, key=lambda k: k.last_modified)
+            # skip intermediate files, see `iter_rows`
+            if not key.key.split("/")[-1].startswith('.')
         ]
 
+    def _open_for_reading(self, course_id, filename):
+        """
+        Download the file to a temporary file, which is read through gzip if
+        it was stored gzip'd.
+        """
+        key = self.bucket.get_key(self.key_for(course_id, filename).key)
+        if key is None:
+            raise IOError(u"No such report file: {}".format(filename))
+        temp_file = TemporaryFile()
+        key.get_contents_to_file(temp_file)
+        temp_file.seek(0)
+        if key.content_encoding == "gzip":
+            return GzipFile(fileobj=temp_file, mode="rb")
+        return temp_file
+
+    def delete(self, course_id, filename):
+        """
+        Remove the file's key from the bucket.
+        """
+        self.bucket.delete_key(self.key_for(course_id, filename).key)
+
+
+class S3PartUploader(object):
+    """
+    File-like object that buffers what is written to it, and uploads it to an
+    S3 multipart upload whenever `part_size` bytes have accumulated.
+    """
+    def __init__(self, multipart_upload, part_size):
+        self.multipart_upload = multipart_upload
+        self.part_size = part_size
+        self.part_num = 0
+        self.buff = StringIO()
+
+    def write(self, data):
+        """
+        Buffer `data`, uploading the buffer once it makes up a whole part.
+        """
+        self.buff.write(data)
+        if self.buff.tell() >= self.part_size:
+            self.upload_part()
+
+    def flush(self):
+        """
+        Parts are only uploaded once they're big enough, see `upload_part`.
+        """
+        pass
+
+    def upload_part(self):
+        """
+        Upload what has been buffered as the next part of the upload.
+        """
+        self.part_num += 1
+        self.buff.seek(0)
+        self.multipart_upload.upload_part_from_file(self.buff, self.part_num)
+        self.buff = StringIO()
+
+
+class S3ReportWriter(ReportWriter):
+    """
+    `ReportWriter` that streams the report to S3 as a multipart upload.
+    """
+    # S3 requires every part but the last to be at least 5MB
+    PART_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, multipart_upload, gzip=True):
+        self.multipart_upload = multipart_upload
+        self.uploader = S3PartUploader(multipart_upload, self.PART_SIZE)
+        super(S3ReportWriter, self).__init__(self.uploader, gzip=gzip)
+
+    def _commit(self):
+        """
+        Upload the remaining data as the last part and complete the upload.
+        """
+        if self.uploader.buff.tell() or self.uploader.part_num == 0:
+            self.uploader.upload_part()
+        self.multipart_upload.complete_upload()
+
+    def _discard(self):
+        """
+        Cancel the upload, so that S3 drops the parts already uploaded.
+        """
+        self.multipart_upload.cancel_upload()
+
+
+class LocalFSReportWriter(ReportWriter):
+    """
+    `ReportWriter` that writes the report to a temporary file next to its
+    final path, and renames it into place once it is complete.
+    """
+    def __init__(self, full_path, gzip=False):
+        self.full_path = full_path
+        self.temp_path = os.path.join(
+            os.path.dirname(full_path),
+            u".{}.{}.tmp".format(os.path.basename(full_path), uuid4().hex)
+        )
+        super(LocalFSReportWriter, self).__init__(open(self.temp_path, "wb"), gzip=gzip)
+
+    def _commit(self):
+        """
+        Move the complete file into place.
+        """
+        self._fileobj.close()
+        os.rename(self.temp_path, self.full_path)
+
+    def _discard(self):
+        """
+        Remove the incomplete file.
+        """
+        self._fileobj.close()
+        os.remove(self.temp_path)
+
 
 class LocalFSReportStore(ReportStore):
     """
@@ -378,24 +606,50 @@ class LocalFSReportStore(ReportStore):
         assumed to be a StringIO objecd (or anything that can flush its contents
         to string using `.getvalue()`).
         """
-        full_path = self.path_to(course_id, filename)
-        directory = os.path.dirname(full_path)
-        if not os.path.exists(directory):
-            os.mkdir(directory)
-
+        full_path = self._prepare_path(course_id, filename)
         with open(full_path, "wb") as f:
             f.write(buff.getvalue())
 
-    def store_rows(self, course_id, filename, rows):
+    def open_writer(self, course_id, filename, gzip=None):
         """
-        Given a course_id, filename, and rows (each row is an iterable of strings),
-        write this data out.
+        Return a `LocalFSReportWriter` for the file, which is only written as
+        gzip if `gzip` is True. Until the writer is closed, the report is written
+        to a hidden temporary file, which `links_for` doesn't list.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        return LocalFSReportWriter(self._prepare_path(course_id, filename), gzip=bool(gzip))
 
-        self.store(course_id, filename, output_buffer)
+    def _open_for_reading(self, course_id, filename):
+        """
+        Open the file, reading it through gzip if it starts with the gzip
+        magic number.
+        """
+        report_file = open(self.path_to(course_id, filename), "rb")
+        if report_file.read(2) == "\x1f\x8b":
+            report_file.seek(0)
+            return GzipFile(fileobj=report_file, mode="rb")
+        report_file.seek(0)
+        return report_file
+
+    def delete(self, course_id, filename):
+        """
+        Remove the file, if it exists.
+        """
+        try:
+            os.remove(self.path_to(course_id, filename))
+        except OSError as err:
+            if err.errno != errno.ENOENT:
+                raise
+
+    def _prepare_path(self, course_id, filename):
+        """
+        Return the full path to the given file, creating the course's directory
+        if needed.
+        """
+        full_path = self.path_to(course_id, filename)
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+        return full_path
 
     def links_for(self, course_id):
         """
@@ -408,7 +662,13 @@ class LocalFSReportStore(ReportStore):
         course_dir = self.path_to(course_id, '')
         if not os.path.exists(course_dir):
             return []
-        files = [(filename, os.path.join(course_dir, filename)) for filename in os.listdir(course_dir)]
+        files = [
+            (filename, os.path.join(course_dir, filename))
+            for filename in os.listdir(course_dir)
+            # skip the temporary files of reports still being written and
+            # intermediate files, see `iter_rows`
+            if not filename.startswith('.')
+        ]
         files.sort(key=lambda (filename, full_path): os.path.getmtime(full_path), reverse=True)
 
         return [
@@ -141,6 +141,9 @@ class SubtaskStatus(object):
       'retried_withmax' : number of times the subtask has been retried for conditions that
           should have a maximum count applied
       'state' : celery state of the subtask (e.g. QUEUING, PROGRESS, RETRY, FAILURE, SUCCESS)
+      'batches' : number of batches of items processed in parallel, for subtasks that do so
+      'batch_duration_ms' : total time spent processing those batches, in milliseconds, from
+          which the subtask's throughput can be found
 
     Object is not JSON-serializable, so to_dict and from_dict methods are provided so that
     it can be passed as a serializable argument to tasks (and be reconstituted within such tasks).
@@ -150,7 +153,8 @@ class SubtaskStatus(object):
     Also, we should count up "not attempted" separately from attempted/failed.
     """
 
-    def __init__(self, task_id, attempted=None, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None):
+    def __init__(self, task_id, attempted=None, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0,
+                 state=None, batches=0, batch_duration_ms=0):
         """Construct a SubtaskStatus object."""
         self.task_id = task_id
         if attempted is not None:
@@ -163,6 +167,8 @@ class SubtaskStatus(object):
         self.retried_nomax = retried_nomax
         self.retried_withmax = retried_withmax
         self.state = state if state is not None else QUEUING
+        self.batches = batches
+        self.batch_duration_ms = batch_duration_ms
 
     @classmethod
     def from_dict(self, d):
@@ -185,7 +191,8 @@ class SubtaskStatus(object):
         """
         return self.__dict__
 
-    def increment(self, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None):
+    def increment(self, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None,
+                  batches=0, batch_duration_ms=0):
         """
         Update the result of a subtask with additional results.
 
@@ -198,6 +205,8 @@ class SubtaskStatus(object):
         self.skipped += skipped
         self.retried_nomax += retried_nomax
         self.retried_withmax += retried_withmax
+        self.batches += batches
+        self.batch_duration_ms += batch_duration_ms
         if state is not None:
             self.state = state
 
@@ -275,7 +284,9 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
     return task_progress
 
 
-def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_queryset, item_fields, items_per_task):
+def queue_subtasks_for_query(
+    entry, action_name, create_subtask_fcn, item_queryset, item_fields, items_per_task, final_subtask_id=None
+):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
 
@@ -289,6 +300,11 @@ def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_querys
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
+        `final_subtask_id` : optional id of one more subtask, which isn't queued here but by the caller's
+            subtasks once the others are done (e.g. to combine their results).  It is counted among the
+            InstructorTask's subtasks, so that the InstructorTask only succeeds once it has completed.
+            All the other subtasks are then queued, even those left without items, so that the
+            final subtask is always reached.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -308,7 +324,8 @@ def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_querys
         total_num_subtasks,
         total_num_items,
     )  # pylint: disable=no-member
-    progress = initialize_subtask_info(entry, action_name, total_num_items, subtask_id_list)
+    all_subtask_ids = subtask_id_list + ([final_subtask_id] if final_subtask_id is not None else [])
+    progress = initialize_subtask_info(entry, action_name, total_num_items, all_subtask_ids)
 
     # Construct a generator that will return the recipients to use for each subtask.
     # Pass in the desired fields to fetch for each recipient.
@@ -336,6 +353,13 @@ def queue_subtasks_for_query(entry, action_name, create_subtask_fcn, item_querys
         new_subtask = create_subtask_fcn(item_list, subtask_status)
         new_subtask.apply_async()
 
+    if final_subtask_id is not None:
+        # The final subtask is only queued once all the others have completed, so
+        # the ones the query didn't yield enough items for still have to run.
+        for subtask_id in subtask_id_list[num_subtasks:]:
+            new_subtask = create_subtask_fcn([], SubtaskStatus.create(subtask_id))
+            new_subtask.apply_async()
+
     # Subtasks have been queued so no exceptions should be raised after this point.
 
     # Return the task progress as stored in the InstructorTask object.
@@ -462,9 +486,11 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    Returns the number of the InstructorTask's subtasks that have yet to complete.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
@@ -472,7 +498,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
             TASK_LOG.info("Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
             dog_stats_api.increment('instructor_task.subtask.retry_after_failed_update')
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
         else:
             TASK_LOG.info("Failed to update status after %d retries for subtask %s of instructor task %d with status %s",
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -512,6 +538,8 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    Returns the number of subtasks that have yet to complete.
     """
     TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -579,3 +607,4 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     else:
         TASK_LOG.debug("about to commit....")
         transaction.commit()
+        return num_remaining
@@ -19,10 +19,17 @@ a problem URL and optionally a student.  These are used to set up the initial va
 of the query for traversing StudentModule objects.
 
 """
+import json
+from traceback import format_exc
+
 from django.conf import settings
 from django.utils.translation import ugettext_noop
 from celery import task
+from celery.states import SUCCESS, FAILURE
+from celery.utils.log import get_task_logger
 from functools import partial
+from instructor_task.models import InstructorTask
+from instructor_task.subtasks import SubtaskStatus, check_subtask_is_valid, update_subtask_status
 from instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
@@ -31,11 +38,17 @@ from instructor_task.tasks_helper import (
     reset_attempts_module_state,
     delete_problem_module_state,
     upload_grades_csv,
+    upload_grades_csv_shard,
+    merge_grades_csv_shards,
+    fail_grades_csv,
+    GradeReportError,
     upload_students_csv,
     cohort_students_and_upload
 )
 from bulk_email.tasks import perform_delegate_email_batches
 
+TASK_LOG = get_task_logger(__name__)
+
 
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def rescore_problem(entry_id, xmodule_instance_args):
@@ -137,13 +150,105 @@ def send_bulk_course_email(entry_id, _xmodule_instance_args):
 def calculate_grades_csv(entry_id, xmodule_instance_args):
     """
     Grade a course and push the results to an S3 bucket for download.
+
+    Large courses are graded in shards by `calculate_grades_csv_shard` subtasks.
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('graded')
-    task_fn = partial(upload_grades_csv, xmodule_instance_args)
+    task_fn = partial(upload_grades_csv, xmodule_instance_args, shard_task=calculate_grades_csv_shard)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_shard(
+    entry_id, student_ids, shard_num, report_filename, err_report_filename, merge_subtask_id, subtask_status_dict
+):
+    """
+    Grade the students with ids `student_ids` as a subtask of `calculate_grades_csv`,
+    writing their grades out as the `shard_num`th shard of the grade report.
+
+    The shard that completes last queues `merge_grades_csv` as the subtask
+    `merge_subtask_id`, to merge the shards into the final reports. If any
+    shard failed, the report is failed instead, as it would be missing students.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(u"Preparing to grade shard %s of %d students as subtask %s for instructor task %d",
+                  shard_num, len(student_ids), current_task_id, entry_id)
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    def update_status():
+        """
+        Record the subtask's status, and if this was the last shard to
+        complete, queue the merge, or fail the report if any shard failed.
+        """
+        num_remaining = update_subtask_status(entry_id, current_task_id, subtask_status)
+        if num_remaining != 1:
+            return
+
+        # Only the merge is left, so this was the last shard to complete.
+        num_failed = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)['failed']
+        if num_failed:
+            TASK_LOG.warning(u"Grade report for instructor task %d: %d shards failed, not merging",
+                             entry_id, num_failed)
+            update_subtask_status(entry_id, merge_subtask_id, SubtaskStatus.create(merge_subtask_id, state=FAILURE))
+            fail_grades_csv(
+                entry_id, report_filename, err_report_filename,
+                GradeReportError(u"{} grade report shards failed".format(num_failed))
+            )
+        else:
+            merge_grades_csv.apply_async(
+                (entry_id, report_filename, err_report_filename, SubtaskStatus.create(merge_subtask_id).to_dict()),
+                task_id=merge_subtask_id,
+                routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+            )
+
+    try:
+        course_id = InstructorTask.objects.get(pk=entry_id).course_id
+        upload_grades_csv_shard(
+            course_id, student_ids, shard_num, report_filename, err_report_filename, subtask_status
+        )
+    except Exception:
+        TASK_LOG.exception(u"Grade report shard subtask %s: failed unexpectedly!", current_task_id)
+        # Count the students that weren't graded yet as failed, to keep the counts consistent.
+        subtask_status.increment(failed=len(student_ids) - subtask_status.attempted, state=FAILURE)
+        update_status()
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_status()
+    return subtask_status.to_dict()
+
+
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def merge_grades_csv(entry_id, report_filename, err_report_filename, subtask_status_dict):
+    """
+    Merge the shards written by the `calculate_grades_csv_shard` subtasks of
+    `calculate_grades_csv` into the final grade reports, as its last subtask.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        entry = InstructorTask.objects.get(pk=entry_id)
+        # All the subtasks but this one are shards
+        num_shards = json.loads(entry.subtasks)['total'] - 1
+        merge_grades_csv_shards(entry.course_id, num_shards, report_filename, err_report_filename)
+    except Exception as exc:
+        TASK_LOG.exception(u"Grade report merge subtask %s: failed unexpectedly!", current_task_id)
+        traceback_string = format_exc()
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        # The merge is the last subtask, so the task itself has failed.
+        fail_grades_csv(entry_id, report_filename, err_report_filename, exc, traceback_string)
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
@@ -5,12 +5,15 @@ running state of a course.
 """
 import json
 from datetime import datetime
+from itertools import count
 from time import time
+from uuid import uuid4
 import unicodecsv
 
 from celery import Task, current_task
 from celery.utils.log import get_task_logger
 from celery.states import SUCCESS, FAILURE
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.files.storage import DefaultStorage
 from django.db import transaction, reset_queries
@@ -26,11 +29,12 @@ from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
-from instructor_analytics.basic import enrolled_students_features
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.basic import iter_enrolled_students_features
+from instructor_analytics.csvs import iter_dictlist_rows
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from instructor_task.subtasks import queue_subtasks_for_query
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from openedx.core.djangoapps.course_groups.cohorts import get_cohorts_by_user
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
 from student.models import CourseEnrollment
@@ -143,6 +147,14 @@ class UpdateProblemModuleStateError(Exception):
     pass
 
 
+class GradeReportError(Exception):
+    """
+    Error signaling that a grade report generated in shards couldn't be
+    completed.
+    """
+    pass
+
+
 def _get_current_task():
     """
     Stub to make it easier to test without actually running Celery.
@@ -505,6 +517,17 @@ def delete_problem_module_state(xmodule_instance_args, _module_descriptor, stude
     return UPDATE_STATUS_SUCCEEDED
 
 
+def _report_filename(csv_name, course_id, timestamp):
+    """
+    Return the name of the `csv_name` report file for the course generated at `timestamp`.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
     """
     Upload data as a CSV using ReportStore.
@@ -516,65 +539,57 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            or any other iterable (e.g. a generator) of rows.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
     """
     report_store = ReportStore.from_config()
-    report_store.store_rows(
-        course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
-        rows
-    )
+    report_store.store_rows(course_id, _report_filename(csv_name, course_id, timestamp), rows)
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+def open_report_writer(csv_name, course_id, timestamp):
     """
-    For a given `course_id`, generate a grades CSV file for all students that
-    are enrolled, and store using a `ReportStore`. Once created, the files can
-    be accessed by instantiating another `ReportStore` (via
-    `ReportStore.from_config()`) and calling `link_for()` on it. Writes are
-    buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
-    that are visible in ReportStore will be complete ones.
+    Return a `ReportWriter` to append the rows of a CSV to, as they are
+    generated, using ReportStore. The CSV is uploaded when the writer is
+    closed; use it as a context manager so that it isn't uploaded if
+    generating the report fails.
 
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+    Arguments:
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    report_store = ReportStore.from_config()
+    return report_store.open_writer(course_id, _report_filename(csv_name, course_id, timestamp))
 
-    course = get_course_by_id(course_id)
+
+def _write_grade_rows(report_writer, err_rows, course, students, record_result):
+    """
+    Grade `students` in `course`, and write out a row with the grades of each
+    student who could be graded to `report_writer`, preceded by a header row.
+    The students who couldn't be graded are appended to `err_rows`.
+
+    `record_result` is called after each student is graded, with whether
+    grading succeeded.
+    """
+    course_id = course.id
     cohorts_header = ['Cohort Group Name'] if course.is_cohorted else []
 
     partition_service = LmsPartitionService(user=None, course_id=course_id)
     partitions = partition_service.course_partitions
     group_configs_header = ['Group Configuration Group Name ({})'.format(partition.name) for partition in partitions]
 
-    # Loop over all our students and build our CSV lists in memory
-    header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
-    current_step = {'step': 'Calculating Grades'}
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
+    # Look up everybody's cohort and groups up front, rather than for each student
+    cohorts_by_user = get_cohorts_by_user(course_id) if course.is_cohorted else {}
+    groups_by_partition = [partition_service.get_groups_for_users(partition) for partition in partitions]
 
+    header = None
+    for student, gradeset, err_msg in iterate_grades_for(course_id, students):
         if gradeset:
             # We were able to successfully grade this student for this course.
-            task_progress.succeeded += 1
             if not header:
                 # Encode the header row in utf-8 encoding in case there are unicode characters
                 header = [section['label'].encode('utf-8') for section in gradeset[u'section_breakdown']]
-                rows.append(
+                report_writer.writerow(
                     ["id", "email", "username", "grade"] + header + cohorts_header + group_configs_header
                 )
 
@@ -586,12 +601,12 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
             cohorts_group_name = []
             if course.is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
+                group = cohorts_by_user.get(student.id)
                 cohorts_group_name.append(group.name if group else '')
 
             group_configs_group_names = []
-            for partition in partitions:
-                group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
+            for groups_by_user in groups_by_partition:
+                group = groups_by_user.get(student.id)
                 group_configs_group_names.append(group.name if group else '')
 
             # Not everybody has the same gradable items. If the item is not
@@ -601,21 +616,69 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             # possible for a student to have a 0.0 show up in their row but
             # still have 100% for the course.
             row_percents = [percents.get(label, 0.0) for label in header]
-            rows.append(
+            report_writer.writerow(
                 [student.id, student.email, student.username, gradeset['percent']] +
                 row_percents + cohorts_group_name + group_configs_group_names
             )
         else:
             # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
             err_rows.append([student.id, student.username, err_msg])
+        record_result(bool(gradeset))
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+def upload_grades_csv(_xmodule_instance_args, entry_id, course_id, _task_input, action_name, shard_task=None):
+    """
+    For a given `course_id`, generate a grades CSV file for all students that
+    are enrolled, and store using a `ReportStore`. Once created, the files can
+    be accessed by instantiating another `ReportStore` (via
+    `ReportStore.from_config()`) and calling `link_for()` on it. Rows are
+    written out as students are graded, but the `ReportWriter` only publishes
+    the file once it is complete -- i.e. any files that are visible in
+    ReportStore will be complete ones.
+
+    If given a `shard_task`, and there are more than
+    `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK` students, the students are
+    instead split up among `shard_task` subtasks (see `upload_grades_csv_shard`),
+    and the shards they write are merged once all of them are done.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    status_interval = 100
+    enrolled_students = CourseEnrollment.users_enrolled_in(course_id)
+    num_enrolled = enrolled_students.count()
+
+    students_per_task = settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK
+    if shard_task is not None and students_per_task and num_enrolled > students_per_task:
+        return _queue_grade_report_shards(
+            entry_id, course_id, action_name, shard_task, enrolled_students.order_by('id'), start_date
+        )
+
+    task_progress = TaskProgress(action_name, num_enrolled, start_time)
+    course = get_course_by_id(course_id)
+    current_step = {'step': 'Calculating Grades'}
+
+    def record_result(succeeded):
+        """
+        Count the graded student in the task progress, periodically updating
+        the task status (this is a cache write).
+        """
+        if task_progress.attempted % status_interval == 0:
+            task_progress.update_task_state(extra_meta=current_step)
+        task_progress.attempted += 1
+        if succeeded:
+            task_progress.succeeded += 1
+        else:
+            task_progress.failed += 1
+
+    # Loop over all our students, writing out their grades as we go. Only the
+    # (hopefully few) error rows are kept in memory.
+    err_rows = [["id", "username", "error_msg"]]
+    with open_report_writer('grade_report', course_id, start_date) as report_writer:
+        _write_grade_rows(report_writer, err_rows, course, enrolled_students, record_result)
+
+        # By this point, we've written all the grades; closing the writer uploads them.
+        current_step = {'step': 'Uploading CSVs'}
+        task_progress.update_task_state(extra_meta=current_step)
 
     # If there are any error rows (don't count the header), write them out as well
     if len(err_rows) > 1:
@@ -625,6 +688,141 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _grade_report_shard_filename(filename, shard_num):
+    """
+    Return the name of the `shard_num`th shard of the report `filename`. The
+    name starts with a ".", so that it isn't listed among the reports.
+    """
+    return u".{}.shard-{:05d}".format(filename, shard_num)
+
+
+def _queue_grade_report_shards(entry_id, course_id, action_name, shard_task, enrolled_students, start_date):
+    """
+    Queue `shard_task` subtasks that each grade a shard of `enrolled_students`.
+    An extra subtask, which merges the shards, is reserved for the shard task
+    that completes last to queue.
+
+    Returns the task progress as stored in the InstructorTask.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    report_filename = _report_filename('grade_report', course_id, start_date)
+    err_report_filename = _report_filename('grade_report_err', course_id, start_date)
+    merge_subtask_id = str(uuid4())
+    shard_nums = count()
+
+    def _create_grade_report_shard_subtask(student_list, initial_subtask_status):
+        """Creates a subtask to grade the shard of students in `student_list`."""
+        return shard_task.subtask(
+            (
+                entry_id,
+                [student['pk'] for student in student_list],
+                next(shard_nums),
+                report_filename,
+                err_report_filename,
+                merge_subtask_id,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_grade_report_shard_subtask,
+        enrolled_students,
+        [],
+        settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK,
+        final_subtask_id=merge_subtask_id,
+    )
+
+
+def upload_grades_csv_shard(course_id, student_ids, shard_num, report_filename, err_report_filename, subtask_status):
+    """
+    Grade the students with ids `student_ids`, and write their grades and
+    errors out as the `shard_num`th shards of `report_filename` and
+    `err_report_filename` respectively, to be merged by
+    `merge_grades_csv_shards`. Counts each student in `subtask_status`.
+    """
+    course = get_course_by_id(course_id)
+    students = User.objects.filter(id__in=student_ids).order_by('id')
+
+    def record_result(succeeded):
+        """
+        Count the graded student in the subtask status.
+        """
+        if succeeded:
+            subtask_status.increment(succeeded=1)
+        else:
+            subtask_status.increment(failed=1)
+
+    report_store = ReportStore.from_config()
+    err_rows = []
+    with report_store.open_writer(course_id, _grade_report_shard_filename(report_filename, shard_num)) as writer:
+        _write_grade_rows(writer, err_rows, course, students, record_result)
+    report_store.store_rows(course_id, _grade_report_shard_filename(err_report_filename, shard_num), err_rows)
+
+
+def merge_grades_csv_shards(course_id, num_shards, report_filename, err_report_filename):
+    """
+    Concatenate the shards of the grade report written by
+    `upload_grades_csv_shard`, in order, into the final reports, and delete
+    the shards. Raises an exception if any shard is missing, rather than
+    publish a report that is missing students.
+    """
+    report_store = ReportStore.from_config()
+
+    # Read the (hopefully few) error rows first, so that the grade report
+    # isn't published if any of the shards are missing.
+    err_rows = [
+        row
+        for shard_num in range(num_shards)
+        for row in report_store.iter_rows(course_id, _grade_report_shard_filename(err_report_filename, shard_num))
+    ]
+
+    with report_store.open_writer(course_id, report_filename) as writer:
+        header = None
+        for shard_num in range(num_shards):
+            for row in report_store.iter_rows(course_id, _grade_report_shard_filename(report_filename, shard_num)):
+                # Every shard that graded anybody starts with the same header row
+                if header is None:
+                    header = row
+                elif row == header:
+                    continue
+                writer.writerow(row)
+
+    if err_rows:
+        report_store.store_rows(course_id, err_report_filename, [["id", "username", "error_msg"]] + err_rows)
+
+    delete_grades_csv_shards(course_id, num_shards, report_filename, err_report_filename)
+
+
+def delete_grades_csv_shards(course_id, num_shards, report_filename, err_report_filename):
+    """
+    Delete the shards of the grade report written by `upload_grades_csv_shard`,
+    skipping any that were never written.
+    """
+    report_store = ReportStore.from_config()
+    for filename in (report_filename, err_report_filename):
+        for shard_num in range(num_shards):
+            report_store.delete(course_id, _grade_report_shard_filename(filename, shard_num))
+
+
+def fail_grades_csv(entry_id, report_filename, err_report_filename, exception, traceback_string=None):
+    """
+    Mark the InstructorTask `entry_id`, whose grade report was being generated
+    in shards, as failed with `exception`, and delete the shards, as there
+    won't be a report to merge them into.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    # All the subtasks but the merge are shards
+    num_shards = json.loads(entry.subtasks)['total'] - 1
+    delete_grades_csv_shards(entry.course_id, num_shards, report_filename, err_report_filename)
+    entry.task_output = InstructorTask.create_output_for_failure(exception, traceback_string)
+    entry.task_state = FAILURE
+    entry.save_now()
+
+
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing profile
@@ -637,21 +835,22 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # Compute the student features one student at a time, writing out each
+    # row as we go rather than building the whole table in memory.
     query_features = task_input.get('features')
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    student_data = iter_enrolled_students_features(course_id, query_features)
+    with open_report_writer('student_profile_info', course_id, start_date) as report_writer:
+        report_writer.writerow(query_features)
+        for row in iter_dictlist_rows(student_data, query_features):
+            report_writer.writerow(row)
+            task_progress.attempted += 1
+            task_progress.succeeded += 1
 
-    current_step = {'step': 'Uploading CSV'}
-    task_progress.update_task_state(extra_meta=current_step)
+        task_progress.skipped = task_progress.total - task_progress.attempted
 
-    # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+        # By this point, we've written all the rows; closing the writer uploads them.
+        current_step = {'step': 'Uploading CSV'}
+        task_progress.update_task_state(extra_meta=current_step)
 
     return task_progress.update_task_state(extra_meta=current_step)
 
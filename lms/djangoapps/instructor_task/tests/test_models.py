@@ -3,12 +3,13 @@ Tests for instructor_task/models.py.
 """
 
 from cStringIO import StringIO
+from gzip import GzipFile
 import mock
 import time
 from datetime import datetime
 from unittest import TestCase
 
-from instructor_task.models import LocalFSReportStore, S3ReportStore
+from instructor_task.models import LocalFSReportStore, S3ReportStore, S3ReportWriter
 from instructor_task.tests.test_base import TestReportMixin
 from opaque_keys.edx.locator import CourseLocator
 
@@ -30,15 +31,47 @@ class MockKey(object):
         return "http://fake-edx-s3.edx.org/"
 
 
+class MockMultiPartUpload(object):
+    """
+    Mocking a boto S3 MultiPartUpload object.
+    """
+    def __init__(self, bucket, key_name):
+        self.bucket = bucket
+        self.key_name = key_name
+        self.parts = []
+
+    def upload_part_from_file(self, fp, part_num):
+        """ Expected method on a MultiPartUpload object. """
+        self.parts.append((part_num, fp.read()))
+
+    def complete_upload(self):
+        """ Expected method on a MultiPartUpload object. """
+        key = MockKey(self.bucket)
+        key.key = self.key_name
+        key.contents = ''.join(data for _, data in sorted(self.parts))
+        self.bucket.store_key(key)
+
+    def cancel_upload(self):
+        """ Expected method on a MultiPartUpload object. """
+        self.parts = []
+
+
 class MockBucket(object):
     """ Mocking a boto S3 Bucket object. """
     def __init__(self, _name):
         self.keys = []
+        self.multipart_uploads = []
 
     def store_key(self, key):
         """ Not a Bucket method, created just to store the keys in the Bucket for testing purposes. """
         self.keys.append(key)
 
+    def initiate_multipart_upload(self, key_name, headers):  # pylint: disable=unused-argument
+        """ Expected method on a Bucket object. """
+        multipart_upload = MockMultiPartUpload(self, key_name)
+        self.multipart_uploads.append(multipart_upload)
+        return multipart_upload
+
     def list(self, prefix):  # pylint: disable=unused-argument
         """ Expected method on a Bucket object. """
         return self.keys
@@ -84,6 +117,31 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_writer_publishes_on_close(self):
+        """
+        Test that a report written with a ReportWriter is only listed once
+        the writer is closed.
+        """
+        report_store = self.create_report_store()
+        with report_store.open_writer(self.course_id, 'report.csv') as writer:
+            writer.writerow(['id', 'username'])
+            writer.writerows([[1, u'\xfcnicode'], [2, 'ascii']])
+            self.assertEqual(report_store.links_for(self.course_id), [])
+
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+
+    def test_writer_aborts_on_error(self):
+        """
+        Test that a report isn't stored if writing it fails.
+        """
+        report_store = self.create_report_store()
+        with self.assertRaises(ValueError):
+            with report_store.open_writer(self.course_id, 'report.csv') as writer:
+                writer.writerow(['id', 'username'])
+                raise ValueError()
+
+        self.assertEqual(report_store.links_for(self.course_id), [])
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     """
@@ -93,6 +151,17 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config()
 
+    def test_store_rows(self):
+        """
+        Test that the rows are written out as a utf-8 encoded CSV.
+        """
+        report_store = self.create_report_store()
+        rows = ([index, u'\xfcnicode'] for index in range(3))
+        report_store.store_rows(self.course_id, 'report.csv', rows)
+
+        with open(report_store.path_to(self.course_id, 'report.csv')) as csv_file:
+            self.assertEqual(csv_file.read(), '0,\xc3\xbcnicode\r\n1,\xc3\xbcnicode\r\n2,\xc3\xbcnicode\r\n')
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
@@ -105,3 +174,17 @@ class S3ReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     def create_report_store(self):
         """ Create and return a S3ReportStore. """
         return S3ReportStore.from_config()
+
+    @mock.patch.object(S3ReportWriter, 'PART_SIZE', 100)
+    def test_multipart_upload(self):
+        """
+        Test that large reports are uploaded in several gzip'd parts.
+        """
+        report_store = self.create_report_store()
+        rows = [[index, 'x' * index] for index in range(100)]
+        report_store.store_rows(self.course_id, 'report.csv', rows)
+
+        multipart_upload = report_store.bucket.multipart_uploads[0]
+        self.assertGreater(len(multipart_upload.parts), 1)
+        contents = GzipFile(fileobj=StringIO(report_store.bucket.keys[0].contents)).read()
+        self.assertEqual(contents.splitlines(), ['{},{}'.format(index, 'x' * index) for index in range(100)])
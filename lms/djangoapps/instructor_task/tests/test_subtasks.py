@@ -3,11 +3,15 @@ Unit tests for instructor_task subtasks.
 """
 from uuid import uuid4
 
+from celery.states import SUCCESS, FAILURE
 from mock import Mock, patch
 
 from student.models import CourseEnrollment
 
-from instructor_task.subtasks import queue_subtasks_for_query
+from instructor_task.models import InstructorTask
+from instructor_task.subtasks import (
+    queue_subtasks_for_query, initialize_subtask_info, update_subtask_status, SubtaskStatus
+)
 from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase
 
@@ -26,8 +30,11 @@ class TestSubtasks(InstructorTaskCourseTestCase):
             random_id = uuid4().hex[:8]
             self.create_student(username='student{0}'.format(random_id))
 
-    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count):
-        """Queue subtasks while enrolling more students into course in the middle of the process."""
+    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count, final_subtask_id=None):
+        """
+        Queue subtasks while enrolling more students into course (or unenrolling some,
+        if `extra_count` is negative) in the middle of the process.
+        """
 
         task_id = str(uuid4())
         instructor_task = InstructorTaskFactory.create(
@@ -42,7 +49,11 @@ class TestSubtasks(InstructorTaskCourseTestCase):
 
         def initialize_subtask_info(*args):  # pylint: disable=unused-argument
             """Instead of initializing subtask info enroll some more students into course."""
-            self._enroll_students_in_course(self.course.id, extra_count)
+            if extra_count >= 0:
+                self._enroll_students_in_course(self.course.id, extra_count)
+            else:
+                for enrollment in CourseEnrollment.objects.filter(course_id=self.course.id)[:-extra_count]:
+                    enrollment.delete()
             return {}
 
         with patch('instructor_task.subtasks.initialize_subtask_info') as mock_initialize_subtask_info:
@@ -54,6 +65,7 @@ class TestSubtasks(InstructorTaskCourseTestCase):
                 item_queryset=task_queryset,
                 item_fields=[],
                 items_per_task=items_per_task,
+                final_subtask_id=final_subtask_id,
             )
 
     def test_queue_subtasks_for_query1(self):
@@ -79,3 +91,35 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    def test_queue_subtasks_for_query_with_final_subtask(self):
+        """
+        Test queue_subtasks_for_query() queues every subtask counted before a final subtask,
+        even if the query no longer yields items for them.
+        """
+
+        mock_create_subtask_fcn = Mock()
+        self._queue_subtasks(mock_create_subtask_fcn, 3, 7, -3, final_subtask_id=str(uuid4()))
+
+        # Three subtasks were counted for 7 items, but only 4 items were left for them
+        mock_create_subtask_fcn_args = mock_create_subtask_fcn.call_args_list
+        self.assertEqual([len(args[0][0]) for args in mock_create_subtask_fcn_args], [3, 1, 0])
+        self.assertEqual(len(set(args[0][1].task_id for args in mock_create_subtask_fcn_args)), 3)
+
+    def test_update_subtask_status_returns_num_remaining(self):
+        """Test update_subtask_status() returns how many subtasks have yet to complete."""
+
+        subtask_ids = [str(uuid4()) for _ in range(3)]
+        instructor_task = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='bulk_course_email',
+        )
+        initialize_subtask_info(instructor_task, 'action_name', 3, subtask_ids)
+
+        for index, state in enumerate([SUCCESS, FAILURE, SUCCESS]):
+            subtask_status = SubtaskStatus.create(subtask_ids[index], state=state)
+            num_remaining = update_subtask_status(instructor_task.id, subtask_ids[index], subtask_status)
+            self.assertEqual(num_remaining, len(subtask_ids) - index - 1)
+        self.assertEqual(InstructorTask.objects.get(id=instructor_task.id).task_state, SUCCESS)
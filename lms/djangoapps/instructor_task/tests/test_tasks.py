@@ -6,6 +6,7 @@ paths actually work.
 
 """
 import json
+import os
 from uuid import uuid4
 
 from mock import Mock, MagicMock, patch
@@ -19,10 +20,13 @@ from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 
-from instructor_task.models import InstructorTask
-from instructor_task.tests.test_base import InstructorTaskModuleTestCase
+from instructor_task.models import InstructorTask, ReportStore
+from instructor_task.subtasks import SubtaskStatus, initialize_subtask_info
+from instructor_task.tests.test_base import InstructorTaskCourseTestCase, InstructorTaskModuleTestCase, TestReportMixin
 from instructor_task.tests.factories import InstructorTaskFactory
-from instructor_task.tasks import rescore_problem, reset_problem_attempts, delete_problem_state
+from instructor_task.tasks import (
+    rescore_problem, reset_problem_attempts, delete_problem_state, calculate_grades_csv_shard, merge_grades_csv
+)
 from instructor_task.tasks_helper import UpdateProblemModuleStateError
 
 PROBLEM_URL_NAME = "test_urlname"
@@ -438,3 +442,77 @@ class TestDeleteStateInstructorTask(TestInstructorTasks):
                 StudentModule.objects.get(course_id=self.course.id,
                                           student=student,
                                           module_state_key=self.location)
+
+
+class TestGradeReportShardTasks(TestReportMixin, InstructorTaskCourseTestCase):
+    """
+    Tests the hand-off from the subtasks that grade a course in shards to the
+    subtask that merges them.
+    """
+    def setUp(self):
+        super(TestGradeReportShardTasks, self).setUp()
+        self.initialize_course()
+        self.students = [self.create_student('student{}'.format(index)) for index in range(2)]
+        self.shard_ids = [str(uuid4()) for _ in self.students]
+        self.merge_id = str(uuid4())
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_key='dummy value',
+            task_id=str(uuid4()),
+        )
+        initialize_subtask_info(self.entry, 'graded', len(self.students), self.shard_ids + [self.merge_id])
+
+    def _run_shard(self, shard_num):
+        """Run the subtask grading the `shard_num`th student as the `shard_num`th shard."""
+        return calculate_grades_csv_shard(
+            self.entry.id, [self.students[shard_num].id], shard_num, 'grade_report.csv', 'grade_report_err.csv',
+            self.merge_id, SubtaskStatus.create(self.shard_ids[shard_num]).to_dict()
+        )
+
+    def _report_dir_contents(self):
+        """Return the names of the files stored for the course."""
+        report_dir = os.path.dirname(ReportStore.from_config().path_to(self.course.id, 'grade_report.csv'))
+        return os.listdir(report_dir) if os.path.exists(report_dir) else []
+
+    def test_last_shard_queues_merge(self):
+        with patch('instructor_task.tasks.merge_grades_csv.apply_async') as mock_merge:
+            self._run_shard(0)
+            self.assertFalse(mock_merge.called)
+            self._run_shard(1)
+        self.assertEqual(mock_merge.call_count, 1)
+        self.assertEqual(mock_merge.call_args[1]['task_id'], self.merge_id)
+
+        merge_grades_csv(*mock_merge.call_args[0][0])
+        entry = InstructorTask.objects.get(id=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset({'attempted': 2, 'succeeded': 2, 'failed': 0}, json.loads(entry.task_output))
+        self.assertEqual(self._report_dir_contents(), ['grade_report.csv'])
+
+    def test_failed_shard_fails_report(self):
+        with patch('instructor_task.tasks.merge_grades_csv.apply_async') as mock_merge:
+            self._run_shard(0)
+            with patch('instructor_task.tasks.upload_grades_csv_shard') as mock_upload:
+                mock_upload.side_effect = TestTaskFailure('shard failed')
+                with self.assertRaises(TestTaskFailure):
+                    self._run_shard(1)
+        self.assertFalse(mock_merge.called)
+
+        entry = InstructorTask.objects.get(id=self.entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'GradeReportError')
+        self.assertDictContainsSubset({'total': 3, 'succeeded': 1, 'failed': 2}, json.loads(entry.subtasks))
+        # The shards written by the other subtask are deleted
+        self.assertEqual(self._report_dir_contents(), [])
+
+    def test_failed_merge_fails_report(self):
+        with patch('instructor_task.tasks.merge_grades_csv.apply_async') as mock_merge:
+            self._run_shard(0)
+            self._run_shard(1)
+        ReportStore.from_config().delete(self.course.id, '.grade_report.csv.shard-00000')
+
+        with self.assertRaises(IOError):
+            merge_grades_csv(*mock_merge.call_args[0][0])
+        entry = InstructorTask.objects.get(id=self.entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(self._report_dir_contents(), [])
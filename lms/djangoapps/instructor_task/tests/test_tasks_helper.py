@@ -8,6 +8,7 @@ Tests that CSV grade report generation works with unicode emails.
 """
 import ddt
 from mock import Mock, patch
+import os
 import tempfile
 import unicodecsv
 
@@ -17,8 +18,14 @@ from student.models import CourseEnrollment
 from xmodule.partitions.partitions import Group, UserPartition
 
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
+from openedx.core.djangoapps.user_api.api import course_tag as course_tag_api
+from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
 from instructor_task.models import ReportStore
-from instructor_task.tasks_helper import cohort_students_and_upload, upload_grades_csv, upload_students_csv
+from instructor_task.subtasks import SubtaskStatus
+from instructor_task.tasks_helper import (
+    cohort_students_and_upload, upload_grades_csv, upload_students_csv, upload_grades_csv_shard,
+    merge_grades_csv_shards
+)
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase, TestReportMixin
 
 
@@ -46,6 +53,33 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         num_students = len(emails)
         self.assertDictContainsSubset({'attempted': num_students, 'succeeded': num_students, 'failed': 0}, result)
 
+    def test_grade_report_shards(self):
+        """
+        Test that the grade report shards written by subtasks are merged, in
+        order, into the final report.
+        """
+        students = [self.create_student('student{}'.format(index)) for index in range(3)]
+        for shard_num, shard in enumerate([students[:2], students[2:]]):
+            subtask_status = SubtaskStatus.create('subtask{}'.format(shard_num))
+            upload_grades_csv_shard(
+                self.course.id, [student.id for student in shard], shard_num,
+                'grade_report.csv', 'grade_report_err.csv', subtask_status
+            )
+            self.assertEqual(subtask_status.succeeded, len(shard))
+
+        # The shards aren't listed as reports
+        report_store = ReportStore.from_config()
+        self.assertEqual(report_store.links_for(self.course.id), [])
+
+        merge_grades_csv_shards(self.course.id, 2, 'grade_report.csv', 'grade_report_err.csv')
+        report_path = report_store.path_to(self.course.id, 'grade_report.csv')
+        self.assertEqual(os.listdir(os.path.dirname(report_path)), ['grade_report.csv'])
+        with open(report_path) as csv_file:
+            self.assertEqual(
+                [row['username'] for row in unicodecsv.DictReader(csv_file)],
+                [student.username for student in students]
+            )
+
     @patch('instructor_task.tasks_helper._get_current_task')
     @patch('instructor_task.tasks_helper.iterate_grades_for')
     def test_grading_failure(self, mock_iterate_grades_for, _mock_current_task):
@@ -114,6 +148,32 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
 
         self._verify_cohort_data(course.id, cohort_groups)
 
+    def test_user_partition_groups_in_grading(self):
+        """
+        Test that the groups students are already assigned to are included in the grades csv.
+        """
+        user_partition = UserPartition(0, 'x_man', 'X Man', [Group(0, u'Group 0'), Group(1, u'Group 1')])
+        course = CourseFactory.create(user_partitions=[user_partition])
+        user1 = UserFactory.create(username='user1')
+        user2 = UserFactory.create(username='user2')
+        CourseEnrollment.enroll(user1, course.id)
+        CourseEnrollment.enroll(user2, course.id)
+        partition_key = RandomUserPartitionScheme._key_for_partition(user_partition)  # pylint: disable=protected-access
+        course_tag_api.set_course_tag(user1, course.id, partition_key, 1)
+
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            upload_grades_csv(None, None, course.id, None, 'graded')
+        report_store = ReportStore.from_config()
+        report_csv_filename = report_store.links_for(course.id)[0][0]
+        with open(report_store.path_to(course.id, report_csv_filename)) as csv_file:
+            groups_in_csv = {
+                row['username']: row['Group Configuration Group Name (x_man)']
+                for row in unicodecsv.DictReader(csv_file)
+            }
+        self.assertEqual(groups_in_csv, {'user1': u'Group 1', 'user2': u''})
+        # Nobody is assigned to a group by the report
+        self.assertIsNone(course_tag_api.get_course_tag(user2, course.id, partition_key))
+
     def test_unicode_user_partitions(self):
         """
         Test that user partition groups can contain unicode characters.
@@ -159,6 +219,26 @@ class TestStudentReport(TestReportMixin, InstructorTaskCourseTestCase):
         self.assertEquals(len(links), 1)
         self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
 
+    def test_cohort_column(self):
+        """
+        Test that the rows are written in username order, each with the
+        student's cohort in the course.
+        """
+        cohort = CohortFactory.create(name=u'cohort \u2603', course_id=self.course.id)
+        for username in ('student_b', 'student_c', 'student_a'):
+            self.create_student(username, '{}@example.com'.format(username))
+        cohort.users.add(CourseEnrollment.objects.get(user__username='student_c').user)
+        task_input = {'features': ['username', 'cohort']}
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            result = upload_students_csv(None, None, self.course.id, task_input, 'calculated')
+
+        self.assertDictContainsSubset({'attempted': 3, 'succeeded': 3, 'failed': 0, 'skipped': 0}, result)
+        self.verify_rows_in_csv([
+            {'username': 'student_a', 'cohort': '[unassigned]'},
+            {'username': 'student_b', 'cohort': '[unassigned]'},
+            {'username': 'student_c', 'cohort': u'cohort \u2603'},
+        ])
+
     @ddt.data([u'student', u'student\xec'])
     def test_unicode_usernames(self, students):
         """
@@ -59,6 +59,15 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# How many connections to the comments service each process keeps open for reuse
+COMMENTS_SERVICE_POOL_SIZE = 10
+# How many times to retry a failed connection to the comments service. Not
+# more than 0 unless the service handles a retried POST being applied twice.
+COMMENTS_SERVICE_MAX_RETRIES = 0
+# Whether independent requests to the comments service made while rendering a
+# page are sent at the same time, from separate threads
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = True
+
 
 # Features
 FEATURES = {
@@ -178,6 +187,10 @@ FEATURES = {
     # Don't autoplay videos for students
     'AUTOPLAY_VIDEOS': False,
 
+    # Only render the unit a student is looking at when rendering a sequence;
+    # the others are fetched when the student moves to them
+    'ENABLE_LAZY_SEQUENCE_RENDERING': False,
+
     # Enable instructor dash to submit background tasks
     'ENABLE_INSTRUCTOR_BACKGROUND_TASKS': True,
 
@@ -308,6 +321,10 @@ FEATURES = {
 
     # Separate the verification flow from the payment flow
     'SEPARATE_VERIFICATION_FROM_PAYMENT': False,
+
+    # Use the cached max score of a problem the student hasn't been graded on,
+    # instead of instantiating the problem to compute it.
+    'ENABLE_MAX_SCORE_CACHE': True,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -632,6 +649,10 @@ MODULESTORE = {
     }
 }
 
+# Maximum number of bytes of (compressed) split modulestore structures to keep in
+# each process's structure cache. 0 disables the cache.
+SPLIT_STRUCTURE_CACHE_BYTES = 64 * 1024 * 1024
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -645,6 +666,17 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # A pool of pre-started sandbox workers to run code in, instead of starting
+    # a sandboxed python for each execution. See capa.safe_exec.worker_pool.
+    'worker_pool': {
+        # How many workers each process keeps.  0 means don't use a pool.
+        'size': 0,
+        # How many seconds can jailed code run for?
+        'timeout': 5,
+        # How many executions before a worker is replaced?
+        'max_jobs': 100,
+    },
 }
 
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
@@ -1415,6 +1447,14 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of SMTP connections over which each bulk email task sends its emails in
+# parallel.  With more than one, emails are rendered and sent in batches of this size.
+BULK_EMAIL_SEND_CONNECTIONS = 1
+
+# Maximum number of emails per second sent by each bulk email task when sending in
+# batches, or 0 for no limit.
+BULK_EMAIL_MAX_SEND_RATE = 0
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -1647,6 +1687,14 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# Grade reports of courses with more students than this are generated in
+# parallel by subtasks that each grade this many students
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = 5000
+
+# Number of students whose StudentModule scores are bulk loaded together
+# when grading a whole course (courseware.grades.iterate_grades_for)
+GRADES_BATCH_SIZE = 100
+
 ######################## PROGRESS SUCCESS BUTTON ##############################
 # The following fields are available in the URL: {course_id} {student_id}
 PROGRESS_SUCCESS_BUTTON_URL = 'http://<domain>/<path>/{course_id}'
@@ -46,6 +46,9 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Make the requests to the (mocked) comments service one at a time, in a predictable order
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = False
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_HINTER_INSTRUCTOR_VIEW'] = True
@@ -150,6 +153,9 @@ update_module_store_settings(
     },
 )
 
+# Keep the structure cache off, so that tests see every mongo query
+SPLIT_STRUCTURE_CACHE_BYTES = 0
+
 CONTENTSTORE = {
     'ENGINE': 'xmodule.contentstore.mongo.MongoContentStore',
     'DOC_STORE_CONFIG': {
@@ -1,15 +1,43 @@
 from contextlib import contextmanager
+from cookielib import DefaultCookiePolicy
 import dogstats_wrapper as dog_stats_api
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+import sys
+import threading
 from django.conf import settings
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
 log = logging.getLogger(__name__)
 
 
+def make_session():
+    """
+    Returns a requests session which keeps connections to the comments service alive
+    so that they can be reused by later requests, from any thread.
+
+    The session is shared by every user's requests, so it never stores cookies.
+    """
+    pool_size = getattr(settings, "COMMENTS_SERVICE_POOL_SIZE", 10)
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=getattr(settings, "COMMENTS_SERVICE_MAX_RETRIES", 0),
+    )
+    new_session = requests.Session()
+    new_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    new_session.mount('http://', adapter)
+    new_session.mount('https://', adapter)
+    return new_session
+
+
+session = make_session()
+
+
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
 
@@ -76,7 +104,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = session.request(
             method,
             url,
             data=data,
@@ -132,6 +160,52 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def perform_concurrently(*functions):
+    """
+    Calls each of `functions` at the same time and returns the list of their results,
+    so that independent requests to the comments service take as long as the slowest
+    of them rather than the sum of them all. If any of the functions raise an exception,
+    the exception raised by the first of them is raised once they have all finished.
+
+    The first function is called in the current thread. The others are called in new
+    threads with the current language, so they should only make requests to the comments
+    service: in particular, they mustn't use the database.
+    """
+    if not getattr(settings, "COMMENTS_SERVICE_CONCURRENT_REQUESTS", True):
+        return [function() for function in functions]
+
+    language = get_language()
+    results = [None] * len(functions)
+    errors = [None] * len(functions)
+
+    def call(index):
+        try:
+            results[index] = functions[index]()
+        except Exception:  # pylint: disable=broad-except
+            errors[index] = sys.exc_info()
+
+    def call_in_thread(index):
+        if language is not None:
+            translation.activate(language)
+        try:
+            call(index)
+        finally:
+            translation.deactivate()
+
+    threads = [threading.Thread(target=call_in_thread, args=(index,)) for index in range(1, len(functions))]
+    for thread in threads:
+        thread.start()
+    if functions:
+        call(0)
+    for thread in threads:
+        thread.join()
+
+    for error in errors:
+        if error is not None:
+            raise error[0], error[1], error[2]
+    return results
+
+
 class CommentClientError(Exception):
     def __init__(self, msg):
         self.message = msg
@@ -39,6 +39,9 @@ def run():
     if settings.FEATURES.get('ENABLE_THIRD_PARTY_AUTH', False):
         enable_third_party_auth()
 
+    if settings.CODE_JAIL.get('worker_pool', {}).get('size'):
+        enable_sandbox_worker_pool()
+
     # Initialize Segment.io analytics module. Flushes first time a message is received and
     # every 50 messages thereafter, or if 10 seconds have passed since last flush
     if settings.FEATURES.get('SEGMENT_IO_LMS') and hasattr(settings, 'SEGMENT_IO_LMS_KEY'):
@@ -151,6 +154,17 @@ def enable_third_party_auth():
     auth_settings.apply_settings(settings.THIRD_PARTY_AUTH, settings)
 
 
+def enable_sandbox_worker_pool():
+    """
+    Run capa's sandboxed code in a pool of pre-started sandbox workers,
+    configured by CODE_JAIL['worker_pool'].
+    """
+    from capa.safe_exec import set_sandbox_executor
+    from capa.safe_exec.worker_pool import WorkerPoolExecutor
+
+    set_sandbox_executor(WorkerPoolExecutor(**settings.CODE_JAIL['worker_pool']))
+
+
 def get_keyword_function_map():
     """
     Define the mapping of keywords and filtering functions
@@ -251,6 +251,24 @@ def get_cohort(user, course_key, assign=True):
     return group
 
 
+def get_cohorts_by_user(course_key):
+    """
+    Return a dict from the id of each user in a cohort of the course with key
+    `course_key` to their cohort (a CourseUserGroup), in two queries.
+
+    Unlike `get_cohort`, this doesn't check whether the course is cohorted,
+    and doesn't assign anybody to a cohort.
+    """
+    cohorts = {
+        cohort.id: cohort
+        for cohort in CourseUserGroup.objects.filter(course_id=course_key, group_type=CourseUserGroup.COHORT)
+    }
+    memberships = CourseUserGroup.users.through.objects.filter(
+        courseusergroup__in=cohorts.keys()
+    ).values_list('user', 'courseusergroup')
+    return {user_id: cohorts[cohort_id] for user_id, cohort_id in memberships}
+
+
 def get_course_cohorts(course):
     """
     Get a list of all the cohorts in the given course. This will include auto cohorts,
@@ -393,3 +411,16 @@ def get_partition_group_id_for_cohort(cohort):
     if len(res):
         return res[0].partition_id, res[0].group_id
     return None, None
+
+
+def get_partition_group_ids_for_cohorts(course_key):
+    """
+    Get a dict from the id of each cohort of the course with key `course_key`
+    that has been linked to a partition/group, to the ids of the partition and
+    group as a tuple of (int, int).
+    """
+    links = CourseUserGroupPartitionGroup.objects.filter(
+        course_user_group__course_id=course_key,
+        course_user_group__group_type=CourseUserGroup.COHORT,
+    )
+    return {link.course_user_group_id: (link.partition_id, link.group_id) for link in links}
@@ -3,7 +3,10 @@ Provides a UserPartition driver for cohorts.
 """
 import logging
 
-from .cohorts import get_cohort, get_partition_group_id_for_cohort
+from .cohorts import (
+    get_cohort, get_cohorts_by_user, get_partition_group_id_for_cohort, get_partition_group_ids_for_cohorts,
+    is_course_cohorted,
+)
 
 log = logging.getLogger(__name__)
 
@@ -73,3 +76,30 @@ class CohortPartitionScheme(object):
             return None
 
         return group
+
+    @classmethod
+    def get_groups_for_users(cls, course_id, user_partition):
+        """
+        Returns a dict from the id of each user of the course who is assigned
+        to a Group of the specified user partition via their cohort, to that
+        Group, in a few queries.
+
+        Unlike `get_group_for_user`, nobody is assigned to a cohort. Invalid
+        cohort -> partition group mappings are ignored the same way.
+        """
+        if not is_course_cohorted(course_id):
+            return {}
+
+        groups_by_cohort = {}
+        for cohort_id, (partition_id, group_id) in get_partition_group_ids_for_cohorts(course_id).iteritems():
+            group = user_partition.get_group(group_id) if partition_id == user_partition.id else None
+            if group is not None:
+                groups_by_cohort[cohort_id] = group
+
+        if not groups_by_cohort:
+            return {}
+        return {
+            user_id: groups_by_cohort[cohort.id]
+            for user_id, cohort in get_cohorts_by_user(course_id).iteritems()
+            if cohort.id in groups_by_cohort
+        }
@@ -207,6 +207,32 @@ class TestCohorts(TestCase):
             "other_user should be assigned to the default cohort"
         )
 
+    def test_get_cohorts_by_user(self):
+        """
+        Make sure cohorts.get_cohorts_by_user() maps the users in cohorts of the course to their cohort
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        user1 = UserFactory(username="test", email="a@b.com")
+        user2 = UserFactory(username="test2", email="a2@b.com")
+        UserFactory(username="test3", email="a3@b.com")
+
+        cohort1 = CohortFactory(course_id=course.id, name="TestCohort1")
+        cohort2 = CohortFactory(course_id=course.id, name="TestCohort2")
+        other_course_cohort = CohortFactory(
+            course_id=SlashSeparatedCourseKey("edX", "other", "2012_Fall"), name="TestCohort1"
+        )
+        cohort1.users.add(user1)
+        cohort2.users.add(user2)
+        other_course_cohort.users.add(user2)
+
+        with self.assertNumQueries(2):
+            cohorts_by_user = cohorts.get_cohorts_by_user(course.id)
+        self.assertEqual(cohorts_by_user, {user1.id: cohort1, user2.id: cohort2})
+
+        # Nobody is assigned to a cohort
+        config_course_cohorts(course, discussions=[], cohorted=True, auto_cohort_groups=["AutoGroup"])
+        self.assertEqual(cohorts.get_cohorts_by_user(course.id), {user1.id: cohort1, user2.id: cohort2})
+
     def test_get_cohort_with_assign(self):
         """
         Make sure cohorts.get_cohort() returns None if no group is already
@@ -651,6 +677,28 @@ class TestCohortsAndPartitionGroups(TestCase):
             (None, None),
         )
 
+    def test_get_partition_group_ids_for_cohorts(self):
+        """
+        Test looking up the partition groups of all the cohorts of a course at once
+        """
+        self.assertEqual(cohorts.get_partition_group_ids_for_cohorts(self.course.id), {})
+
+        self._link_cohort_partition_group(self.first_cohort, self.partition_id, self.group1_id)
+        self._link_cohort_partition_group(self.second_cohort, self.partition_id, self.group2_id)
+        other_course_cohort = CohortFactory(
+            course_id=SlashSeparatedCourseKey("edX", "other", "2012_Fall"), name="FirstCohort"
+        )
+        self._link_cohort_partition_group(other_course_cohort, self.partition_id, self.group1_id)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                cohorts.get_partition_group_ids_for_cohorts(self.course.id),
+                {
+                    self.first_cohort.id: (self.partition_id, self.group1_id),
+                    self.second_cohort.id: (self.partition_id, self.group2_id),
+                }
+            )
+
     def test_multiple_cohorts(self):
         """
         Test that multiple cohorts can be linked to the same partition group
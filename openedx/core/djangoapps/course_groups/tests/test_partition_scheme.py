@@ -79,6 +79,30 @@ class TestCohortPartitionScheme(django.test.TestCase):
             group
         )
 
+    def test_groups_for_users(self):
+        """
+        Test that the groups of all the students in the course are looked up
+        at once, the same way as for a single student.
+        """
+        first_cohort, second_cohort, unlinked_cohort, mislinked_cohort = [
+            CohortFactory(course_id=self.course_key) for _ in range(4)
+        ]
+        students = [UserFactory.create() for _ in range(5)]
+        for student, cohort in zip(students, [first_cohort, second_cohort, unlinked_cohort, mislinked_cohort]):
+            add_user_to_cohort(cohort, student.username)
+        self.link_cohort_partition_group(first_cohort, self.user_partition, self.groups[0])
+        self.link_cohort_partition_group(second_cohort, self.user_partition, self.groups[1])
+        CourseUserGroupPartitionGroup(course_user_group=mislinked_cohort, partition_id=0, group_id=30).save()
+
+        with self.assertNumQueries(3):
+            groups_by_user = CohortPartitionScheme.get_groups_for_users(self.course_key, self.user_partition)
+        self.assertEqual(groups_by_user, {students[0].id: self.groups[0], students[1].id: self.groups[1]})
+        for student in students:
+            self.assertEqual(
+                CohortPartitionScheme.get_group_for_user(self.course_key, student, self.user_partition),
+                groups_by_user.get(student.id)
+            )
+
     def test_student_cohort_assignment(self):
         """
         Test that the CohortPartitionScheme continues to return the correct
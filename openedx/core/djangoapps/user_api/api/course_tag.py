@@ -39,6 +39,23 @@ def get_course_tag(user, course_id, key):
         return None
 
 
+def get_course_tag_values(course_id, key):
+    """
+    Gets the values of all the users' course tags for the specified key in the
+    specified course_id, in one query.
+
+    Args:
+        course_id: course identifier (string)
+        key: arbitrary (<=255 char string)
+
+    Returns:
+        a dict from the id of each user with a value saved to that value
+    """
+    return dict(
+        UserCourseTag.objects.filter(course_id=course_id, key=key).values_list('user', 'value')
+    )
+
+
 def set_course_tag(user, course_id, key, value):
     """
     Sets the value of the user's course tag for the specified key in the specified
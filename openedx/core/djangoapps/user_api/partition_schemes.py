@@ -54,6 +54,20 @@ class RandomUserPartitionScheme(object):
 
         return group
 
+    @classmethod
+    def get_groups_for_users(cls, course_id, user_partition):
+        """
+        Returns a dict from the id of each user of the course who has been assigned to a group
+        of the specified user partition to that group, in one query. Nobody is assigned to a group.
+        """
+        group_ids = course_tag_api.get_course_tag_values(course_id, cls._key_for_partition(user_partition))
+        groups = {}
+        for user_id, group_id in group_ids.iteritems():
+            group = user_partition.get_group(int(group_id))
+            if group is not None:
+                groups[user_id] = group
+        return groups
+
     @classmethod
     def _key_for_partition(cls, user_partition):
         """
@@ -33,3 +33,17 @@ class TestCourseTagAPI(TestCase):
         course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = course_tag_api.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_get_course_tag_values(self):
+        self.assertEqual(course_tag_api.get_course_tag_values(self.course_id, self.test_key), {})
+
+        other_user = UserFactory.create()
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tag(other_user, self.course_id, self.test_key, 'value2')
+        course_tag_api.set_course_tag(other_user, self.course_id, 'other_key', 'value3')
+        other_course_id = SlashSeparatedCourseKey('test_org', 'other_course_number', 'test_run')
+        course_tag_api.set_course_tag(self.user, other_course_id, self.test_key, 'value4')
+
+        with self.assertNumQueries(1):
+            values = course_tag_api.get_course_tag_values(self.course_id, self.test_key)
+        self.assertEqual(values, {self.user.id: 'value', other_user.id: 'value2'})
@@ -16,15 +16,19 @@ class MemoryCourseTagAPI(object):
     An implementation of a user service that uses an in-memory dictionary for storage
     """
     def __init__(self):
-        self._tags = defaultdict(dict)
+        self._tags = defaultdict(lambda: defaultdict(dict))
 
-    def get_course_tag(self, __, course_id, key):
-        """Sets the value of ``key`` to ``value``"""
-        return self._tags[course_id].get(key)
-
-    def set_course_tag(self, __, course_id, key, value):
+    def get_course_tag(self, user, course_id, key):
         """Gets the value of ``key``"""
-        self._tags[course_id][key] = value
+        return self._tags[course_id][key].get(user.id)
+
+    def get_course_tag_values(self, course_id, key):
+        """Gets the values of ``key`` by user id"""
+        return dict(self._tags[course_id][key])
+
+    def set_course_tag(self, user, course_id, key, value):
+        """Sets the value of ``key`` to ``value``"""
+        self._tags[course_id][key][user.id] = value
 
 
 class TestRandomUserPartitionScheme(PartitionTestCase):
@@ -76,6 +80,29 @@ class TestRandomUserPartitionScheme(PartitionTestCase):
 
         self.assertIsNotNone(group)
 
+    def test_get_groups_for_users(self):
+        other_user = UserFactory.create()
+        self.assertEqual(
+            RandomUserPartitionScheme.get_groups_for_users(self.MOCK_COURSE_ID, self.user_partition), {}
+        )
+
+        group = RandomUserPartitionScheme.get_group_for_user(self.MOCK_COURSE_ID, self.user, self.user_partition)
+        other_group = RandomUserPartitionScheme.get_group_for_user(
+            self.MOCK_COURSE_ID, other_user, self.user_partition
+        )
+        self.assertEqual(
+            RandomUserPartitionScheme.get_groups_for_users(self.MOCK_COURSE_ID, self.user_partition),
+            {self.user.id: group, other_user.id: other_group}
+        )
+
+        # Users in groups that no longer exist have no group
+        groups = [Group(group.id, 'Group'), Group(5, 'Group 5')]
+        user_partition = UserPartition(self.TEST_ID, 'Test Partition', 'for testing purposes', groups)
+        groups_by_user = RandomUserPartitionScheme.get_groups_for_users(self.MOCK_COURSE_ID, user_partition)
+        self.assertEqual(groups_by_user[self.user.id].id, group.id)
+        if other_group.id != group.id:
+            self.assertNotIn(other_user.id, groups_by_user)
+
     def test_empty_partition(self):
         empty_partition = UserPartition(
             self.TEST_ID,